@@ -0,0 +1,149 @@
+"""
+bench_cinematica.py
+-------------------
+Benchmark de la cinemática directa (cinematica/directa.py).
+
+Para N = 1, 10, ..., 10^6 poses mide:
+
+- "lote_f64" / "lote_f32": `posiciones_articulaciones` con un buffer `out`
+  reutilizado, en float64 y float32.
+- "escalar_math": `posicion_escalar` llamada N veces.
+- "escalar_dh_tablas": `CadenaDH.esqueleto` con tablas llamada N veces
+  (variante de la GUI).
+- "escalar_numpy": la versión anterior de ModoManual.cinematicas_3d, con
+  `np.cos`/`np.sin` sobre escalares, llamada N veces.
+- "cadena_dh" / "cadena_dh_tablas": `CadenaDH.posiciones`
+  (cinematica/cadena_dh.py), la cadena genérica leída de config/brazo.json,
+  sin y con tablas de sin/cos.
+- "validacion": `primera_violacion` (cinematica/validacion.py) sobre las N
+  poses: cinemática directa, límites, suelo y columna de la base.
+
+Las variantes por pose se miden solo hasta --max-escalar poses (por defecto
+10^4); para N mayores se omiten.
+
+    python -m benchmarks.bench_cinematica --salida resultados_cinematica.json
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import argparse
+import json
+import platform
+import time
+
+import numpy as np
+
+from benchmarks.bench_serial import version_repo
+from cinematica.cadena_dh import cargar_cadena
+from cinematica.directa import LONGITUDES, posicion_escalar, posiciones_articulaciones
+from cinematica.espacio_trabajo import LIMITES
+from cinematica.validacion import primera_violacion
+
+TAMANOS = tuple(10**k for k in range(7))
+
+
+def escalar_numpy(base, brazo, codo, longitudes=LONGITUDES):
+    """Versión previa de ModoManual.cinematicas_3d (np.cos/np.sin escalares)."""
+    l1, l2, l3 = longitudes
+    b, h, c = np.radians(base), np.radians(brazo), np.radians(codo)
+    x2 = l2 * np.cos(h) * np.cos(b)
+    y2 = l2 * np.cos(h) * np.sin(b)
+    z2 = l1 + l2 * np.sin(h)
+    x3 = x2 + l3 * np.cos(h + c) * np.cos(b)
+    y3 = y2 + l3 * np.cos(h + c) * np.sin(b)
+    z3 = z2 + l3 * np.sin(h + c)
+    return (0, 0, x2, x3), (0, 0, y2, y3), (0, l1, z2, z3)
+
+
+def poses_aleatorias(n, semilla=0):
+    """Poses dentro de los límites de los sliders del Modo Manual."""
+    aleatorio = np.random.default_rng(semilla)
+    return aleatorio.uniform((70, 110, 90, 0), (180, 180, 135, 180), (n, 4))
+
+
+def mejor_tiempo(funcion, repeticiones):
+    """Menor tiempo de `repeticiones` ejecuciones, en segundos."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def medir_tamano(n, max_escalar):
+    """Tiempos de cada variante para N poses."""
+    poses = poses_aleatorias(n)
+    repeticiones = max(3, min(200, 10**5 // n))
+    resultado = {}
+
+    for nombre, dtype in (("lote_f64", np.float64), ("lote_f32", np.float32)):
+        salida = np.empty((n, 4, 3), dtype=dtype)
+        segundos = mejor_tiempo(
+            lambda: posiciones_articulaciones(poses, dtype=dtype, out=salida),
+            repeticiones,
+        )
+        resultado[nombre] = segundos
+
+    for nombre, tablas in (("cadena_dh", False), ("cadena_dh_tablas", True)):
+        cadena = cargar_cadena(tablas=tablas)
+        resultado[nombre] = mejor_tiempo(lambda: cadena.posiciones(poses), repeticiones)
+
+    resultado["validacion"] = mejor_tiempo(
+        lambda: primera_violacion(poses, limites=LIMITES), repeticiones
+    )
+
+    if n <= max_escalar:
+        filas = poses[:, :3].tolist()
+        for nombre, funcion in (
+            ("escalar_math", posicion_escalar),
+            ("escalar_numpy", escalar_numpy),
+            ("escalar_dh_tablas", cargar_cadena(tablas=True).esqueleto),
+        ):
+            resultado[nombre] = mejor_tiempo(
+                lambda: [funcion(*fila) for fila in filas], max(3, repeticiones // 10)
+            )
+
+    return {
+        nombre: {
+            "total_ms": round(segundos * 1000, 4),
+            "por_pose_us": round(segundos / n * 1e6, 4),
+        }
+        for nombre, segundos in resultado.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de cinemática directa")
+    parser.add_argument("--max-escalar", type=int, default=10**4)
+    parser.add_argument("--salida", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    resultados = {
+        "version": version_repo(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "numpy": np.__version__,
+        "tamanos": {str(n): medir_tamano(n, args.max_escalar) for n in TAMANOS},
+    }
+
+    texto = json.dumps(resultados, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+bench_render.py
+---------------
+Benchmark del redibujo del esqueleto 3D del Modo Manual.
+
+Compara, con el backend Agg (sin ventana), cuántos redibujos por segundo
+logra cada estrategia al recorrer una trayectoria de sliders:
+
+- "anterior": `ax.clear()`, límites, título, cinco `plot()` nuevos y
+  `canvas.draw()` completo en cada actualización (versión previa de
+  ModoManual.actualizar_grafico).
+- "artistas": líneas persistentes actualizadas con `set_data_3d`, pero
+  con `canvas.draw()` completo.
+- "blit": RenderBrazo (interfaz/render_matplotlib.py), con líneas
+  persistentes, fondo guardado y blitting del área de los ejes.
+
+Con Agg, `canvas.blit` no copia a pantalla, por lo que la columna "blit"
+no incluye el costo de pasar la región a la imagen de Tk (proporcional al
+área de los ejes, no a la complejidad de la escena).
+
+Aparte, "hilo" mide el dibujo en segundo plano (interfaz/render_hilo.py):
+el costo de cada solicitud en el hilo que la hace (el de Tk en la GUI),
+con eventos de entrada cada milisegundo, y cuántas poses se dibujaron u
+omitieron por llegar otras más nuevas.
+
+    python -m benchmarks.bench_render --salida resultados_render.json
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import argparse
+import json
+import platform
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from benchmarks.bench_serial import percentiles, version_repo
+from interfaz.render_hilo import TrabajadorRender
+from interfaz.render_matplotlib import (
+    ESTILO_SEGMENTOS,
+    LIMITES,
+    RenderBrazo,
+    puntos_pinza,
+)
+
+L1, L2, L3 = 3, 5, 5  # Geometría de ModoManual
+TAMANO_FIGURA = (6, 6)
+DPI = 100
+INTERVALO_ENTRADA = 0.001  # Segundos entre eventos de slider simulados
+
+
+def cinematica(base, brazo, codo):
+    """Misma cinemática que ModoManual.cinematicas_3d."""
+    b, h, c = np.radians(base), np.radians(brazo), np.radians(codo)
+    x2 = L2 * np.cos(h) * np.cos(b)
+    y2 = L2 * np.cos(h) * np.sin(b)
+    z2 = L1 + L2 * np.sin(h)
+    x3 = x2 + L3 * np.cos(h + c) * np.cos(b)
+    y3 = y2 + L3 * np.cos(h + c) * np.sin(b)
+    z3 = z2 + L3 * np.sin(h + c)
+    return (0, 0, x2, x3), (0, 0, y2, y3), (0, L1, z2, z3)
+
+
+def trayectoria(cuadros):
+    """Posiciones de sliders que recorren los rangos de ModoManual."""
+    t = np.linspace(0, 2 * np.pi, cuadros)
+    return np.column_stack(
+        (
+            125 + 55 * np.sin(t),
+            145 + 35 * np.sin(2 * t),
+            112.5 + 22.5 * np.cos(t),
+            90 + 90 * np.sin(3 * t),
+        )
+    )
+
+
+def nueva_figura():
+    fig = Figure(figsize=TAMANO_FIGURA, dpi=DPI)
+    return fig, FigureCanvasAgg(fig)
+
+
+# --------------------------------------------------------------------------------
+# Estrategias
+# --------------------------------------------------------------------------------
+def dibujar_anterior(posiciones):
+    """Redibujo completo recreando ejes y líneas (versión previa)."""
+    fig, canvas = nueva_figura()
+    ax = fig.add_subplot(111, projection="3d")
+    tiempos = []
+    for base, brazo, codo, pinza in posiciones:
+        inicio = time.perf_counter()
+        xs, ys, zs = cinematica(base, brazo, codo)
+        ax.clear()
+        ax.set_xlim(*LIMITES[0])
+        ax.set_ylim(*LIMITES[1])
+        ax.set_zlim(*LIMITES[2])
+        ax.set_title("Brazo Robótico 3D")
+        for i, (color, ancho, marcador) in enumerate(ESTILO_SEGMENTOS):
+            ax.plot(
+                xs[i : i + 2], ys[i : i + 2], zs[i : i + 2],
+                color=color, linewidth=ancho, marker=marcador,
+            )
+        extremo = (xs[-1], ys[-1], zs[-1])
+        for punta in puntos_pinza(*extremo, pinza):
+            ax.plot(*([e, p] for e, p in zip(extremo, punta)), color="blue", linewidth=2)
+        canvas.draw()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def dibujar_artistas(posiciones):
+    """Líneas persistentes, pero redibujo completo de la figura."""
+    fig, canvas = nueva_figura()
+    render = RenderBrazo(fig, canvas)
+    for artista in render.artistas:
+        artista.set_animated(False)
+    render.desconectar()
+    tiempos = []
+    for base, brazo, codo, pinza in posiciones:
+        inicio = time.perf_counter()
+        render._fondo = None  # Fuerza canvas.draw() en cada cuadro
+        render.actualizar(*cinematica(base, brazo, codo), pinza)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def dibujar_blit(posiciones):
+    """RenderBrazo: fondo guardado y blitting de los artistas del brazo."""
+    fig, canvas = nueva_figura()
+    render = RenderBrazo(fig, canvas)
+    canvas.draw()  # Primer dibujo completo: guarda el fondo
+    tiempos = []
+    for base, brazo, codo, pinza in posiciones:
+        inicio = time.perf_counter()
+        render.actualizar(*cinematica(base, brazo, codo), pinza)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def medir_hilo(posiciones):
+    """Costo de solicitar cuadros al TrabajadorRender desde otro hilo."""
+    entregados = []
+    trabajador = TrabajadorRender(
+        lambda generacion, rgba, ancho, alto: entregados.append(generacion),
+        tamano=(TAMANO_FIGURA[0] * DPI, TAMANO_FIGURA[1] * DPI),
+        dpi=DPI,
+    )
+    trabajador.start()
+    llamadas = []
+    for base, brazo, codo, pinza in posiciones:
+        inicio = time.perf_counter()
+        ultima = trabajador.solicitar(*cinematica(base, brazo, codo), pinza)
+        llamadas.append(time.perf_counter() - inicio)
+        time.sleep(INTERVALO_ENTRADA)
+    while not entregados or entregados[-1] != ultima:
+        time.sleep(0.01)
+    trabajador.detener()
+
+    resumen = {"solicitud": percentiles(llamadas)}
+    resumen.update(trabajador.estadisticas())
+    return resumen
+
+
+ESTRATEGIAS = {
+    "anterior": dibujar_anterior,
+    "artistas": dibujar_artistas,
+    "blit": dibujar_blit,
+}
+
+
+def medir_todo(cuadros):
+    """Ejecuta cada estrategia y resume tiempos y redibujos por segundo."""
+    posiciones = trayectoria(cuadros)
+    resultados = {}
+    for nombre, estrategia in ESTRATEGIAS.items():
+        estrategia(posiciones[:5])  # Calentamiento (fuentes, cachés)
+        tiempos = estrategia(posiciones)
+        resumen = percentiles(tiempos)
+        resumen["redibujos_por_segundo"] = len(tiempos) / sum(tiempos)
+        resultados[nombre] = resumen
+
+    anterior = resultados["anterior"]["redibujos_por_segundo"]
+    for resumen in resultados.values():
+        resumen["aceleracion"] = resumen["redibujos_por_segundo"] / anterior
+
+    return {
+        "version": version_repo(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "matplotlib": matplotlib.__version__,
+        "cuadros": cuadros,
+        "figura": {"pulgadas": TAMANO_FIGURA, "dpi": DPI},
+        "estrategias": resultados,
+        "hilo": medir_hilo(posiciones),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del redibujo 3D")
+    parser.add_argument("--cuadros", type=int, default=200)
+    parser.add_argument("--salida", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    texto = json.dumps(medir_todo(args.cuadros), indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
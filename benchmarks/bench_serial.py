@@ -0,0 +1,281 @@
+"""
+bench_serial.py
+---------------
+Benchmarks de latencia y rendimiento de la comunicación serial.
+
+Ejercita `ArduinoDetector.enviar_rutina`, `leer_respuesta` y
+`limpiar_buffer` contra un pseudo-terminal (simulador de Arduino o eco), sin
+hardware, y mide:
+
+- Latencia de ida y vuelta (p50/p95/p99): desde `enviar_rutina` hasta que
+  "Rutina completada" está disponible en `leer_respuesta`.
+- Costo de la llamada `enviar_rutina` (clic en "Ejecutar" -> bytes escritos).
+- Rendimiento sostenido (mensajes/s) a varias velocidades en baudios. Un pty
+  no limita la velocidad, por lo que también se reporta el máximo teórico
+  del cable (baudios / 10 bits por byte).
+- Costo por mensaje del patrón anterior `in_waiting` + `readline` frente a
+  la cola del hilo lector, y costo de `limpiar_buffer`.
+
+El resultado se emite como JSON para comparar entre versiones:
+
+    python -m benchmarks.bench_serial --salida resultados.json
+
+Solo Linux (usa pseudo-terminales).
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tty
+
+import serial
+
+from hardware.arduino_detector import ArduinoDetector
+from hardware.simulador_arduino import SimuladorArduino
+
+MENSAJE = b"Rutina completada\n"
+BAUDIOS = (9600, 57600, 115200, 1000000)
+LOTE_PTY = 3600  # Bytes por escritura, menor que el buffer de entrada del pty
+
+
+def percentiles(muestras):
+    """
+    Resume una lista de tiempos (segundos) en milisegundos.
+
+    Returns:
+        dict: p50, p95, p99, mínimo, máximo y promedio.
+    """
+    ordenadas = sorted(muestras)
+    n = len(ordenadas)
+
+    def p(q):
+        return ordenadas[min(n - 1, int(round(q * (n - 1))))] * 1000
+
+    return {
+        "n": n,
+        "p50_ms": p(0.50),
+        "p95_ms": p(0.95),
+        "p99_ms": p(0.99),
+        "min_ms": ordenadas[0] * 1000,
+        "max_ms": ordenadas[-1] * 1000,
+        "promedio_ms": sum(ordenadas) / n * 1000,
+    }
+
+
+def abrir_pty():
+    """Crea un pty en modo crudo y devuelve (maestro, esclavo, ruta)."""
+    maestro, esclavo = os.openpty()
+    tty.setraw(esclavo)
+    return maestro, esclavo, os.ttyname(esclavo)
+
+
+# --------------------------------------------------------------------------------
+# Benchmarks
+# --------------------------------------------------------------------------------
+def medir_ida_y_vuelta(iteraciones):
+    """Latencia enviar_rutina -> leer_respuesta con el simulador (duración 0)."""
+    envio, ida_vuelta = [], []
+    with SimuladorArduino(duracion_defecto=0.0) as simulador:
+        detector = ArduinoDetector(puerto=simulador.puerto)
+        detector.detectar()
+        detector.conectar(esperar_listo=True)
+        detector.limpiar_buffer()
+
+        for _ in range(iteraciones):
+            inicio = time.perf_counter()
+            detector.enviar_rutina(1, 1)
+            enviado = time.perf_counter()
+            respuesta = detector.leer_respuesta(timeout=2.0)
+            fin = time.perf_counter()
+            if respuesta != "Rutina completada":
+                continue
+            envio.append(enviado - inicio)
+            ida_vuelta.append(fin - inicio)
+
+        detector.cerrar()
+
+    return {
+        "enviar_rutina": percentiles(envio),
+        "ida_y_vuelta": percentiles(ida_vuelta),
+    }
+
+
+def medir_rendimiento(mensajes):
+    """Mensajes/s recibidos por el hilo lector a varias velocidades."""
+    resultados = {}
+    for baudios in BAUDIOS:
+        maestro, esclavo, ruta = abrir_pty()
+        os.set_blocking(maestro, False)
+        detector = ArduinoDetector(puerto=ruta)
+        detector.detectar()
+        detector.conectar(baudrate=baudios)
+
+        rafaga = MENSAJE * mensajes
+        inicio = time.perf_counter()
+        escritos = 0
+        recibidos = 0
+        while recibidos < mensajes:
+            if escritos < len(rafaga):
+                # Escritura no bloqueante: si el pty está lleno se reintenta
+                try:
+                    escritos += os.write(maestro, rafaga[escritos : escritos + LOTE_PTY])
+                except BlockingIOError:
+                    pass
+            while detector.leer_respuesta() is not None:
+                recibidos += 1
+            if escritos >= len(rafaga) and recibidos < mensajes:
+                # Todo escrito: esperar lo que falte (o cortar si se perdió)
+                if detector.leer_respuesta(timeout=1.0) is None:
+                    break
+                recibidos += 1
+        duracion = time.perf_counter() - inicio
+
+        detector.cerrar()
+        os.close(maestro)
+        os.close(esclavo)
+
+        resultados[str(baudios)] = {
+            "mensajes": recibidos,
+            "mensajes_por_s": recibidos / duracion,
+            "bytes_por_s": recibidos * len(MENSAJE) / duracion,
+            "maximo_teorico_mensajes_por_s": baudios / 10 / len(MENSAJE),
+        }
+    return resultados
+
+
+def medir_patron_lectura(mensajes):
+    """Costo por mensaje de in_waiting+readline frente a la cola del lector."""
+    maestro, esclavo, ruta = abrir_pty()
+    # El buffer de entrada de un pty es de ~4 KB: se escribe por lotes que
+    # caben completos para que os.write no bloquee
+    por_lote = LOTE_PTY // len(MENSAJE)
+    lotes = max(1, mensajes // por_lote)
+
+    # Patrón anterior: la GUI consulta in_waiting y hace readline
+    conexion = serial.Serial(ruta, 9600, timeout=1)
+    tiempo_readline = 0.0
+    for _ in range(lotes):
+        os.write(maestro, MENSAJE * por_lote)
+        while conexion.in_waiting < por_lote * len(MENSAJE):
+            time.sleep(0.001)
+        leidos = 0
+        inicio = time.perf_counter()
+        while leidos < por_lote:
+            if conexion.in_waiting > 0:
+                conexion.readline().decode("utf-8", errors="ignore").strip()
+                leidos += 1
+        tiempo_readline += time.perf_counter() - inicio
+    conexion.close()
+
+    # Patrón actual: el hilo lector ya separó las líneas; la GUI lee la cola
+    detector = ArduinoDetector(puerto=ruta)
+    detector.detectar()
+    detector.conectar()
+    tiempo_cola = 0.0
+    tiempo_limpiar = 0.0
+    for _ in range(lotes):
+        os.write(maestro, MENSAJE * por_lote)
+        esperar_cola(detector, por_lote)
+        inicio = time.perf_counter()
+        for _ in range(por_lote):
+            detector.leer_respuesta()
+        tiempo_cola += time.perf_counter() - inicio
+
+        # limpiar_buffer con un lote pendiente
+        os.write(maestro, MENSAJE * por_lote)
+        esperar_cola(detector, por_lote)
+        inicio = time.perf_counter()
+        detector.limpiar_buffer()
+        tiempo_limpiar += time.perf_counter() - inicio
+
+    detector.cerrar()
+    os.close(maestro)
+    os.close(esclavo)
+
+    total = lotes * por_lote
+    return {
+        "in_waiting_readline_us_por_mensaje": tiempo_readline / total * 1e6,
+        "cola_lector_us_por_mensaje": tiempo_cola / total * 1e6,
+        "limpiar_buffer_ms": tiempo_limpiar / lotes * 1000,
+        "mensajes_por_limpieza": por_lote,
+        "mensajes": total,
+    }
+
+
+def esperar_cola(detector, cantidad, timeout=2.0):
+    """Espera a que el hilo lector tenga `cantidad` mensajes en cola."""
+    limite = time.perf_counter() + timeout
+    while detector.lector.mensajes.qsize() < cantidad:
+        if time.perf_counter() > limite:
+            raise RuntimeError("El hilo lector no recibió los mensajes a tiempo")
+        time.sleep(0.001)
+
+
+def version_repo():
+    """Commit actual del repositorio, si está disponible."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de comunicación serial")
+    parser.add_argument("--iteraciones", type=int, default=500)
+    parser.add_argument("--mensajes", type=int, default=5000)
+    parser.add_argument("--salida", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    if not sys.platform.startswith("linux"):
+        sys.exit("Estos benchmarks requieren pseudo-terminales de Linux.")
+
+    # Los mensajes de depuración del detector van a stderr para no mezclarse
+    # con el JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        resultados = medir_todo(args)
+
+    texto = json.dumps(resultados, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+
+def medir_todo(args):
+    """Ejecuta todos los benchmarks y arma el diccionario de resultados."""
+    return {
+        "version": version_repo(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "pyserial": serial.__version__,
+        "latencia": medir_ida_y_vuelta(args.iteraciones),
+        "rendimiento": medir_rendimiento(args.mensajes),
+        "patron_lectura": medir_patron_lectura(min(args.mensajes, 1000)),
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+cadena_dh.py
+------------
+Cadena cinemática genérica definida por parámetros de Denavit–Hartenberg.
+
+La geometría del brazo (largos, límites de cada articulación y de la pinza)
+se lee de `config/brazo.json`, o del archivo indicado en la variable de
+entorno BRAZO_CONFIG, en lugar de estar fija en el código.
+
+Con la convención DH estándar, la transformación de cada articulación es
+
+    A_i(q) = Rz(q + θ_i) · Tz(d_i) · Tx(a_i) · Rx(α_i)
+
+donde q es el ángulo de la articulación (grados) y θ_i su desfase. La parte
+C_i = Tz(d_i) · Tx(a_i) · Rx(α_i) no depende de q y se calcula una sola vez.
+Como Rz solo mezcla las dos primeras filas, A_i = Rz · C_i se obtiene con
+dos combinaciones de filas de C_i, sin multiplicar matrices completas.
+
+Para la geometría por defecto (base con d = L1 y α = 90°, brazo con
+a = L2 y codo con a = L3), los puntos coinciden con los de
+cinematica/directa.py.
+
+La cadena admite cualquier número de articulaciones, pero el Modo Manual,
+la cinemática inversa (inversa.py), el mapa del espacio de trabajo
+(espacio_trabajo.py) y la validación de trayectorias (validacion.py) solo
+soportan la forma base + brazo + codo. `cargar_cadena_brazo` carga la
+configuración y rechaza cualquier otra con un ValueError claro.
+
+Tablas de senos y cosenos (opcional): con `tablas=True` los ángulos se
+redondean a `resolucion` grados (por defecto 0.1°, la resolución del
+protocolo con el Arduino) y sin/cos se toman de una tabla. Para una sola
+pose (`esqueleto`, usado por la GUI en cada cuadro) además se tabulan las
+matrices A_i completas, de modo que cada pose cuesta J - 1 productos de
+matrices 4x4 (unos 12 µs, contra ~50 µs calculándola como lote de uno).
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import json
+import math
+import os
+from collections import namedtuple
+
+import numpy as np
+
+RUTA_CONFIG = os.environ.get("BRAZO_CONFIG") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "brazo.json"
+)
+RESOLUCION_TABLA = 0.1  # Grados (décimas, como el protocolo)
+NOMBRES_BRAZO = ("base", "brazo", "codo")  # Forma que soporta el Modo Manual
+
+# Se usa si no existe config/brazo.json (p. ej. en el ejecutable de PyInstaller)
+CONFIG_DEFECTO = {
+    "nombre": "Brazo robótico tipo pinza",
+    "articulaciones": [
+        {"nombre": "base", "d": 3.0, "a": 0.0, "alfa": 90.0, "theta": 0.0, "limites": [70, 180]},
+        {"nombre": "brazo", "d": 0.0, "a": 5.0, "alfa": 0.0, "theta": 0.0, "limites": [110, 180]},
+        {"nombre": "codo", "d": 0.0, "a": 5.0, "alfa": 0.0, "theta": 0.0, "limites": [90, 135]},
+    ],
+    "pinza": {"largo": 4.0, "limites": [0, 180]},
+}
+
+ArticulacionDH = namedtuple("ArticulacionDH", ["nombre", "d", "a", "alfa", "theta", "limites"])
+
+
+def cargar_configuracion(ruta=None):
+    """
+    Lee la geometría del brazo.
+
+    Args:
+        ruta (str - None): Archivo JSON; None usa RUTA_CONFIG y, si no
+            existe, CONFIG_DEFECTO.
+
+    Returns:
+        dict: Configuración con 'articulaciones' y 'pinza'.
+
+    Raises:
+        OSError: Si `ruta` se indicó y no se puede leer.
+        ValueError: Si el JSON no es válido.
+    """
+    if ruta is None:
+        if not os.path.exists(RUTA_CONFIG):
+            return CONFIG_DEFECTO
+        ruta = RUTA_CONFIG
+    with open(ruta, encoding="utf-8") as archivo:
+        try:
+            return json.load(archivo)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{ruta}: JSON inválido ({e})") from e
+
+
+def _rz_por_constante(coseno, seno, constante, out):
+    """
+    out = Rz(q) · C para N ángulos. Rz solo mezcla las dos primeras filas.
+
+    Args:
+        coseno, seno (np.ndarray): (N, 1) de los ángulos.
+        constante (np.ndarray): C (4, 4).
+        out (np.ndarray): (N, 4, 4).
+    """
+    np.subtract(coseno * constante[0], seno * constante[1], out=out[:, 0])
+    np.add(seno * constante[0], coseno * constante[1], out=out[:, 1])
+    out[:, 2:] = constante[2:]
+
+
+def _constante(d, a, alfa):
+    """C = Tz(d) · Tx(a) · Rx(alfa), la parte fija de A_i."""
+    ca, sa = math.cos(math.radians(alfa)), math.sin(math.radians(alfa))
+    return np.array(
+        [
+            [1.0, 0.0, 0.0, a],
+            [0.0, ca, -sa, 0.0],
+            [0.0, sa, ca, d],
+            [0.0, 0.0, 0.0, 1.0],
+        ]
+    )
+
+
+class CadenaDH:
+    """
+    Cadena de articulaciones rotacionales con parámetros DH.
+
+    Uso:
+        cadena = cargar_cadena()
+        xs, ys, zs = cadena.esqueleto(90, 120, 90)     # una pose (GUI)
+        puntos = cadena.posiciones(angulos)             # (N, J + 1, 3)
+
+    Atributos:
+        articulaciones (list[ArticulacionDH]): Parámetros de cada articulación.
+        nombres (tuple): Nombre de cada articulación, en orden.
+        largo_pinza (float): Largo de la pinza.
+        limites (dict): (min, max) en grados por articulación y 'pinza'.
+        tablas (bool): Si se usan tablas de sin/cos.
+        resolucion (float): Paso de las tablas, en grados.
+    """
+
+    def __init__(self, articulaciones, largo_pinza=0.0, limites_pinza=(0, 180),
+                 tablas=False, resolucion=RESOLUCION_TABLA):
+        """
+        Args:
+            articulaciones (sequence[ArticulacionDH]): De la base al extremo.
+            largo_pinza (float): Largo de la pinza.
+            limites_pinza (tuple): (min, max) de la pinza en grados.
+            tablas (bool): Usar tablas de sin/cos (ángulos redondeados a
+                `resolucion`).
+            resolucion (float): Paso de las tablas, en grados; debe dividir
+                a 360.
+
+        Raises:
+            ValueError: Si no hay articulaciones o la resolución no divide
+                a 360.
+        """
+        if not articulaciones:
+            raise ValueError("La cadena necesita al menos una articulación")
+        self.articulaciones = list(articulaciones)
+        self.nombres = tuple(art.nombre for art in self.articulaciones)
+        self.largo_pinza = float(largo_pinza)
+        self.limites = {art.nombre: tuple(art.limites) for art in self.articulaciones}
+        self.limites["pinza"] = tuple(limites_pinza)
+
+        # Partes constantes de cada A_i: filas de C_i y desfases θ_i
+        self._constantes = np.array(
+            [_constante(art.d, art.a, art.alfa) for art in self.articulaciones]
+        )
+        self._desfases = np.array([art.theta for art in self.articulaciones], dtype=np.float64)
+
+        self.tablas = tablas
+        self.resolucion = resolucion
+        self._tabla_cos = self._tabla_sin = self._tabla_matrices = self._marcos = None
+        if tablas:
+            pasos = 360.0 / resolucion
+            if abs(pasos - round(pasos)) > 1e-9:
+                raise ValueError(f"La resolución {resolucion}° no divide a 360°")
+            radianes = np.radians(np.arange(round(pasos)) * resolucion)
+            self._tabla_cos, self._tabla_sin = np.cos(radianes), np.sin(radianes)
+
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def desde_configuracion(cls, config, **opciones):
+        """
+        Construye la cadena a partir de un dict como el de config/brazo.json.
+
+        Raises:
+            ValueError: Si falta algún parámetro.
+        """
+        try:
+            articulaciones = [
+                ArticulacionDH(
+                    str(art["nombre"]),
+                    float(art.get("d", 0.0)),
+                    float(art.get("a", 0.0)),
+                    float(art.get("alfa", 0.0)),
+                    float(art.get("theta", 0.0)),
+                    (float(art["limites"][0]), float(art["limites"][1])),
+                )
+                for art in config["articulaciones"]
+            ]
+            pinza = config.get("pinza", {})
+            largo_pinza = float(pinza.get("largo", 0.0))
+            limites_pinza = tuple(float(v) for v in pinza.get("limites", (0, 180)))
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Configuración del brazo incompleta: {e!r}") from e
+        return cls(articulaciones, largo_pinza, limites_pinza, **opciones)
+
+    # ------------------------------------------------------------------
+
+    def longitudes_brazo(self):
+        """
+        (L1, L2, L3) para los módulos que asumen la geometría base + brazo +
+        codo (inversa.py, espacio_trabajo.py, validacion.py).
+
+        Raises:
+            ValueError: Si la cadena no tiene esa forma.
+        """
+        if len(self.articulaciones) == 3:
+            base, brazo, codo = self.articulaciones
+            if (
+                base.a == 0
+                and base.alfa == 90
+                and brazo.d == brazo.alfa == 0
+                and codo.d == codo.alfa == 0
+                and not self._desfases.any()
+            ):
+                return base.d, brazo.a, codo.a
+        raise ValueError("La cadena no es del tipo base + brazo + codo")
+
+    # ------------------------------------------------------------------
+
+    def _indices(self, grados):
+        """Índices de tabla de ángulos en grados (cualquier forma)."""
+        return np.rint(np.asarray(grados) / self.resolucion).astype(np.intp) % len(self._tabla_cos)
+
+    def _coseno_seno(self, grados):
+        if self.tablas:
+            indices = self._indices(grados)
+            return self._tabla_cos[indices], self._tabla_sin[indices]
+        radianes = np.radians(grados)
+        return np.cos(radianes), np.sin(radianes)
+
+    # ------------------------------------------------------------------
+
+    def transformaciones(self, angulos, out=None):
+        """
+        Marcos de cada articulación respecto de la base, para N poses.
+
+        Args:
+            angulos (array-like): (N, J) o (N, J + 1) en grados (una columna
+                extra, la pinza, se ignora); un vector se trata como N = 1.
+            out (np.ndarray - None): Arreglo (N, J, 4, 4) float64 a reutilizar.
+
+        Returns:
+            np.ndarray: (N, J, 4, 4); out[:, i] = A_1 · ... · A_(i+1).
+
+        Raises:
+            ValueError: Si las formas no son válidas.
+        """
+        angulos = np.asarray(angulos, dtype=np.float64)
+        if angulos.ndim == 1:
+            angulos = angulos[np.newaxis]
+        cantidad = len(self.articulaciones)
+        if angulos.ndim != 2 or angulos.shape[1] not in (cantidad, cantidad + 1):
+            raise ValueError(
+                f"Se esperaba forma (N, {cantidad}) o (N, {cantidad + 1}), no {angulos.shape}"
+            )
+        n = len(angulos)
+        if out is None:
+            out = np.empty((n, cantidad, 4, 4))
+        elif out.shape != (n, cantidad, 4, 4) or out.dtype != np.float64:
+            raise ValueError(f"out debe tener forma {(n, cantidad, 4, 4)} y tipo float64")
+
+        coseno, seno = self._coseno_seno(angulos[:, :cantidad] + self._desfases)
+        a = np.empty((n, 4, 4))
+        for i, constante in enumerate(self._constantes):
+            _rz_por_constante(coseno[:, i, None], seno[:, i, None], constante, a)
+            if i == 0:
+                out[:, 0] = a
+            else:
+                np.matmul(out[:, i - 1], a, out=out[:, i])
+        return out
+
+    # ------------------------------------------------------------------
+
+    def posiciones(self, angulos):
+        """
+        Puntos del esqueleto de N poses: origen y origen de cada marco.
+
+        Returns:
+            np.ndarray: (N, J + 1, 3). Con la geometría por defecto es lo
+            mismo que `posiciones_articulaciones` (origen, hombro, codo,
+            extremo).
+        """
+        marcos = self.transformaciones(angulos)
+        puntos = np.zeros((len(marcos), len(self.articulaciones) + 1, 3))
+        puntos[:, 1:] = marcos[:, :, :3, 3]
+        return puntos
+
+    # ------------------------------------------------------------------
+
+    def esqueleto(self, *angulos):
+        """
+        Esqueleto de una sola pose, en el formato del diagrama 3D.
+
+        Args:
+            *angulos (float): Un ángulo por articulación, en grados.
+
+        Returns:
+            tuple: (xs, ys, zs), cada una con J + 1 puntos.
+
+        Con tablas reutiliza un arreglo interno: no llamar desde varios
+        hilos a la vez.
+        """
+        if not self.tablas:
+            puntos = self.posiciones(angulos)[0]
+            return tuple(puntos[:, 0].tolist()), tuple(puntos[:, 1].tolist()), tuple(
+                puntos[:, 2].tolist()
+            )
+
+        if self._tabla_matrices is None:
+            # A_i para cada ángulo de la tabla: (J, pasos, 4, 4), una sola vez
+            pasos = len(self._tabla_cos)
+            self._tabla_matrices = np.empty((len(self._constantes), pasos, 4, 4))
+            for matrices, constante in zip(self._tabla_matrices, self._constantes):
+                _rz_por_constante(
+                    self._tabla_cos[:, None], self._tabla_sin[:, None], constante, matrices
+                )
+            self._marcos = np.empty((len(self._constantes), 4, 4))
+
+        # Índices con aritmética de Python: para tres valores, más barato
+        # que pasar por arreglos
+        pasos = len(self._tabla_cos)
+        marcos = self._marcos
+        for i, (matrices, angulo, desfase) in enumerate(
+            zip(self._tabla_matrices, angulos, self._desfases.tolist())
+        ):
+            a = matrices[round((angulo + desfase) / self.resolucion) % pasos]
+            if i == 0:
+                marcos[0] = a
+            else:
+                np.matmul(marcos[i - 1], a, out=marcos[i])
+        xs, ys, zs = marcos[:, :3, 3].T.tolist()
+        return (0.0, *xs), (0.0, *ys), (0.0, *zs)
+
+
+def cargar_cadena(ruta=None, **opciones):
+    """
+    Atajo: `CadenaDH.desde_configuracion(cargar_configuracion(ruta))`.
+
+    Args:
+        ruta (str - None): Ver `cargar_configuracion`.
+        **opciones: tablas, resolucion.
+
+    Returns:
+        CadenaDH
+    """
+    return CadenaDH.desde_configuracion(cargar_configuracion(ruta), **opciones)
+
+
+def cargar_cadena_brazo(ruta=None, **opciones):
+    """
+    Como `cargar_cadena`, pero exige la forma base + brazo + codo que
+    asumen el Modo Manual, inversa.py, espacio_trabajo.py y validacion.py.
+
+    Args:
+        ruta (str - None): Ver `cargar_configuracion`.
+        **opciones: tablas, resolucion.
+
+    Returns:
+        CadenaDH
+
+    Raises:
+        OSError: Si el archivo no se puede leer.
+        ValueError: Si el JSON no es válido, le faltan parámetros, la
+            cadena no tiene esa forma o algún límite está invertido.
+    """
+    config = cargar_configuracion(ruta)
+    try:
+        cadena = CadenaDH.desde_configuracion(config, **opciones)
+        if cadena.nombres != NOMBRES_BRAZO:
+            raise ValueError(
+                f"Se esperaban las articulaciones {', '.join(NOMBRES_BRAZO)}, "
+                f"no {', '.join(cadena.nombres)}"
+            )
+        cadena.longitudes_brazo()
+        for nombre, (minimo, maximo) in cadena.limites.items():
+            if minimo > maximo:
+                raise ValueError(f"Límites invertidos en '{nombre}': {minimo:g} > {maximo:g}")
+    except ValueError as e:
+        raise ValueError(f"{ruta or RUTA_CONFIG}: {e}") from e
+    return cadena
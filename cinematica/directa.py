@@ -0,0 +1,142 @@
+"""
+directa.py
+----------
+Cinemática directa del brazo robótico (base giratoria + brazo + codo).
+
+Convención (la misma del diagrama 3D del Modo Manual):
+
+- base: giro horizontal alrededor del eje z.
+- brazo: elevación del primer segmento respecto al plano horizontal.
+- codo: ángulo del segundo segmento relativo al primero.
+
+Los cuatro puntos del esqueleto son: origen, hombro (0, 0, L1), codo y
+extremo (donde se monta la pinza).
+
+Dos variantes:
+
+- `posiciones_articulaciones`: lote de N poses en una sola pasada
+  vectorizada, para trayectorias, mapas de espacio de trabajo y
+  validación. Entrada (N, 3) o (N, 4) en grados (la 4.ª columna, la pinza,
+  no afecta la posición); salida (N, 4, 3).
+- `posicion_escalar`: una sola pose con `math`, para la GUI. Para un único
+  punto, `math.cos` sobre floats es varias veces más rápido que `np.cos`,
+  que paga el costo de crear arreglos.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import math
+
+import numpy as np
+
+LONGITUDES = (3.0, 5.0, 5.0)  # L1 (altura de la base), L2 (brazo), L3 (codo)
+
+
+def posicion_escalar(base, brazo, codo, longitudes=LONGITUDES):
+    """
+    Calcula el esqueleto de una sola pose.
+
+    Args:
+        base, brazo, codo (float): Ángulos en grados.
+        longitudes (tuple): (L1, L2, L3).
+
+    Returns:
+        tuple: (xs, ys, zs), cada una con los 4 puntos del esqueleto.
+    """
+    l1, l2, l3 = longitudes
+    b = math.radians(base)
+    h = math.radians(brazo)
+    hc = h + math.radians(codo)
+    cb, sb = math.cos(b), math.sin(b)
+
+    r2 = l2 * math.cos(h)
+    r3 = r2 + l3 * math.cos(hc)
+    z2 = l1 + l2 * math.sin(h)
+    z3 = z2 + l3 * math.sin(hc)
+
+    return (
+        (0.0, 0.0, r2 * cb, r3 * cb),
+        (0.0, 0.0, r2 * sb, r3 * sb),
+        (0.0, l1, z2, z3),
+    )
+
+
+def posiciones_articulaciones(angulos, longitudes=LONGITUDES, dtype=np.float64, out=None):
+    """
+    Calcula el esqueleto de N poses en una sola pasada vectorizada.
+
+    Args:
+        angulos (array-like): Forma (N, 3) o (N, 4), en grados, columnas
+            (base, brazo, codo[, pinza]). Un vector (3,) o (4,) se trata
+            como N = 1.
+        longitudes (tuple): (L1, L2, L3).
+        dtype (np.dtype): np.float32 o np.float64 (precisión del cálculo
+            y del resultado).
+        out (np.ndarray - None): Arreglo (N, 4, 3) de tipo `dtype` donde
+            escribir el resultado, para reutilizarlo entre llamadas.
+
+    Returns:
+        np.ndarray: Forma (N, 4, 3): para cada pose, los puntos origen,
+        hombro, codo y extremo como (x, y, z).
+
+    Raises:
+        ValueError: Si las formas de `angulos` u `out` no son válidas.
+    """
+    angulos = np.asarray(angulos)
+    if angulos.ndim == 1:
+        angulos = angulos[np.newaxis]
+    if angulos.ndim != 2 or angulos.shape[1] not in (3, 4):
+        raise ValueError(f"Se esperaba forma (N, 3) o (N, 4), no {angulos.shape}")
+
+    n = len(angulos)
+    dtype = np.dtype(dtype)
+    if out is None:
+        out = np.empty((n, 4, 3), dtype=dtype)
+    elif out.shape != (n, 4, 3) or out.dtype != dtype:
+        raise ValueError(f"out debe tener forma {(n, 4, 3)} y tipo {dtype}")
+
+    l1, l2, l3 = longitudes
+    radianes = np.radians(angulos[:, :3], dtype=dtype)
+    base, brazo = radianes[:, 0], radianes[:, 1]
+    cb, sb = np.cos(base), np.sin(base)
+
+    # Ángulo absoluto del segundo segmento (reutiliza la columna del codo)
+    absoluto = np.add(brazo, radianes[:, 2], out=radianes[:, 2])
+
+    # Origen y hombro son constantes
+    out[:, 0] = 0
+    out[:, 1, :2] = 0
+    out[:, 1, 2] = l1
+
+    # Codo: proyección horizontal r2 y altura z2
+    r2 = np.cos(brazo)
+    r2 *= l2
+    np.multiply(r2, cb, out=out[:, 2, 0])
+    np.multiply(r2, sb, out=out[:, 2, 1])
+    z2 = out[:, 2, 2]
+    np.sin(brazo, out=z2)
+    z2 *= l2
+    z2 += l1
+
+    # Extremo: se suma el segundo segmento al codo
+    r3 = np.cos(absoluto)
+    r3 *= l3
+    r3 += r2
+    np.multiply(r3, cb, out=out[:, 3, 0])
+    np.multiply(r3, sb, out=out[:, 3, 1])
+    z3 = out[:, 3, 2]
+    np.sin(absoluto, out=z3)
+    z3 *= l3
+    z3 += z2
+
+    return out
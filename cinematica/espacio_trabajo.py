@@ -0,0 +1,208 @@
+"""
+espacio_trabajo.py
+------------------
+Mapa del espacio de trabajo alcanzable por la pinza.
+
+Recorre la grilla de ángulos permitida por los límites de los sliders
+(base, brazo, codo) con la cinemática directa por lotes y guarda:
+
+- La nube de puntos del extremo del brazo (float32, (M, 3)).
+- Una grilla de ocupación de vóxeles (bool, (nx, ny, nz)): un vóxel está
+  ocupado si algún punto de la nube cae en él.
+
+El cálculo toma del orden de cien milisegundos; el resultado se guarda en
+un .npz comprimido cuyo nombre depende de la geometría (L1, L2, L3), los
+límites y la resolución, de modo que las siguientes ejecuciones lo cargan
+en milisegundos y un cambio de geometría genera otro archivo.
+
+Uso:
+
+    espacio = cargar_espacio_trabajo((3, 5, 5), ((70, 180), (110, 180), (90, 135)))
+    espacio.alcanzable([[0, 5, 8]])      # -> array([ True])
+    espacio.centros_frontera()           # puntos para dibujar la envolvente
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from cinematica.directa import LONGITUDES, posiciones_articulaciones
+
+# Límites de los sliders del Modo Manual: base, brazo, codo (grados)
+LIMITES = ((70, 180), (110, 180), (90, 135))
+PASO_GRADOS = 1.0  # Resolución del barrido de ángulos
+TAMANO_VOXEL = 0.25  # Lado de cada vóxel, en las unidades de L1-L3
+VERSION_CACHE = 1  # Cambiar si cambia el formato o el algoritmo
+
+DIRECTORIO_CACHE = os.environ.get("BRAZO_CACHE") or os.path.join(
+    os.path.expanduser("~"), ".cache", "brazo_robotico"
+)
+
+
+class EspacioTrabajo:
+    """
+    Nube de puntos y grilla de vóxeles del espacio alcanzable.
+
+    Atributos:
+        puntos (np.ndarray): Extremos alcanzables, float32 (M, 3).
+        ocupacion (np.ndarray): Grilla bool (nx, ny, nz).
+        origen (np.ndarray): Esquina mínima de la grilla (3,).
+        tamano_voxel (float): Lado de cada vóxel.
+    """
+
+    def __init__(self, puntos, ocupacion, origen, tamano_voxel):
+        self.puntos = puntos
+        self.ocupacion = ocupacion
+        self.origen = np.asarray(origen, dtype=np.float64)
+        self.tamano_voxel = float(tamano_voxel)
+
+    # ------------------------------------------------------------------
+
+    def indices_voxel(self, puntos):
+        """Índices enteros (N, 3) del vóxel de cada punto (pueden quedar fuera)."""
+        puntos = np.asarray(puntos, dtype=np.float64).reshape(-1, 3)
+        return np.floor((puntos - self.origen) / self.tamano_voxel).astype(np.intp)
+
+    # ------------------------------------------------------------------
+
+    def alcanzable(self, puntos):
+        """
+        Indica qué puntos caen en un vóxel ocupado.
+
+        Args:
+            puntos (array-like): Forma (N, 3) o (3,).
+
+        Returns:
+            np.ndarray: bool (N,).
+        """
+        indices = self.indices_voxel(puntos)
+        dentro = np.all((indices >= 0) & (indices < self.ocupacion.shape), axis=1)
+        resultado = np.zeros(len(indices), dtype=bool)
+        resultado[dentro] = self.ocupacion[tuple(indices[dentro].T)]
+        return resultado
+
+    # ------------------------------------------------------------------
+
+    def centros_frontera(self):
+        """
+        Centros de los vóxeles ocupados con algún vecino (6-conexo) vacío.
+
+        Es la envolvente del espacio de trabajo: muchos menos puntos que la
+        nube completa, suficientes para dibujarla.
+
+        Returns:
+            np.ndarray: float32 (K, 3).
+        """
+        ocupado = np.pad(self.ocupacion, 1)
+        interior = ocupado[1:-1, 1:-1, 1:-1].copy()
+        for eje in range(3):
+            for desplazamiento in (-1, 1):
+                interior &= np.roll(ocupado, desplazamiento, axis=eje)[1:-1, 1:-1, 1:-1]
+        frontera = self.ocupacion & ~interior
+        indices = np.argwhere(frontera)
+        return (self.origen + (indices + 0.5) * self.tamano_voxel).astype(np.float32)
+
+
+def clave_cache(longitudes, limites, paso, tamano_voxel):
+    """Nombre de archivo que identifica la geometría, los límites y la resolución."""
+    parametros = {
+        "version": VERSION_CACHE,
+        "longitudes": [float(v) for v in longitudes],
+        "limites": [[float(v) for v in par] for par in limites],
+        "paso": float(paso),
+        "voxel": float(tamano_voxel),
+    }
+    texto = json.dumps(parametros, sort_keys=True).encode("utf-8")
+    return f"espacio_trabajo_{hashlib.sha1(texto).hexdigest()[:16]}.npz"
+
+
+def generar_espacio_trabajo(
+    longitudes=LONGITUDES, limites=LIMITES, paso=PASO_GRADOS, tamano_voxel=TAMANO_VOXEL
+):
+    """
+    Barre la grilla de ángulos y arma la nube de puntos y los vóxeles.
+
+    Args:
+        longitudes (tuple): (L1, L2, L3).
+        limites (tuple): ((min, max), ...) de base, brazo y codo en grados.
+        paso (float): Separación de la grilla de ángulos, en grados.
+        tamano_voxel (float): Lado de cada vóxel.
+
+    Returns:
+        EspacioTrabajo: Espacio calculado.
+    """
+    ejes = [np.arange(minimo, maximo + paso / 2, paso) for minimo, maximo in limites]
+    grilla = np.stack(np.meshgrid(*ejes, indexing="ij"), axis=-1).reshape(-1, 3)
+    puntos = posiciones_articulaciones(grilla, longitudes, dtype=np.float32)[:, 3]
+
+    origen = np.floor(puntos.min(axis=0) / tamano_voxel) * tamano_voxel
+    indices = np.floor((puntos - origen) / tamano_voxel).astype(np.intp)
+    ocupacion = np.zeros(indices.max(axis=0) + 1, dtype=bool)
+    ocupacion[tuple(indices.T)] = True
+
+    return EspacioTrabajo(np.ascontiguousarray(puntos), ocupacion, origen, tamano_voxel)
+
+
+def cargar_espacio_trabajo(
+    longitudes=LONGITUDES,
+    limites=LIMITES,
+    paso=PASO_GRADOS,
+    tamano_voxel=TAMANO_VOXEL,
+    directorio=DIRECTORIO_CACHE,
+):
+    """
+    Devuelve el espacio de trabajo desde la caché, o lo calcula y lo guarda.
+
+    Args:
+        longitudes, limites, paso, tamano_voxel: Ver `generar_espacio_trabajo`.
+        directorio (str - None): Carpeta de la caché; None para no usarla.
+
+    Returns:
+        EspacioTrabajo: Espacio cargado o calculado.
+    """
+    ruta = None
+    if directorio:
+        ruta = os.path.join(directorio, clave_cache(longitudes, limites, paso, tamano_voxel))
+        try:
+            with np.load(ruta) as datos:
+                return EspacioTrabajo(
+                    datos["puntos"],
+                    datos["ocupacion"],
+                    datos["origen"],
+                    float(datos["tamano_voxel"]),
+                )
+        except (OSError, KeyError, ValueError):
+            pass  # Sin caché o archivo dañado: se recalcula
+
+    espacio = generar_espacio_trabajo(longitudes, limites, paso, tamano_voxel)
+
+    if ruta is not None:
+        try:
+            os.makedirs(directorio, exist_ok=True)
+            temporal = ruta + ".tmp.npz"
+            np.savez_compressed(
+                temporal,
+                puntos=espacio.puntos,
+                ocupacion=espacio.ocupacion,
+                origen=espacio.origen,
+                tamano_voxel=espacio.tamano_voxel,
+            )
+            os.replace(temporal, ruta)  # Escritura atómica
+        except OSError as e:
+            print(f"No se pudo guardar la caché del espacio de trabajo: {e}")
+
+    return espacio
@@ -0,0 +1,184 @@
+"""
+inversa.py
+----------
+Cinemática inversa analítica (forma cerrada) del brazo: base, brazo y codo.
+
+Con la convención de cinematica/directa.py, el extremo cumple:
+
+    r = L2·cos(brazo) + L3·cos(brazo + codo)
+    x = r·cos(base),  y = r·sin(base)
+    z = L1 + L2·sin(brazo) + L3·sin(brazo + codo)
+
+Para un objetivo (x, y, z) hay hasta cuatro soluciones:
+
+- Dos para la base: atan2(y, x) con r = +ρ, o la opuesta (base + 180°)
+  con r = -ρ, donde ρ = √(x² + y²). Con los límites actuales del brazo
+  (110–180°), el primer segmento apunta hacia atrás, así que la segunda
+  rama es la que suele cumplirlos.
+- Dos para el codo (arriba o abajo), por la ley de los cosenos en el plano
+  vertical que contiene al brazo.
+
+Las cuatro se calculan para todos los objetivos a la vez. Luego se
+descartan las que violan los límites articulares y se elige una según la
+preferencia de codo o la cercanía a una pose de referencia.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import numpy as np
+
+from cinematica.directa import LONGITUDES
+
+PREFERENCIAS_CODO = ("cercana", "arriba", "abajo")
+
+
+def _ajustar_a_limites(angulos, limites):
+    """
+    Lleva cada ángulo al equivalente (módulo 360°) más cercano por encima
+    del mínimo de su articulación.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (ángulos ajustados, dentro de límites).
+    """
+    minimos = np.array([par[0] for par in limites], dtype=np.float64)
+    maximos = np.array([par[1] for par in limites], dtype=np.float64)
+    ajustados = minimos + np.mod(angulos - minimos, 360.0)
+    # Un ángulo apenas por debajo del mínimo (por redondeo) queda cerca de
+    # mínimo + 360: se devuelve junto al mínimo para no perder la solución
+    ajustados = np.where(ajustados > minimos + 360.0 - 1e-6, ajustados - 360.0, ajustados)
+    dentro = (ajustados >= minimos - 1e-6) & (ajustados <= maximos + 1e-6)
+    return np.clip(ajustados, minimos, maximos), np.all(dentro, axis=-1)
+
+
+def soluciones_candidatas(puntos, longitudes=LONGITUDES):
+    """
+    Calcula las cuatro soluciones de cada objetivo, sin aplicar límites.
+
+    Args:
+        puntos (array-like): Objetivos (N, 3).
+        longitudes (tuple): (L1, L2, L3).
+
+    Returns:
+        tuple:
+            angulos (np.ndarray): (N, 4, 3) en grados; candidatos en el
+                orden (rama base 1, codo +), (rama 1, codo -),
+                (rama 2, codo +), (rama 2, codo -).
+            alcanzable (np.ndarray): bool (N, 4), False si el objetivo
+                queda fuera del alcance geométrico.
+            arriba (np.ndarray): bool (N, 4), True si el codo queda por
+                encima de la recta hombro-objetivo.
+    """
+    l1, l2, l3 = longitudes
+    puntos = np.asarray(puntos, dtype=np.float64).reshape(-1, 3)
+    x, y, z = puntos[:, 0], puntos[:, 1], puntos[:, 2] - l1
+    rho = np.hypot(x, y)
+    base = np.arctan2(y, x)
+
+    # Ley de los cosenos para el ángulo relativo del codo
+    coseno = (rho**2 + z**2 - l2**2 - l3**2) / (2 * l2 * l3)
+    alcanzable = np.abs(coseno) <= 1 + 1e-9
+    codo = np.arccos(np.clip(coseno, -1.0, 1.0))
+
+    angulos = np.empty((len(puntos), 4, 3))
+    arriba = np.empty((len(puntos), 4), dtype=bool)
+    for rama, signo_r in enumerate((1.0, -1.0)):
+        r = signo_r * rho
+        base_rama = base if signo_r > 0 else base + np.pi
+        for eleccion, signo_codo in enumerate((1.0, -1.0)):
+            indice = 2 * rama + eleccion
+            c = signo_codo * codo
+            brazo = np.arctan2(z, r) - np.arctan2(l3 * np.sin(c), l2 + l3 * np.cos(c))
+            angulos[:, indice, 0] = base_rama
+            angulos[:, indice, 1] = brazo
+            angulos[:, indice, 2] = c
+
+            # Codo "arriba": el codo queda sobre la recta hombro-objetivo
+            er, ez = l2 * np.cos(brazo), l2 * np.sin(brazo)
+            cruz = r * ez - z * er
+            arriba[:, indice] = np.where(r != 0, cruz * np.sign(r) > 0, cruz > 0)
+
+    return np.degrees(angulos), np.repeat(alcanzable[:, None], 4, axis=1), arriba
+
+
+def cinematica_inversa(
+    puntos,
+    longitudes=LONGITUDES,
+    limites=None,
+    preferencia_codo="cercana",
+    referencia=None,
+):
+    """
+    Resuelve la cinemática inversa de N objetivos en una sola llamada.
+
+    Args:
+        puntos (array-like): Objetivos (N, 3) o (3,).
+        longitudes (tuple): (L1, L2, L3).
+        limites (tuple - None): ((min, max), ...) de base, brazo y codo en
+            grados; None no filtra (ángulos en [-180, 180)).
+        preferencia_codo (str): 'arriba' o 'abajo' priorizan esa
+            configuración; 'cercana' elige la solución más cercana a
+            `referencia`.
+        referencia (array-like - None): Pose (3,) o (N, 3) en grados para
+            desempatar (por ejemplo, la posición actual de los sliders).
+
+    Returns:
+        tuple:
+            angulos (np.ndarray): (N, 3) en grados (NaN si no hay solución).
+            validos (np.ndarray): bool (N,).
+
+    Raises:
+        ValueError: Si la preferencia de codo no es válida.
+    """
+    if preferencia_codo not in PREFERENCIAS_CODO:
+        raise ValueError(f"preferencia_codo debe ser una de {PREFERENCIAS_CODO}")
+
+    candidatos, validos, arriba = soluciones_candidatas(puntos, longitudes)
+    if limites is None:
+        candidatos = np.mod(candidatos + 180.0, 360.0) - 180.0
+    else:
+        candidatos, dentro = _ajustar_a_limites(candidatos, limites)
+        validos &= dentro
+
+    # Puntaje por candidato: menor es mejor, inválidos al final
+    puntaje = np.zeros(validos.shape)
+    if referencia is not None:
+        referencia = np.asarray(referencia, dtype=np.float64).reshape(-1, 1, 3)
+        diferencia = np.mod(candidatos - referencia + 180.0, 360.0) - 180.0
+        puntaje += np.sum(diferencia**2, axis=-1)
+    if preferencia_codo != "cercana":
+        preferido = arriba if preferencia_codo == "arriba" else ~arriba
+        puntaje += np.where(preferido, 0.0, 1e12)
+    puntaje[~validos] = np.inf
+
+    eleccion = np.argmin(puntaje, axis=1)
+    filas = np.arange(len(eleccion))
+    angulos = candidatos[filas, eleccion]
+    resueltos = validos[filas, eleccion]
+    angulos[~resueltos] = np.nan
+    return angulos, resueltos
+
+
+def resolver(
+    x, y, z, longitudes=LONGITUDES, limites=None, preferencia_codo="cercana", referencia=None
+):
+    """
+    Resuelve un único objetivo (atajo de `cinematica_inversa` para la GUI).
+
+    Returns:
+        tuple | None: (base, brazo, codo) en grados, o None si no hay
+        solución dentro de los límites.
+    """
+    angulos, validos = cinematica_inversa(
+        (x, y, z), longitudes, limites, preferencia_codo, referencia
+    )
+    return tuple(float(a) for a in angulos[0]) if validos[0] else None
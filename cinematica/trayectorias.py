@@ -0,0 +1,211 @@
+"""
+trayectorias.py
+---------------
+Generación de trayectorias en el espacio articular a frecuencia fija.
+
+Entre cada par de puntos de paso consecutivos el movimiento sigue un
+perfil normalizado s(τ), con τ = t / T en [0, 1]:
+
+- "lineal": s = τ (velocidad constante; solo respeta la velocidad máxima).
+- "cubico": s = 3τ² - 2τ³ (velocidad nula en los extremos).
+- "quintico": s = 10τ³ - 15τ⁴ + 6τ⁵ (velocidad y aceleración nulas en los
+  extremos).
+- "trapezoidal": aceleración constante, crucero y frenado.
+
+Todas las articulaciones empiezan y terminan juntas. La duración de cada
+tramo es la menor que cumple los límites de velocidad y aceleración de
+cada articulación, salvo que se indique explícitamente.
+
+El resultado es un arreglo de setpoints (M, J) muestreado a frecuencia fija
+y generado en una sola pasada vectorizada para todos los tramos. Sirve
+para la animación de vista previa del Modo Manual y, convertido con
+`a_decimas`, para transmitirlo al Arduino.
+
+Uso:
+
+    tray = generar_trayectoria([[90, 120, 90, 60], [150, 170, 120, 0]],
+                               frecuencia=50, perfil="trapezoidal")
+    tray.tiempos   # (M,)  segundos
+    tray.angulos   # (M, 4) grados
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+PERFILES = ("lineal", "cubico", "quintico", "trapezoidal")
+FRECUENCIA_DEFECTO = 50.0  # Setpoints por segundo (igual que EmisorSetpoints)
+VELOCIDAD_MAX = 90.0  # Grados por segundo, por articulación
+ACELERACION_MAX = 360.0  # Grados por segundo², por articulación
+
+# Velocidad y aceleración máximas de s(τ) (en unidades de Δ/T y Δ/T²)
+PICOS_PERFIL = {
+    "lineal": (1.0, 0.0),
+    "cubico": (1.5, 6.0),
+    "quintico": (1.875, 10 / np.sqrt(3)),
+}
+
+# Fracciones de aceleración candidatas para el perfil trapezoidal
+_FRACCIONES = np.linspace(0.01, 0.5, 50)
+
+Trayectoria = namedtuple("Trayectoria", ["tiempos", "angulos", "duraciones"])
+
+
+def perfil_normalizado(perfil, tau, fraccion=None):
+    """
+    Evalúa s(τ) de un perfil.
+
+    Args:
+        perfil (str): Uno de PERFILES.
+        tau (np.ndarray): Tiempo normalizado en [0, 1].
+        fraccion (np.ndarray - None): Solo trapezoidal: fracción del tramo
+            dedicada a acelerar (igual a la de frenado), en (0, 0.5].
+
+    Returns:
+        np.ndarray: s(τ) en [0, 1], misma forma que `tau`.
+    """
+    if perfil == "lineal":
+        return tau.copy()
+    if perfil == "cubico":
+        return tau * tau * (3 - 2 * tau)
+    if perfil == "quintico":
+        return tau**3 * (10 + tau * (-15 + 6 * tau))
+    if perfil == "trapezoidal":
+        f = fraccion
+        pico = 1.0 / (1.0 - f)  # Velocidad de crucero normalizada
+        acelerando = pico * tau * tau / (2 * f)
+        crucero = pico * (tau - f / 2)
+        frenando = 1.0 - pico * (1 - tau) ** 2 / (2 * f)
+        return np.where(tau < f, acelerando, np.where(tau > 1 - f, frenando, crucero))
+    raise ValueError(f"Perfil desconocido: {perfil!r} (usar uno de {PERFILES})")
+
+
+def duraciones_minimas(deltas, perfil, velocidad_max, aceleracion_max):
+    """
+    Duración mínima de cada tramo que respeta los límites de todas las
+    articulaciones.
+
+    Args:
+        deltas (np.ndarray): Desplazamientos absolutos (K, J) en grados.
+        perfil (str): Uno de PERFILES.
+        velocidad_max, aceleracion_max (np.ndarray): Límites (J,).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: Duraciones (K,) y, para el
+        perfil trapezoidal, la fracción de aceleración de cada tramo (K,).
+    """
+    if perfil == "trapezoidal":
+        # Con fracción f común a todas las articulaciones:
+        #   velocidad pico = Δ / (T (1 - f)),  aceleración = Δ / (T² f (1 - f))
+        # Se busca la f que minimiza la mayor T requerida (forma (K, F, J)).
+        f = _FRACCIONES[None, :, None]
+        d = deltas[:, None, :]
+        por_velocidad = d / (velocidad_max * (1 - f))
+        por_aceleracion = np.sqrt(d / (aceleracion_max * f * (1 - f)))
+        requerida = np.maximum(por_velocidad, por_aceleracion).max(axis=2)
+        mejor = np.argmin(requerida, axis=1)
+        filas = np.arange(len(deltas))
+        return requerida[filas, mejor], _FRACCIONES[mejor]
+
+    pico_v, pico_a = PICOS_PERFIL[perfil]
+    duraciones = (pico_v * deltas / velocidad_max).max(axis=1)
+    if pico_a:
+        duraciones = np.maximum(
+            duraciones, np.sqrt(pico_a * deltas / aceleracion_max).max(axis=1)
+        )
+    return duraciones, None
+
+
+def generar_trayectoria(
+    puntos_paso,
+    frecuencia=FRECUENCIA_DEFECTO,
+    perfil="quintico",
+    velocidad_max=VELOCIDAD_MAX,
+    aceleracion_max=ACELERACION_MAX,
+    duraciones=None,
+):
+    """
+    Genera los setpoints que recorren los puntos de paso, deteniéndose en cada uno.
+
+    Args:
+        puntos_paso (array-like): Poses (K + 1, J) en grados.
+        frecuencia (float): Setpoints por segundo.
+        perfil (str): Uno de PERFILES.
+        velocidad_max (float | array-like): Grados/s, escalar o por articulación.
+        aceleracion_max (float | array-like): Grados/s², escalar o por articulación.
+        duraciones (array-like - None): Segundos de cada tramo (K,); si una
+            es menor que la mínima permitida por los límites, se usa la mínima.
+
+    Returns:
+        Trayectoria: tiempos (M,), angulos (M, J) y duraciones (K,) de los
+        tramos. El primer setpoint es el primer punto de paso y el último
+        coincide exactamente con el punto final.
+
+    Raises:
+        ValueError: Si hay menos de dos puntos de paso o el perfil no existe.
+    """
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil desconocido: {perfil!r} (usar uno de {PERFILES})")
+    puntos = np.asarray(puntos_paso, dtype=np.float64)
+    if puntos.ndim != 2 or len(puntos) < 2:
+        raise ValueError("Se necesitan al menos dos puntos de paso (K + 1, J)")
+
+    cantidad_articulaciones = puntos.shape[1]
+    velocidad_max = np.broadcast_to(velocidad_max, (cantidad_articulaciones,))
+    aceleracion_max = np.broadcast_to(aceleracion_max, (cantidad_articulaciones,))
+
+    diferencias = np.diff(puntos, axis=0)
+    minimas, fracciones = duraciones_minimas(
+        np.abs(diferencias), perfil, velocidad_max, aceleracion_max
+    )
+    if duraciones is not None:
+        minimas = np.maximum(minimas, np.asarray(duraciones, dtype=np.float64))
+    duraciones = minimas
+
+    # Muestreo global a frecuencia fija; cada instante se asigna a su tramo
+    inicios = np.concatenate(([0.0], np.cumsum(duraciones)))
+    total = inicios[-1]
+    cantidad = int(np.floor(total * frecuencia + 1e-9)) + 1
+    tiempos = np.arange(cantidad) / frecuencia
+    if tiempos[-1] < total:
+        tiempos = np.append(tiempos, total)
+
+    tramo = np.clip(np.searchsorted(inicios, tiempos, side="right") - 1, 0, len(duraciones) - 1)
+    con_duracion = duraciones[tramo] > 0
+    tau = np.ones_like(tiempos)
+    tau[con_duracion] = (tiempos[con_duracion] - inicios[tramo][con_duracion]) / duraciones[
+        tramo
+    ][con_duracion]
+    np.clip(tau, 0.0, 1.0, out=tau)
+
+    s = perfil_normalizado(
+        perfil, tau, None if fracciones is None else fracciones[tramo]
+    )
+    angulos = puntos[tramo] + s[:, None] * diferencias[tramo]
+    angulos[-1] = puntos[-1]
+    return Trayectoria(tiempos, angulos, duraciones)
+
+
+def a_decimas(angulos):
+    """
+    Convierte setpoints en grados al formato del protocolo (u16, décimas).
+
+    Args:
+        angulos (np.ndarray): (M, J) en grados.
+
+    Returns:
+        np.ndarray: uint16 (M, J).
+    """
+    return np.clip(np.rint(np.asarray(angulos) * 10), 0, 0xFFFF).astype(np.uint16)
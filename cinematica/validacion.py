@@ -0,0 +1,167 @@
+"""
+validacion.py
+-------------
+Validación vectorizada de poses y trayectorias antes de enviarlas al brazo.
+
+Para N poses (N, 3) o (N, 4) en grados se calculan, en una sola pasada:
+
+- "limites": algún ángulo fuera de los límites de su articulación.
+- "suelo": el codo o el extremo por debajo del plano de la mesa. Los
+  segmentos son rectos, así que basta con revisar sus puntos extremos.
+- "base": el brazo o el antebrazo atraviesan la columna de la base,
+  modelada como un cilindro vertical de radio `radio_base` desde el suelo
+  hasta el hombro.
+
+Para el cilindro, cada segmento P(t) = A + t·(B - A), t en [0, 1], se
+recorta primero al intervalo de t en que su altura está dentro de la
+columna; en ese intervalo la distancia horizontal al eje es una cuadrática
+en t, cuyo mínimo se obtiene en forma cerrada. El hombro está sobre el
+centro de la columna: un segmento que sale de él hacia arriba u
+horizontal no cuenta como choque, uno que baja sí.
+
+Validar 10 000 muestras toma unos pocos milisegundos, así que se puede
+hacer antes de cada envío.
+
+Uso:
+
+    violacion = primera_violacion(trayectoria.angulos, limites=limites)
+    if violacion is not None:
+        print(violacion.indice, violacion.motivo)
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from cinematica.directa import LONGITUDES, posiciones_articulaciones
+
+MOTIVOS = ("limites", "suelo", "base")
+SUELO = 0.0  # Altura de la mesa
+RADIO_BASE = 1.0  # Radio de la columna de la base (unidades de L1, L2, L3)
+
+Violacion = namedtuple("Violacion", ["indice", "motivo"])
+
+
+def _fuera_de_limites(angulos, limites):
+    """bool (N,): algún ángulo fuera de su par (min, max)."""
+    limites = np.asarray(limites, dtype=np.float64)
+    columnas = angulos[:, : len(limites)]
+    fuera = (columnas < limites[:, 0] - 1e-6) | (columnas > limites[:, 1] + 1e-6)
+    return fuera.any(axis=1)
+
+
+def _atraviesa_cilindro(inicios, finales, radio, altura):
+    """
+    bool (N,): algún segmento toca el cilindro vertical centrado en el eje z
+    entre z = 0 y z = altura (tope abierto).
+
+    Args:
+        inicios, finales (np.ndarray): Extremos de los segmentos (N, S, 3).
+    """
+    d = finales - inicios
+    az, dz = inicios[..., 2], d[..., 2]
+
+    # Intervalo de t con 0 <= z(t) < altura
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ta = -az / dz
+        tb = (altura - 1e-9 - az) / dz
+    plano = dz == 0
+    dentro_plano = (az >= 0) & (az < altura - 1e-9)
+    t0 = np.where(plano, np.where(dentro_plano, 0.0, 1.0), np.maximum(np.minimum(ta, tb), 0.0))
+    t1 = np.where(plano, np.where(dentro_plano, 1.0, 0.0), np.minimum(np.maximum(ta, tb), 1.0))
+
+    # Mínimo de |A_xy + t·D_xy|² en [t0, t1]
+    ax, ay, dx, dy = inicios[..., 0], inicios[..., 1], d[..., 0], d[..., 1]
+    largo2 = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_min = np.where(largo2 > 0, -(ax * dx + ay * dy) / largo2, 0.0)
+    t = np.clip(t_min, t0, t1)
+    cx, cy = ax + t * dx, ay + t * dy
+    distancia2 = cx * cx + cy * cy
+
+    choca = (t0 <= t1) & (distancia2 < radio * radio)
+    return choca.any(axis=-1)
+
+
+def violaciones(
+    angulos,
+    longitudes=LONGITUDES,
+    limites=None,
+    suelo=SUELO,
+    radio_base=RADIO_BASE,
+    posiciones=None,
+):
+    """
+    Revisa N poses y devuelve qué muestras violan cada restricción.
+
+    Args:
+        angulos (array-like): (N, 3) o (N, 4) en grados (base, brazo, codo
+            [, pinza]); un vector se trata como N = 1.
+        longitudes (tuple): (L1, L2, L3).
+        limites (tuple - None): ((min, max), ...) por articulación, en el
+            orden de las columnas; None no revisa límites.
+        suelo (float): Altura de la mesa.
+        radio_base (float): Radio de la columna de la base; 0 no la revisa.
+        posiciones (np.ndarray - None): Esqueleto (N, 4, 3) ya calculado
+            con `posiciones_articulaciones`, para no repetirlo.
+
+    Returns:
+        dict: Para cada motivo de MOTIVOS, un arreglo bool (N,).
+    """
+    angulos = np.asarray(angulos, dtype=np.float64)
+    if angulos.ndim == 1:
+        angulos = angulos[np.newaxis]
+    if posiciones is None:
+        posiciones = posiciones_articulaciones(angulos, longitudes)
+
+    n = len(angulos)
+    resultado = {}
+    resultado["limites"] = (
+        np.zeros(n, dtype=bool) if limites is None else _fuera_de_limites(angulos, limites)
+    )
+    # Codo y extremo (origen y hombro son fijos)
+    resultado["suelo"] = (posiciones[:, 2:, 2] < suelo).any(axis=1)
+    if radio_base > 0:
+        # Segmentos hombro-codo y codo-extremo; la columna llega al hombro
+        resultado["base"] = _atraviesa_cilindro(
+            posiciones[:, 1:3], posiciones[:, 2:4], radio_base, longitudes[0]
+        )
+    else:
+        resultado["base"] = np.zeros(n, dtype=bool)
+    return resultado
+
+
+def primera_violacion(angulos, **opciones):
+    """
+    Primera muestra que viola alguna restricción.
+
+    Args:
+        angulos (array-like): (N, 3) o (N, 4) en grados.
+        **opciones: Las de `violaciones` (longitudes, limites, suelo, ...).
+
+    Returns:
+        Violacion | None: (indice, motivo), o None si toda la trayectoria
+        es válida. Si una muestra viola varias restricciones, el motivo es
+        el primero según MOTIVOS.
+    """
+    resultado = violaciones(angulos, **opciones)
+    invalidos = np.zeros_like(resultado[MOTIVOS[0]])
+    for motivo in MOTIVOS:
+        invalidos |= resultado[motivo]
+    if not invalidos.any():
+        return None
+    indice = int(np.argmax(invalidos))
+    motivo = next(m for m in MOTIVOS if resultado[m][indice])
+    return Violacion(indice, motivo)
@@ -5,6 +5,34 @@ Módulo encargado de gestionar la detección y comunicación serial con un
 Arduino UNO. Utiliza PySerial para la apertura del puerto, envío de datos,
 lectura de respuestas y reconexión automática.
 
+La lectura del puerto la realiza un hilo dedicado (ver lector_serial.py), de
+modo que las respuestas del Arduino quedan disponibles en cuanto llegan, sin
+depender de la frecuencia con que la GUI consulte.
+
+Opcionalmente, un monitor de hotplug (ver monitor_puertos.py) mantiene en
+caché la lista de puertos, evitando enumerar dispositivos USB en cada
+revisión de conexión.
+
+Se soportan dos protocolos: el de texto original ("rutina,repeticiones\n",
+por defecto) y un protocolo binario con tramas y CRC (ver
+protocolo_binario.py), seleccionable con `protocolo="binario"`.
+
+Al abrir el puerto el Arduino se reinicia. En lugar de esperar un tiempo fijo,
+`conectar` realiza un saludo: el firmware envía "Listo" al terminar su
+setup() y responde "Listo" a cada "ping". Los comandos enviados antes de eso
+se encolan y se transmiten en cuanto el Arduino confirma que está listo (o
+al vencer `TIMEOUT_LISTO`, para firmware que no implementa el saludo).
+El saludo también anuncia las capacidades del firmware ("Listo,SP" o el
+byte de TIPO_LISTO): los setpoints del Modo Manual solo se envían a un
+firmware que declaró aceptarlos, nunca a un sketch que solo entiende
+"rutina,repeticiones".
+
+La reconexión puede delegarse en `MaquinaConexion` (ver
+`iniciar_supervision`): una máquina de estados explícita en un hilo propio,
+con espera exponencial con jitter entre intentos y métricas de conexión, que
+notifica cada cambio de estado a los suscriptores en lugar de que la GUI
+consulte periódicamente.
+
 Autores:
     Hermes Rojas Sancho
     Donifer Campos Parra
@@ -18,19 +46,52 @@ Año:
     2025
 """
 
+import os
+import random
+import struct
+import threading
+
 import serial
 import serial.tools.list_ports
 import time
 
+from hardware.lector_serial import DecodificadorLineas, LectorSerial
+from hardware.monitor_puertos import MonitorPuertos, enumerar_puertos
+from hardware import protocolo_binario as pb
+
+BAUDIOS_TEXTO = 9600
+BAUDIOS_BINARIO = 115200
+
+MENSAJE_LISTO = pb.MENSAJES_TEXTO[pb.TIPO_LISTO]
+TIMEOUT_LISTO = 4.0  # Segundos máximos de espera del saludo del firmware
+INTERVALO_PING = 0.25  # Segundos entre pings mientras no hay respuesta
+
+# Estados de MaquinaConexion
+DESCONECTADO = "desconectado"
+SONDEANDO = "sondeando"
+ABRIENDO = "abriendo"
+NEGOCIANDO = "negociando"
+LISTO = "listo"
+DEGRADADO = "degradado"  # Puerto abierto, pero el firmware no confirmó el saludo
+
+ESPERA_BASE = 0.5  # Segundos de la primera espera entre intentos
+ESPERA_MAXIMA = 30.0  # Tope de la espera exponencial
+TIEMPO_ESTABLE = 10.0  # Segundos en LISTO para reiniciar la espera exponencial
+INTERVALO_VIGILANCIA = 0.25  # Segundos entre revisiones de una conexión activa
+
 
 # ---------------------------------------------------------------------------
 # Para depuración: muestra los dispositivos conectados en puertos serie.
 # Esto NO afecta el funcionamiento del programa, solo imprime en consola.
+# Antes se ejecutaba al importar el módulo; ahora es explícito para no
+# enumerar puertos durante el arranque (el monitor de hotplug ya informa
+# cada puerto detectado).
 # ---------------------------------------------------------------------------
-print("Puertos siendo utilizados:")
-puertos = serial.tools.list_ports.comports()
-for puerto in puertos:
-    print(puerto)
+def imprimir_puertos():
+    """Imprime en consola los puertos serie presentes en el sistema."""
+    print("Puertos siendo utilizados:")
+    for puerto in serial.tools.list_ports.comports():
+        print(puerto)
 
 
 class ArduinoDetector:
@@ -49,29 +110,148 @@ class ArduinoDetector:
         puerto (str - None): Nombre del puerto COM donde se encuentra conectado el Arduino.
         conexion (serial.Serial - None): Objeto Serial activo.
         estado_arduino (str): 'conectado' o 'desconectado'.
+        lector (LectorSerial - None): Hilo que drena el puerto mientras hay conexión.
+        monitor (MonitorPuertos - None): Monitor de hotplug, si fue iniciado.
+        protocolo (str): 'texto' o 'binario'.
+        puerto_fijo (str - None): Puerto indicado explícitamente (p. ej. el
+            pty del simulador); si existe, se omite la detección por descripción.
+        manejadores (dict): {tipo: función(trama)} para tramas binarias que
+            no son mensajes de estado (telemetría, ACK, ...), y
+            {prefijo: función(linea)} para líneas de texto como "SP,seq".
+        listo (threading.Event): Activo cuando se pueden enviar comandos.
+        listo_confirmado (bool): True si el firmware respondió al saludo
+            (False si `listo` se activó solo por timeout).
+        capacidades (int): Capacidades anunciadas en el saludo
+            (protocolo_binario.CAPACIDAD_*); 0 para un sketch sin saludo o
+            que no las anuncia.
+        maquina (MaquinaConexion - None): Supervisor de la conexión, si fue iniciado.
+        callback_mensajes (callable - None): Función opcional llamada desde el
+            hilo lector con cada mensaje completo recibido.
     """
 
-    def __init__(self):
-        """Inicializa el detector sin puerto ni conexión activa."""
+    def __init__(self, callback_mensajes=None, protocolo="texto", puerto=None):
+        """
+        Inicializa el detector sin puerto ni conexión activa.
+
+        Args:
+            callback_mensajes (callable - None): Función llamada con cada
+                mensaje recibido. Se ejecuta en el hilo lector.
+            protocolo (str): 'texto' (por defecto) o 'binario'.
+            puerto (str - None): Puerto a usar siempre, sin autodetección.
+        """
+        if protocolo not in ("texto", "binario"):
+            raise ValueError(f"Protocolo desconocido: {protocolo}")
+
         self.puerto = None
         self.conexion = None
         self.estado_arduino = "desconectado"
+        self.lector = None
+        self.monitor = None
+        self.callback_mensajes = callback_mensajes
+        self.protocolo = protocolo
+        self.puerto_fijo = puerto
+        self.manejadores = {}
+        self._secuencia = 0
+        self.listo = threading.Event()
+        self.listo_confirmado = False
+        self.capacidades = 0
+        self.maquina = None
+        self._pendientes = []  # Comandos enviados antes del saludo
+        self._bloqueo_envio = threading.Lock()
+        # El saludo es tráfico del protocolo: lo consume el detector en el
+        # hilo lector y no llega a la cola de mensajes ni a callback_mensajes
+        self.manejadores[MENSAJE_LISTO] = self._al_saludo
+        self.manejadores[pb.TIPO_LISTO] = self._al_saludo
+
+    # ------------------------------------------------------------------
+
+    def iniciar_monitor(self):
+        """
+        Inicia el monitor de hotplug en segundo plano.
+
+        A partir de este momento `detectar` y `revisar_conexion` consultan la
+        tabla de puertos en caché en lugar de enumerar los dispositivos.
+        """
+        if self.monitor is None:
+            self.monitor = MonitorPuertos(callback=self._evento_puerto)
+            self.monitor.start()
+
+    # ------------------------------------------------------------------
+
+    def _evento_puerto(self, evento, dispositivo, descripcion):
+        """Recibe los eventos del monitor (se ejecuta en el hilo del monitor)."""
+        print(f"Puerto {evento}: {dispositivo} ({descripcion})")
+        if self.maquina is not None:
+            # Un cambio físico justifica reintentar de inmediato
+            self.maquina.despertar(reiniciar_espera=evento == "conectado")
 
     # ------------------------------------------------------------------
 
-    def detectar(self):
+    def iniciar_supervision(self, callback_estado=None):
+        """
+        Delega la detección y reconexión en una MaquinaConexion.
+
+        A partir de aquí `revisar_conexion` ya no reconecta: lo hace el hilo
+        de la máquina, con espera exponencial entre intentos.
+
+        Args:
+            callback_estado (callable - None): Suscriptor inicial, ver
+                `MaquinaConexion.suscribir`.
+
+        Returns:
+            MaquinaConexion: La máquina de estados iniciada.
+        """
+        if self.maquina is None:
+            self.maquina = MaquinaConexion(self)
+            if callback_estado is not None:
+                self.maquina.suscribir(callback_estado)
+            self.maquina.iniciar()
+        return self.maquina
+
+    # ------------------------------------------------------------------
+
+    def _listar_puertos(self):
+        """
+        Devuelve los puertos disponibles.
+
+        Returns:
+            dict: {dispositivo: descripción}, desde la caché del monitor si
+            está activo o mediante una enumeración en caso contrario.
+        """
+        if self.monitor is not None:
+            return self.monitor.obtener_dispositivos()
+        return enumerar_puertos()
+
+    # ------------------------------------------------------------------
+
+    def detectar(self, puertos=None):
         """
         Busca un dispositivo reconocido como Arduino en los puertos serie.
 
+        Args:
+            puertos (dict - None): Tabla {dispositivo: descripción} ya
+                obtenida; si es None se consulta con `_listar_puertos`.
+
         Returns:
             True si encuentra un Arduino o dispositivo compatible,
             False si no hay ninguno conectado.
 
         """
-        puertos = serial.tools.list_ports.comports()
+        if self.puerto_fijo:
+            # Los pty (simulador) no aparecen en comports(): basta que exista
+            if self.puerto_fijo in (puertos or {}) or os.path.exists(self.puerto_fijo):
+                if self.puerto != self.puerto_fijo:
+                    self.puerto = self.puerto_fijo
+                    print("--------------------------")
+                    print("Usando puerto indicado", self.puerto)
+                return True
+            puertos = {}
 
-        for puerto in puertos:
-            descripcion = puerto.description.lower()
+        if puertos is None:
+            puertos = self._listar_puertos()
+
+        for dispositivo, descripcion in puertos.items():
+            descripcion = descripcion.lower()
 
             # Coincidencias típicas encontradas en Windows/Linux/Mac
             if (
@@ -80,8 +260,8 @@ class ArduinoDetector:
                 or "dispositivo serie" in descripcion
             ):
                 # Detecta cambio de puerto
-                if self.puerto != puerto.device:
-                    self.puerto = puerto.device
+                if self.puerto != dispositivo:
+                    self.puerto = dispositivo
                     print("--------------------------")
                     print("Arduino detectado en", self.puerto)
 
@@ -109,13 +289,19 @@ class ArduinoDetector:
 
     # ------------------------------------------------------------------
 
-    def conectar(self, baudrate=9600, timeout=1):
+    def conectar(self, baudrate=None, timeout=1, esperar_listo=False,
+                 timeout_listo=TIMEOUT_LISTO):
         """
-        Intenta abrir la conexión serial con el Arduino.
+        Intenta abrir la conexión serial con el Arduino e inicia el saludo.
 
         Args:
-            baudrate (int): Velocidad de comunicación serial.
+            baudrate (int - None): Velocidad de comunicación serial. Por
+                defecto 9600 en modo texto y 115200 en modo binario.
             timeout (int | float): Tiempo máximo para lecturas bloqueantes.
+            esperar_listo (bool): Si es True, no retorna hasta que el firmware
+                confirme estar listo (o venza `timeout_listo`). Si es False
+                retorna de inmediato y los comandos se encolan mientras tanto.
+            timeout_listo (float): Segundos máximos de espera del saludo.
 
         Returns:
             bool: True si la conexión fue exitosa, False si no fue posible conectar.
@@ -123,22 +309,276 @@ class ArduinoDetector:
         if not self.puerto:
             return False
 
+        if baudrate is None:
+            baudrate = BAUDIOS_BINARIO if self.protocolo == "binario" else BAUDIOS_TEXTO
+
         # Cerrar conexión previa si sigue abierta
+        self._detener_lector()
         if self.conexion and self.conexion.is_open:
             self.conexion.close()
 
         try:
             self.conexion = serial.Serial(self.puerto, baudrate, timeout=timeout)
-            # time.sleep(2)
+            self.listo.clear()
+            self.listo_confirmado = False
+            self.capacidades = 0
+            self._iniciar_lector()
             self.estado_arduino = "conectado"
             print(f"Conectado al Arduino en {self.puerto}")
             print("Arduino conectado correctamente.")
-            return True
 
         except (serial.SerialException, FileNotFoundError):
             self.estado_arduino = "desconectado"
             return False
 
+        threading.Thread(
+            target=self._saludar,
+            args=(self.conexion, time.monotonic() + timeout_listo),
+            name="SaludoArduino",
+            daemon=True,
+        ).start()
+
+        if esperar_listo:
+            self.listo.wait(timeout_listo + INTERVALO_PING)
+        return True
+
+    # ------------------------------------------------------------------
+
+    def _saludar(self, conexion, limite):
+        """
+        Envía pings hasta que el firmware responda "Listo" o venza el límite.
+
+        Se ejecuta en un hilo propio. Si el firmware no responde a tiempo se
+        asume listo igualmente (comportamiento equivalente a la espera fija
+        anterior) para no bloquear los comandos encolados.
+        """
+        while self.conexion is conexion and not self.listo.is_set():
+            if time.monotonic() >= limite:
+                print("El Arduino no confirmó estar listo; se continúa igualmente.")
+                self._marcar_listo(conexion)
+                return
+            self._enviar_ping(conexion)
+            self.listo.wait(INTERVALO_PING)
+
+    # ------------------------------------------------------------------
+
+    def _enviar_ping(self, conexion):
+        """Escribe un ping directamente, sin pasar por la cola de comandos."""
+        if self.protocolo == "binario":
+            datos = pb.codificar_trama(pb.TIPO_PING, 0)
+        else:
+            datos = b"ping\n"
+        try:
+            with self._bloqueo_envio:
+                conexion.write(datos)
+        except (serial.SerialException, OSError, TypeError):
+            pass
+
+    # ------------------------------------------------------------------
+
+    def _al_saludo(self, mensaje):
+        """
+        Manejador del saludo (hilo lector): "Listo[,SP]" en texto o una
+        trama TIPO_LISTO con el byte de capacidades en binario.
+
+        Cada ping sin respuesta genera un saludo, así que un Arduino lento
+        puede enviar varios; ninguno llega a la cola de mensajes.
+        """
+        if isinstance(mensaje, str):
+            for capacidad in mensaje.split(",")[1:]:
+                self.capacidades |= pb.CAPACIDADES_TEXTO.get(capacidad.strip(), 0)
+        elif mensaje.payload:
+            self.capacidades = mensaje.payload[0]
+        self.listo_confirmado = True
+        self._marcar_listo(self.conexion)
+        if self.maquina is not None:
+            self.maquina.despertar()
+
+    # ------------------------------------------------------------------
+
+    def _al_recibir(self, mensaje):
+        """Callback del hilo lector: reenvía el mensaje a `callback_mensajes`."""
+        if self.callback_mensajes:
+            self.callback_mensajes(mensaje)
+
+    # ------------------------------------------------------------------
+
+    def _marcar_listo(self, conexion):
+        """Marca al Arduino como listo y transmite los comandos encolados."""
+        with self._bloqueo_envio:
+            if self.listo.is_set() or conexion is None or conexion is not self.conexion:
+                return
+            pendientes, self._pendientes = self._pendientes, []
+            try:
+                for datos in pendientes:
+                    conexion.write(datos)
+            except (serial.SerialException, OSError, TypeError) as e:
+                print(f"Error al enviar comandos encolados: {e}")
+            self.listo.set()
+
+        print("Arduino listo.")
+        if pendientes:
+            print(f"Se enviaron {len(pendientes)} comandos encolados.")
+
+    # ------------------------------------------------------------------
+
+    @property
+    def acepta_setpoints(self):
+        """True si el firmware confirmó el saludo y anunció CAPACIDAD_SETPOINTS."""
+        return self.listo_confirmado and bool(self.capacidades & pb.CAPACIDAD_SETPOINTS)
+
+    # ------------------------------------------------------------------
+
+    def esperar_listo(self, timeout=None):
+        """
+        Espera a que el firmware confirme estar listo.
+
+        Args:
+            timeout (float - None): Segundos máximos de espera.
+
+        Returns:
+            bool: True si el Arduino está listo.
+        """
+        return self.listo.wait(timeout)
+
+    # ------------------------------------------------------------------
+
+    def _escribir(self, datos):
+        """
+        Escribe bytes en el puerto, o los encola si el Arduino aún no está listo.
+
+        Returns:
+            bool: True si se escribieron, False si quedaron encolados.
+
+        Raises:
+            serial.SerialException: Si la escritura falla.
+        """
+        with self._bloqueo_envio:
+            if not self.listo.is_set():
+                self._pendientes.append(datos)
+                return False
+            self.conexion.write(datos)
+            return True
+
+    # ------------------------------------------------------------------
+
+    def _iniciar_lector(self):
+        """Arranca el hilo que drena el puerto recién abierto."""
+        if self.protocolo == "binario":
+            decodificador = pb.DecodificadorMensajes(self.manejadores)
+        else:
+            decodificador = DecodificadorLineas(self.manejadores)
+        self.lector = LectorSerial(
+            self.conexion, decodificador=decodificador, callback=self._al_recibir
+        )
+        self.lector.start()
+
+    # ------------------------------------------------------------------
+
+    def _detener_lector(self):
+        """Detiene el hilo lector, si existe."""
+        if self.lector is not None:
+            self.lector.detener()
+            self.lector = None
+
+    # ------------------------------------------------------------------
+
+    def registrar_manejador(self, tipo, funcion):
+        """
+        Registra una función para un tipo de trama binaria o de línea de texto.
+
+        La función recibe la trama (protocolo_binario.Trama) o la línea (str)
+        y se ejecuta en el hilo lector, por lo que debe ser breve y no tocar
+        widgets de Tk.
+
+        Args:
+            tipo (int | str): Tipo de trama (protocolo_binario.TIPO_*) o
+                prefijo de línea del protocolo de texto (p. ej. "SP").
+            funcion (callable): Función manejadora.
+        """
+        self.manejadores[tipo] = funcion
+
+    # ------------------------------------------------------------------
+
+    def _siguiente_secuencia(self):
+        """
+        Reserva un número de secuencia (0-255).
+
+        Lo usan el hilo del EmisorSetpoints y el de Tk a la vez, por eso se
+        toma bajo el mismo lock que las escrituras.
+        """
+        with self._bloqueo_envio:
+            secuencia = self._secuencia
+            self._secuencia = (secuencia + 1) & 0xFF
+        return secuencia
+
+    # ------------------------------------------------------------------
+
+    def enviar_trama(self, tipo, payload=b""):
+        """
+        Envía una trama del protocolo binario.
+
+        Args:
+            tipo (int): Tipo de trama (protocolo_binario.TIPO_*).
+            payload (bytes): Datos de la trama.
+
+        Returns:
+            int | None: Número de secuencia usado, o None si no se pudo enviar.
+        """
+        if not self.conexion or not self.conexion.is_open:
+            return None
+
+        secuencia = self._siguiente_secuencia()
+        try:
+            self._escribir(pb.codificar_trama(tipo, secuencia, payload))
+            return secuencia
+
+        except serial.SerialException as e:
+            print("-----------------------------")
+            print(f"Error al enviar datos: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+
+    def enviar_setpoint(self, angulos):
+        """
+        Envía la posición objetivo de los cuatro servos.
+
+        A diferencia de las rutinas, un setpoint nunca se encola: si el
+        Arduino no está listo se descarta, porque al llegar ya estaría
+        desactualizado. Tampoco se envía si el firmware no anunció
+        CAPACIDAD_SETPOINTS en el saludo (ver `acepta_setpoints`): el sketch
+        de rutinas podría leer "S,..." como un comando de rutina. Se envía
+        como TIPO_SETPOINT en modo binario o como "S,seq,base,brazo,codo,pinza"
+        (décimas de grado) en modo texto; el Arduino lo confirma con TIPO_ACK
+        o "SP,seq".
+
+        Args:
+            angulos (sequence): (base, brazo, codo, pinza) en grados.
+
+        Returns:
+            int | None: Número de secuencia usado, o None si no se envió.
+        """
+        if not self.conexion or not self.conexion.is_open or not self.listo.is_set():
+            return None
+        if not self.acepta_setpoints:
+            return None
+
+        decimas = [max(0, min(0xFFFF, round(a * 10))) for a in angulos]
+        if self.protocolo == "binario":
+            return self.enviar_trama(pb.TIPO_SETPOINT, struct.pack("<4H", *decimas))
+
+        secuencia = self._siguiente_secuencia()
+        mensaje = f"S,{secuencia},{','.join(map(str, decimas))}\n"
+        try:
+            self._escribir(mensaje.encode("utf-8"))
+            return secuencia
+
+        except serial.SerialException as e:
+            print("-----------------------------")
+            print(f"Error al enviar datos: {e}")
+            return None
+
     # ------------------------------------------------------------------
 
     def enviar_rutina(self, rutina, repeticiones):
@@ -157,11 +597,24 @@ class ArduinoDetector:
             print("No existe conexion activa con un Arduino")
             return False
 
+        if self.protocolo == "binario":
+            secuencia = self.enviar_trama(
+                pb.TIPO_RUTINA, bytes((rutina & 0xFF, repeticiones & 0xFF))
+            )
+            if secuencia is None:
+                return False
+            print("--------------------------------")
+            print(f"Trama enviada al Arduino: rutina={rutina}, seq={secuencia}")
+            return True
+
         try:
             mensaje = f"{rutina},{repeticiones}\n"
-            self.conexion.write(mensaje.encode("utf-8"))  # Usar UTF-8
+            enviado = self._escribir(mensaje.encode("utf-8"))  # Usar UTF-8
             print("--------------------------------")
-            print(f"Mensaje enviado al Arduino: {mensaje.strip()}")
+            if enviado:
+                print(f"Mensaje enviado al Arduino: {mensaje.strip()}")
+            else:
+                print(f"Arduino aún no está listo, mensaje en cola: {mensaje.strip()}")
             return True
 
         except serial.SerialException as e:
@@ -171,14 +624,21 @@ class ArduinoDetector:
 
     # ------------------------------------------------------------------
 
-    def leer_respuesta(self):
+    def leer_respuesta(self, timeout=None):
         """
         Lee una línea enviada por el Arduino (si existe).
 
+        Args:
+            timeout (float - None): Segundos máximos de espera por una línea.
+                None devuelve inmediatamente.
+
         Returns:
             str | None: La línea decodificada sin saltos de línea,
                         o None si no hay datos disponibles.
         """
+        if self.lector is not None:
+            return self.lector.siguiente(timeout)
+
         if not self.conexion or not self.conexion.is_open:
             return None
 
@@ -199,7 +659,13 @@ class ArduinoDetector:
     def cerrar(self):
         """
         Cierra la conexión serial con el Arduino y actualiza el estado.
+        El monitor de hotplug, si existe, sigue activo para detectar
+        reconexiones.
         """
+        self._detener_lector()
+        with self._bloqueo_envio:
+            self.listo.clear()
+            self._pendientes.clear()
         if self.conexion and self.conexion.is_open:
             self.conexion.close()
             print("Conexion serie con Arduino cerrada.")
@@ -215,10 +681,20 @@ class ArduinoDetector:
             bool: True si el Arduino está conectado o se reconectó.
                     False si no es posible establecer conexión.
         """
-        puertos_actuales = [p.device for p in serial.tools.list_ports.comports()]
+        # Con supervisión activa la reconexión es responsabilidad de la máquina
+        if self.maquina is not None:
+            return self.esta_conectado()
+
+        # El hilo lector se detiene solo si el puerto falla (p. ej. cable retirado)
+        if self.lector is not None and self.lector.error is not None:
+            print("---------------------")
+            print(f"Error de lectura serial: {self.lector.error}")
+            self.cerrar()
+
+        puertos_actuales = {} if self.puerto_fijo else self._listar_puertos()
 
         # Caso 1: El puerto desapareció físico
-        if self.puerto and self.puerto not in puertos_actuales:
+        if self.puerto and not self._puerto_presente(puertos_actuales):
             if self.estado_arduino != "desconectado":
                 print("---------------------")
                 print("Arduino desconectado.")
@@ -229,7 +705,8 @@ class ArduinoDetector:
             return False
 
         # Caso 2: No hay conexión, pero el puerto sí existe → intentar reconectar
-        if (not self.conexion or not self.conexion.is_open) and self.detectar():
+        detectado = self.detectar(puertos_actuales)
+        if (not self.conexion or not self.conexion.is_open) and detectado:
             if self.estado_arduino != "conectado":
                 print("Arduino detectado, intentando reconectar...")
                 if self.conectar():
@@ -237,7 +714,7 @@ class ArduinoDetector:
                     return True
 
         # Caso 3: No se detecta el dispositivo
-        elif not self.detectar():
+        elif not detectado:
             if self.estado_arduino != "desconectado":
                 print("---------------------")
                 print("Arduino desconectado.")
@@ -247,6 +724,14 @@ class ArduinoDetector:
 
     # ------------------------------------------------------------------
 
+    def _puerto_presente(self, puertos):
+        """Indica si el puerto actual sigue existiendo."""
+        if self.puerto == self.puerto_fijo:
+            return os.path.exists(self.puerto)
+        return self.puerto in puertos
+
+    # ------------------------------------------------------------------
+
     def esta_conectado(self):
         """
         Indica si la conexión serial está activa.
@@ -282,7 +767,246 @@ class ArduinoDetector:
             principal del programa.
         """
         try:
+            if self.lector is not None:
+                self.lector.vaciar()
+                return
             while self.leer_respuesta() is not None:
                 pass
         except Exception:
             pass
+
+
+class MaquinaConexion:
+    """
+    Máquina de estados que mantiene la conexión con el Arduino.
+
+    Estados y transiciones:
+
+        desconectado --(espera)--> sondeando --(puerto hallado)--> abriendo
+        sondeando --(sin dispositivo)--> sondeando (espera, sin notificar)
+        abriendo --(puerto abierto)--> negociando --(saludo)--> listo
+        negociando --(sin saludo, timeout)--> degradado
+        degradado --(saludo tardío)--> listo
+        listo/degradado --(puerto perdido)--> desconectado
+        abriendo --(fallo)--> desconectado
+
+    Entre intentos fallidos se espera de forma exponencial con jitter
+    ("equal jitter": la mitad fija y la otra mitad aleatoria), con tope
+    ESPERA_MAXIMA. Una conexión que se pierde antes de TIEMPO_ESTABLE
+    segundos de abierta cuenta como fallo, de modo que un puerto inestable
+    que se abre y se cae no se reabre (ni reinicia la placa) sin espera.
+    La espera se reinicia tras TIEMPO_ESTABLE segundos en 'listo' o cuando
+    el monitor de hotplug informa un puerto nuevo.
+
+    Atributos:
+        estado (str): Estado actual (constantes DESCONECTADO, ..., DEGRADADO).
+        metricas (dict): Contadores de la conexión (ver `_reiniciar_metricas`).
+    """
+
+    def __init__(self, detector, espera_base=ESPERA_BASE, espera_maxima=ESPERA_MAXIMA):
+        """
+        Args:
+            detector (ArduinoDetector): Detector a supervisar.
+            espera_base (float): Espera tras el primer fallo, en segundos.
+            espera_maxima (float): Tope de la espera exponencial.
+        """
+        self.detector = detector
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.estado = DESCONECTADO
+        self.metricas = {
+            "intentos_reconexion": 0,
+            "conexiones_exitosas": 0,
+            "fallos_consecutivos": 0,
+            "ultimo_tiempo_hasta_listo": None,
+            "tiempo_desconectado_total": 0.0,
+        }
+
+        self._suscriptores = []
+        self._hilo = None
+        self._detener = threading.Event()
+        self._despertar = threading.Event()
+        self._aleatorio = random.Random()
+        self._desde_desconexion = time.monotonic()
+        self._inicio_apertura = None
+        self._desde_abierto = None
+        self._desde_listo = None
+
+    # ------------------------------------------------------------------
+
+    def suscribir(self, callback):
+        """
+        Registra una función `callback(anterior, nuevo)` para cada cambio de
+        estado. Se ejecuta en el hilo de la máquina: en Tk, debe reenviar el
+        aviso al hilo principal (p. ej. con `event_generate`).
+        """
+        self._suscriptores.append(callback)
+
+    # ------------------------------------------------------------------
+
+    def iniciar(self):
+        """Arranca el hilo de la máquina de estados."""
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._ciclo, name="MaquinaConexion", daemon=True
+        )
+        self._hilo.start()
+
+    # ------------------------------------------------------------------
+
+    def detener(self):
+        """Detiene el hilo (no cierra la conexión)."""
+        self._detener.set()
+        self._despertar.set()
+        if self._hilo is not None and threading.current_thread() is not self._hilo:
+            self._hilo.join(2.0)
+
+    # ------------------------------------------------------------------
+
+    def despertar(self, reiniciar_espera=False):
+        """
+        Interrumpe la espera actual (llamado ante eventos de hotplug o saludo).
+
+        Args:
+            reiniciar_espera (bool): Si es True, el próximo intento no espera.
+        """
+        if reiniciar_espera:
+            self.metricas["fallos_consecutivos"] = 0
+        self._despertar.set()
+
+    # ------------------------------------------------------------------
+
+    def espera_actual(self):
+        """
+        Calcula la espera antes del próximo intento.
+
+        Returns:
+            float: Segundos (0 si no hubo fallos desde el último éxito).
+        """
+        fallos = self.metricas["fallos_consecutivos"]
+        if fallos == 0:
+            return 0.0
+        tope = min(self.espera_maxima, self.espera_base * 2 ** (fallos - 1))
+        return tope / 2 + self._aleatorio.uniform(0, tope / 2)
+
+    # ------------------------------------------------------------------
+
+    def _cambiar(self, nuevo):
+        """Cambia de estado y notifica a los suscriptores."""
+        anterior, self.estado = self.estado, nuevo
+        if anterior == nuevo:
+            return
+        for callback in list(self._suscriptores):
+            try:
+                callback(anterior, nuevo)
+            except Exception as e:
+                print(f"Error en suscriptor de estado de conexión: {e}")
+
+    # ------------------------------------------------------------------
+
+    def _fallo(self):
+        """Intento fallido: volver a desconectado con más espera."""
+        self.metricas["fallos_consecutivos"] += 1
+        self._cambiar(DESCONECTADO)
+
+    # ------------------------------------------------------------------
+
+    def _perdida(self):
+        """
+        La conexión activa se perdió. Si duró menos de TIEMPO_ESTABLE se
+        cuenta como fallo, para que el próximo intento espere.
+        """
+        print("---------------------")
+        print("Arduino desconectado.")
+        self.detector.cerrar()
+        ahora = time.monotonic()
+        if self._desde_abierto is None or ahora - self._desde_abierto < TIEMPO_ESTABLE:
+            self.metricas["fallos_consecutivos"] += 1
+        self._desde_desconexion = ahora
+        self._desde_abierto = None
+        self._desde_listo = None
+        self._cambiar(DESCONECTADO)
+
+    # ------------------------------------------------------------------
+
+    def _conexion_perdida(self):
+        """Revisa si la conexión abierta sigue siendo válida."""
+        detector = self.detector
+        if not detector.esta_conectado():
+            return True
+        if detector.lector is not None and detector.lector.error is not None:
+            print(f"Error de lectura serial: {detector.lector.error}")
+            return True
+        return not detector._puerto_presente(
+            {} if detector.puerto_fijo else detector._listar_puertos()
+        )
+
+    # ------------------------------------------------------------------
+
+    def _ciclo(self):
+        detector = self.detector
+        while not self._detener.is_set():
+            estado = self.estado
+
+            if estado == DESCONECTADO:
+                espera = self.espera_actual()
+                if espera:
+                    self._despertar.wait(espera)
+                self._despertar.clear()
+                if not self._detener.is_set():
+                    self._cambiar(SONDEANDO)
+
+            elif estado == SONDEANDO:
+                if detector.detectar():
+                    self._cambiar(ABRIENDO)
+                else:
+                    # Sin dispositivo: se sigue sondeando sin notificar cambios
+                    # de estado; el monitor de hotplug despierta antes
+                    self._despertar.wait(max(self.espera_actual(), 1.0))
+                    self._despertar.clear()
+
+            elif estado == ABRIENDO:
+                self.metricas["intentos_reconexion"] += 1
+                self._inicio_apertura = time.monotonic()
+                if detector.conectar():
+                    self._desde_abierto = time.monotonic()
+                    self._cambiar(NEGOCIANDO)
+                else:
+                    self._fallo()
+
+            elif estado == NEGOCIANDO:
+                detector.listo.wait(TIMEOUT_LISTO + INTERVALO_PING)
+                if self._conexion_perdida():
+                    self._perdida()
+                elif detector.listo_confirmado:
+                    self._entrar_listo()
+                else:
+                    self._cambiar(DEGRADADO)
+
+            else:  # LISTO o DEGRADADO
+                self._despertar.wait(INTERVALO_VIGILANCIA)
+                self._despertar.clear()
+                if self._conexion_perdida():
+                    self._perdida()
+                elif estado == DEGRADADO and detector.listo_confirmado:
+                    self._entrar_listo()
+                elif (
+                    estado == LISTO
+                    and self._desde_listo is not None
+                    and time.monotonic() - self._desde_listo >= TIEMPO_ESTABLE
+                ):
+                    self.metricas["fallos_consecutivos"] = 0
+
+    # ------------------------------------------------------------------
+
+    def _entrar_listo(self):
+        """Registra las métricas de una conexión exitosa."""
+        ahora = time.monotonic()
+        self.metricas["conexiones_exitosas"] += 1
+        if self._inicio_apertura is not None:
+            self.metricas["ultimo_tiempo_hasta_listo"] = ahora - self._inicio_apertura
+        if self._desde_desconexion is not None:
+            self.metricas["tiempo_desconectado_total"] += ahora - self._desde_desconexion
+            self._desde_desconexion = None
+        self._desde_listo = ahora
+        self._cambiar(LISTO)
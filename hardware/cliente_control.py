@@ -0,0 +1,393 @@
+"""
+cliente_control.py
+------------------
+Clientes del servidor local de control (ver servidor_control.py).
+
+- `ClienteControl`: API directa para scripts y el puente con el MES.
+
+      with ClienteControl() as cliente:
+          # timeout: límite de la rutina en el servidor, desde que empieza
+          # (sin contar la espera en la cola)
+          print(cliente.ejecutar_rutina(2, 3, timeout=60))
+
+- `DetectorRemoto`: ofrece la misma interfaz que ArduinoDetector usada por
+  la GUI (enviar_rutina, enviar_setpoint, leer_respuesta, actualizar_estado,
+  ...), pero a través del servidor. La ventana principal lo usa cuando la variable de
+  entorno BRAZO_SOCKET indica la ruta del socket.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import itertools
+import json
+import queue
+import socket
+import threading
+import time
+
+from hardware.emisor_setpoints import PREFIJO_CONFIRMACION
+from hardware.servidor_control import RUTA_SOCKET_DEFECTO
+
+# Traducción de los resultados del servidor a los mensajes del Arduino
+MENSAJES_RESULTADO = {
+    "completada": "Rutina completada",
+    "detenida": "Rutina detenida",
+}
+
+
+class ClienteControl:
+    """
+    Conexión con el servidor de control.
+
+    Las respuestas se reciben en un hilo propio y se asocian a cada pedido
+    por su "id", por lo que varios hilos pueden usar el mismo cliente.
+    """
+
+    def __init__(self, ruta_socket=RUTA_SOCKET_DEFECTO, al_telemetria=None,
+                 al_confirmar_setpoint=None):
+        """
+        Args:
+            ruta_socket (str): Ruta del socket Unix del servidor.
+            al_telemetria (callable - None): Función `(tiempos, angulos)`
+                llamada con cada bloque de telemetría, desde el hilo lector.
+            al_confirmar_setpoint (callable - None): Función `(secuencia)`
+                llamada cuando el Arduino confirma un setpoint, desde el
+                hilo lector.
+        """
+        self.ruta_socket = ruta_socket
+        self.al_telemetria = al_telemetria
+        self.al_confirmar_setpoint = al_confirmar_setpoint
+        self._socket = None
+        self._ids = itertools.count(1)
+        self._esperas = {}  # {id: [threading.Event, respuesta]}
+        self._bloqueo = threading.Lock()
+        self.conectado = False
+
+    # ------------------------------------------------------------------
+
+    def conectar(self):
+        """
+        Abre la conexión con el servidor.
+
+        Returns:
+            bool: True si el servidor está disponible.
+        """
+        try:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(self.ruta_socket)
+        except OSError:
+            self._socket = None
+            return False
+
+        self.conectado = True
+        threading.Thread(target=self._recibir, name="ClienteControl", daemon=True).start()
+        return True
+
+    # ------------------------------------------------------------------
+
+    def cerrar(self):
+        """Cierra la conexión con el servidor."""
+        self.conectado = False
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        if not self.conectar():
+            raise ConnectionError(f"Servidor de control no disponible: {self.ruta_socket}")
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    # ------------------------------------------------------------------
+
+    def _recibir(self):
+        """Distribuye respuestas y eventos recibidos del servidor."""
+        try:
+            with self._socket.makefile("rb") as lectura:
+                for linea in lectura:
+                    mensaje = json.loads(linea)
+                    if mensaje.get("evento") == "telemetria":
+                        if self.al_telemetria:
+                            self.al_telemetria(mensaje["t"], mensaje["q"])
+                        continue
+                    if mensaje.get("evento") == "setpoint_confirmado":
+                        if self.al_confirmar_setpoint:
+                            self.al_confirmar_setpoint(mensaje["secuencia"])
+                        continue
+                    with self._bloqueo:
+                        espera = self._esperas.pop(mensaje.get("id"), None)
+                    if espera is not None:
+                        espera[1] = mensaje
+                        espera[0].set()
+        except (OSError, ValueError, AttributeError):
+            pass
+        finally:
+            self.conectado = False
+            # Liberar a quienes esperan respuesta
+            with self._bloqueo:
+                esperas, self._esperas = self._esperas, {}
+            for espera in esperas.values():
+                espera[1] = {"ok": False, "error": "Conexión con el servidor perdida"}
+                espera[0].set()
+
+    # ------------------------------------------------------------------
+
+    def pedir(self, operacion, timeout=None, **datos):
+        """
+        Envía un pedido y espera su respuesta.
+
+        Args:
+            operacion (str): 'rutina', 'detener', 'estado', ...
+            timeout (float - None): Segundos máximos de espera.
+            **datos: Campos adicionales del pedido.
+
+        Returns:
+            dict: Respuesta del servidor.
+
+        Raises:
+            ConnectionError: Si no hay conexión.
+            TimeoutError: Si no llega respuesta a tiempo.
+        """
+        espera = self.pedir_async(operacion, **datos)
+        if not espera[0].wait(timeout):
+            raise TimeoutError(f"Sin respuesta del servidor para '{operacion}'")
+        return espera[1]
+
+    # ------------------------------------------------------------------
+
+    def pedir_async(self, operacion, **datos):
+        """
+        Envía un pedido sin esperar la respuesta.
+
+        Returns:
+            list: [threading.Event, respuesta]; la respuesta queda en la
+            posición 1 cuando el evento se activa.
+        """
+        if not self.conectado:
+            raise ConnectionError("No hay conexión con el servidor de control")
+
+        identificador = next(self._ids)
+        espera = [threading.Event(), None]
+        with self._bloqueo:
+            self._esperas[identificador] = espera
+        pedido = {"id": identificador, "op": operacion, **datos}
+        try:
+            self._socket.sendall((json.dumps(pedido) + "\n").encode("utf-8"))
+        except OSError as e:
+            with self._bloqueo:
+                self._esperas.pop(identificador, None)
+            raise ConnectionError(f"Error al enviar pedido: {e}") from e
+        return espera
+
+    # ------------------------------------------------------------------
+
+    def ejecutar_rutina(self, rutina, repeticiones, timeout=80):
+        """
+        Ejecuta una rutina (espera su turno en la cola) y devuelve el resultado.
+
+        Args:
+            rutina (int): Número de rutina.
+            repeticiones (int): Repeticiones.
+            timeout (float): Límite de la rutina, que aplica el servidor
+                desde que la empieza. La espera aquí no tiene límite: el
+                servidor siempre responde (con resultado "timeout" si la
+                rutina no termina) y, si se pierde la conexión, `_recibir`
+                libera la espera con un error.
+
+        Returns:
+            dict: Respuesta del servidor.
+        """
+        # No se usa `pedir`: su `timeout` es la espera del cliente, y aquí
+        # "timeout" es un campo del pedido
+        espera = self.pedir_async(
+            "rutina",
+            rutina=rutina,
+            repeticiones=repeticiones,
+            timeout=timeout,
+        )
+        espera[0].wait()
+        return espera[1]
+
+    def detener(self, vaciar_cola=False):
+        """Detiene la rutina en curso del brazo."""
+        return self.pedir("detener", timeout=5, vaciar_cola=vaciar_cola)
+
+    def estado(self):
+        """Estado del servidor y de la conexión con el Arduino."""
+        return self.pedir("estado", timeout=5)
+
+    def suscribir_telemetria(self):
+        """Solicita recibir telemetría (ver `al_telemetria`)."""
+        return self.pedir("suscribir_telemetria", timeout=5)
+
+    def setpoint(self, angulos, timeout=1.0):
+        """Envía un setpoint (ver `al_confirmar_setpoint`)."""
+        return self.pedir("setpoint", timeout=timeout, angulos=[float(a) for a in angulos])
+
+
+class DetectorRemoto:
+    """
+    Adaptador con la interfaz de ArduinoDetector que usa el servidor de control.
+
+    Permite que ModoAutomatico y el Modo Manual funcionen sin cambios
+    mientras el puerto lo administra el servidor.
+    """
+
+    def __init__(self, ruta_socket=RUTA_SOCKET_DEFECTO):
+        self.cliente = ClienteControl(
+            ruta_socket, al_confirmar_setpoint=self._al_confirmar_setpoint
+        )
+        self.estado_arduino = "desconectado"
+        self.puerto = None
+        self.acepta_setpoints = False  # Según el último "estado" del servidor
+        self.manejadores = {}  # Solo PREFIJO_CONFIRMACION (ver EmisorSetpoints)
+        self._mensajes = queue.Queue()
+        self._ultimo_estado = 0.0
+        self._consultando = threading.Event()  # Consulta de estado en curso
+        # Como en ArduinoDetector: llamada con cada mensaje, fuera del hilo de Tk
+        self.callback_mensajes = None
+
+    # ------------------------------------------------------------------
+
+    def iniciar_monitor(self):
+        """El servidor ya supervisa el puerto: no hay nada que iniciar."""
+
+    def detectar(self, puertos=None):
+        return self.cliente.conectado or self.cliente.conectar()
+
+    def conectar(self, *args, **kwargs):
+        return self.detectar()
+
+    def obtener_puerto(self):
+        return self.puerto
+
+    def esta_conectado(self):
+        return self.estado_arduino == "conectado"
+
+    # ------------------------------------------------------------------
+
+    def actualizar_estado(self):
+        """
+        Devuelve el último estado conocido y, como máximo una vez por
+        segundo, lo vuelve a consultar al servidor en un hilo aparte.
+
+        La ventana principal lo llama desde Tk cada 100 ms, así que no puede
+        esperar la respuesta del servidor (hasta 5 s si está ocupado).
+
+        Returns:
+            str: 'conectado' o 'desconectado'.
+        """
+        if self._consultando.is_set() or time.monotonic() - self._ultimo_estado < 1.0:
+            return self.estado_arduino
+        self._ultimo_estado = time.monotonic()
+        self._consultando.set()
+        threading.Thread(
+            target=self._consultar_estado, name="EstadoRemoto", daemon=True
+        ).start()
+        return self.estado_arduino
+
+    def _consultar_estado(self):
+        """Pide el estado al servidor y actualiza los atributos (hilo propio)."""
+        try:
+            if not self.detectar():
+                raise ConnectionError
+            estado = self.cliente.estado()
+        except (ConnectionError, TimeoutError):
+            self.estado_arduino = "desconectado"
+            self.acepta_setpoints = False
+        else:
+            self.puerto = estado.get("puerto")
+            self.acepta_setpoints = bool(estado.get("acepta_setpoints"))
+            self.estado_arduino = "conectado" if estado.get("conectado") else "desconectado"
+        finally:
+            self._consultando.clear()
+
+    # ------------------------------------------------------------------
+
+    def enviar_rutina(self, rutina, repeticiones):
+        """
+        Encola una rutina en el servidor (o la detiene si rutina == 0).
+
+        La finalización se informa luego por `leer_respuesta`, con los mismos
+        textos que envía el Arduino.
+        """
+        try:
+            if rutina == 0:
+                return bool(self.cliente.detener().get("ok"))
+            espera = self.cliente.pedir_async(
+                "rutina", rutina=rutina, repeticiones=repeticiones
+            )
+        except (ConnectionError, TimeoutError) as e:
+            print(f"Error al comunicarse con el servidor de control: {e}")
+            return False
+
+        def esperar_resultado():
+            espera[0].wait()
+            mensaje = MENSAJES_RESULTADO.get((espera[1] or {}).get("resultado"))
+            if mensaje:
+                self._mensajes.put(mensaje)
+                if self.callback_mensajes:
+                    self.callback_mensajes(mensaje)
+
+        threading.Thread(target=esperar_resultado, daemon=True).start()
+        return True
+
+    # ------------------------------------------------------------------
+
+    def registrar_manejador(self, tipo, funcion):
+        """Como ArduinoDetector.registrar_manejador (solo confirmaciones de setpoints)."""
+        self.manejadores[tipo] = funcion
+
+    def enviar_setpoint(self, angulos):
+        """
+        Envía un setpoint a través del servidor.
+
+        Returns:
+            int | None: Número de secuencia usado, o None si no se envió.
+        """
+        try:
+            respuesta = self.cliente.setpoint(angulos)
+        except (ConnectionError, TimeoutError):
+            return None
+        return respuesta.get("secuencia") if respuesta.get("ok") else None
+
+    def _al_confirmar_setpoint(self, secuencia):
+        """Entrega la confirmación al manejador, como la línea "SP,seq"."""
+        manejador = self.manejadores.get(PREFIJO_CONFIRMACION)
+        if manejador is not None:
+            manejador(f"{PREFIJO_CONFIRMACION},{secuencia}")
+
+    # ------------------------------------------------------------------
+
+    def leer_respuesta(self, timeout=None):
+        try:
+            if timeout is None:
+                return self._mensajes.get_nowait()
+            return self._mensajes.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def limpiar_buffer(self):
+        while self.leer_respuesta() is not None:
+            pass
+
+    def cerrar(self):
+        """Cierra solo la conexión con el servidor; el puerto sigue abierto allá."""
+        self.cliente.cerrar()
+        self.estado_arduino = "desconectado"
@@ -0,0 +1,237 @@
+"""
+emisor_setpoints.py
+-------------------
+Envío en tiempo real de posiciones de los servos desde el Modo Manual.
+
+Arrastrar un slider genera decenas de eventos por segundo. Enviar cada uno
+saturaría el puerto serie y el Arduino terminaría ejecutando posiciones
+viejas. El emisor guarda solo el último valor de cada articulación y, a
+una frecuencia fija (50 Hz por defecto), envía un único setpoint con las
+cuatro articulaciones si algo cambió desde el envío anterior.
+
+Cada setpoint lleva un número de secuencia que el Arduino confirma (TIPO_ACK
+o "SP,seq"). Con la confirmación se mide la latencia de extremo a extremo:
+desde el primer movimiento del slider que aún no se había enviado hasta que
+el Arduino acepta la posición. Incluye la espera del coalescente, la
+transmisión y el procesamiento en el firmware.
+
+Uso:
+
+    emisor = EmisorSetpoints(detector, frecuencia=50)
+    emisor.iniciar()
+    emisor.actualizar("base", 95.0)   # desde el callback del slider
+    ...
+    print(emisor.estadisticas())
+    emisor.detener()
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import threading
+import time
+from collections import deque
+
+from hardware import protocolo_binario as pb
+
+ARTICULACIONES = ("base", "brazo", "codo", "pinza")
+FRECUENCIA_DEFECTO = 50.0  # Setpoints por segundo como máximo
+PREFIJO_CONFIRMACION = "SP"  # Confirmación en el protocolo de texto
+# Antigüedad máxima de una confirmación que llegó antes de registrar su envío.
+# A 50 Hz la secuencia (0-255) tarda ~5 s en repetirse.
+VIGENCIA_CONFIRMACION = 1.0
+
+
+def _percentil(valores, fraccion):
+    """Percentil por el método del vecino más cercano sobre valores ordenados."""
+    if not valores:
+        return None
+    indice = min(len(valores) - 1, int(round(fraccion * (len(valores) - 1))))
+    return valores[indice]
+
+
+class EmisorSetpoints:
+    """
+    Coalescente de setpoints con envío a frecuencia fija en un hilo propio.
+
+    Atributos:
+        frecuencia (float): Envíos por segundo como máximo.
+        enviados (int): Setpoints transmitidos.
+        confirmados (int): Setpoints confirmados por el Arduino.
+        coalescidos (int): Cambios absorbidos por un envío posterior.
+    """
+
+    def __init__(
+        self, detector, frecuencia=FRECUENCIA_DEFECTO, valores=None, max_latencias=1000
+    ):
+        """
+        Args:
+            detector (ArduinoDetector): Detector conectado al Arduino.
+            frecuencia (float): Envíos por segundo como máximo.
+            valores (dict - None): Posición inicial {articulación: grados}.
+            max_latencias (int): Latencias retenidas para las estadísticas.
+        """
+        self.detector = detector
+        self.frecuencia = frecuencia
+        self.enviados = 0
+        self.confirmados = 0
+        self.coalescidos = 0
+
+        self._valores = dict.fromkeys(ARTICULACIONES, 0.0)
+        self._valores.update(valores or {})
+        self._primer_cambio = None  # Instante del cambio más viejo sin enviar
+        self._en_vuelo = {}  # {secuencia: instante del primer cambio}
+        # {secuencia: instante de la confirmación} para ACK que llegan antes
+        # de que _ciclo registre el envío (el hilo lector no espera a
+        # que enviar_setpoint retorne)
+        self._adelantadas = {}
+        self._latencias = deque(maxlen=max_latencias)
+        self._bloqueo = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    # ------------------------------------------------------------------
+
+    def iniciar(self):
+        """Registra la confirmación de setpoints y arranca el hilo emisor."""
+        self.detector.registrar_manejador(pb.TIPO_ACK, self._al_confirmar)
+        self.detector.registrar_manejador(PREFIJO_CONFIRMACION, self._al_confirmar)
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._ciclo, name="EmisorSetpoints", daemon=True
+        )
+        self._hilo.start()
+
+    # ------------------------------------------------------------------
+
+    def detener(self):
+        """Detiene el hilo emisor (los cambios sin enviar se descartan)."""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(1.0)
+            self._hilo = None
+        for clave in (pb.TIPO_ACK, PREFIJO_CONFIRMACION):
+            if self.detector.manejadores.get(clave) == self._al_confirmar:
+                del self.detector.manejadores[clave]
+
+    # ------------------------------------------------------------------
+
+    def actualizar(self, articulacion, valor):
+        """
+        Registra el último valor de una articulación (llamado desde Tk).
+
+        No envía nada: el valor sale en el próximo ciclo del hilo emisor,
+        reemplazando cualquier valor anterior aún no enviado.
+
+        Args:
+            articulacion (str): 'base', 'brazo', 'codo' o 'pinza'.
+            valor (float): Ángulo en grados.
+        """
+        with self._bloqueo:
+            if self._primer_cambio is None:
+                self._primer_cambio = time.monotonic()
+            else:
+                self.coalescidos += 1
+            self._valores[articulacion] = float(valor)
+
+    # ------------------------------------------------------------------
+
+    def _ciclo(self):
+        """Envía el último setpoint pendiente una vez por período."""
+        periodo = 1.0 / self.frecuencia
+        proximo = time.monotonic()
+        while not self._detener.wait(max(0.0, proximo - time.monotonic())):
+            # Período fijo, sin ráfagas para recuperar ciclos atrasados
+            proximo = max(proximo + periodo, time.monotonic())
+            with self._bloqueo:
+                if self._primer_cambio is None:
+                    continue
+                angulos = [self._valores[a] for a in ARTICULACIONES]
+                primer_cambio = self._primer_cambio
+
+            secuencia = self.detector.enviar_setpoint(angulos)
+            if secuencia is None:
+                continue  # Sin conexión: se reintenta con el valor más nuevo
+
+            with self._bloqueo:
+                # Solo se marca como enviado si no hubo cambios mientras tanto
+                if self._primer_cambio == primer_cambio and angulos == [
+                    self._valores[a] for a in ARTICULACIONES
+                ]:
+                    self._primer_cambio = None
+                confirmacion = self._adelantadas.pop(secuencia, None)
+                if confirmacion is None:
+                    self._en_vuelo[secuencia] = primer_cambio
+                else:
+                    self._registrar_latencia(primer_cambio, confirmacion)
+                # Las que nadie reclamó eran ACK de otras tramas o duplicados
+                limite = time.monotonic() - VIGENCIA_CONFIRMACION
+                for vieja in [s for s, t in self._adelantadas.items() if t < limite]:
+                    del self._adelantadas[vieja]
+            self.enviados += 1
+
+    # ------------------------------------------------------------------
+
+    def _al_confirmar(self, mensaje):
+        """Registra la latencia de un setpoint confirmado (hilo lector)."""
+        ahora = time.monotonic()
+        try:
+            if isinstance(mensaje, str):
+                secuencia = int(mensaje.split(",")[1])
+            else:
+                secuencia = mensaje.payload[0]
+        except (IndexError, ValueError):
+            return
+
+        with self._bloqueo:
+            primer_cambio = self._en_vuelo.pop(secuencia, None)
+            if primer_cambio is None:
+                # Envío aún sin registrar, ACK de otra trama o duplicado:
+                # _ciclo lo reclama o lo descarta
+                self._adelantadas[secuencia] = ahora
+                return
+            self._registrar_latencia(primer_cambio, ahora)
+
+    # ------------------------------------------------------------------
+
+    def _registrar_latencia(self, primer_cambio, confirmacion):
+        """Anota un setpoint confirmado (se llama con `_bloqueo` tomado)."""
+        # Los setpoints anteriores sin confirmar ya no van a confirmarse
+        for anterior in [s for s, t in self._en_vuelo.items() if t <= primer_cambio]:
+            del self._en_vuelo[anterior]
+        self._latencias.append(confirmacion - primer_cambio)
+        self.confirmados += 1
+
+    # ------------------------------------------------------------------
+
+    def estadisticas(self):
+        """
+        Resumen de la latencia slider → servo y del tráfico enviado.
+
+        Returns:
+            dict: enviados, confirmados, coalescidos y latencias en ms
+            (p50, p95, máxima) de los últimos `max_latencias` setpoints.
+        """
+        with self._bloqueo:
+            latencias = sorted(self._latencias)
+
+        def ms(valor):
+            return None if valor is None else round(valor * 1000, 2)
+
+        return {
+            "enviados": self.enviados,
+            "confirmados": self.confirmados,
+            "coalescidos": self.coalescidos,
+            "latencia_p50_ms": ms(_percentil(latencias, 0.50)),
+            "latencia_p95_ms": ms(_percentil(latencias, 0.95)),
+            "latencia_max_ms": ms(latencias[-1] if latencias else None),
+        }
@@ -0,0 +1,219 @@
+"""
+grabacion.py
+------------
+Grabación y reproducción de sesiones del Modo Manual.
+
+Cada muestra ocupa 12 bytes:
+
+    t (f4 LE, segundos desde el inicio) | base | brazo | codo | pinza
+                                          (u16 LE, décimas de grado)
+
+Una hora a 50 muestras por segundo ocupa unos 2 MB.
+
+El archivo (.brz) tiene un encabezado de 16 bytes seguido de las muestras
+sin separadores:
+
+    b"BRZSESN" | versión (u8) | frecuencia nominal (f4) | reservado (4 B)
+
+Durante la grabación las muestras se copian a un arreglo de NumPy
+preasignado y se escriben al disco en bloque cuando se llena, sin crear
+objetos por muestra. Para reproducir, el archivo se abre con `np.memmap`:
+el sistema operativo carga las páginas a medida que se leen y cada muestra
+se convierte a grados en un arreglo de salida reutilizado.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import struct
+import time
+
+import numpy as np
+
+DTYPE_GRABACION = np.dtype([("t", "<f4"), ("angulos", "<u2", (4,))])
+MAGICO = b"BRZSESN"
+VERSION = 1
+ENCABEZADO = struct.Struct("<7sBf4x")  # 16 bytes
+EXTENSION = ".brz"
+
+
+class GrabadorSesion:
+    """
+    Acumula muestras de los sliders y las vuelca en bloque a un archivo .brz.
+
+    Uso:
+        grabador = GrabadorSesion("sesion.brz")
+        grabador.iniciar()
+        grabador.agregar((90, 120, 90, 60))   # en cada cambio
+        grabador.detener()
+
+    Atributos:
+        ruta (str): Archivo de destino.
+        muestras (int): Muestras grabadas hasta el momento.
+    """
+
+    def __init__(self, ruta, capacidad=4096, frecuencia=50.0):
+        """
+        Args:
+            ruta (str): Archivo de destino (se sobrescribe).
+            capacidad (int): Muestras en memoria antes de escribir al disco.
+            frecuencia (float): Frecuencia nominal, guardada en el encabezado.
+        """
+        self.ruta = ruta
+        self.frecuencia = frecuencia
+        self.muestras = 0
+        self._buffer = np.zeros(capacidad, dtype=DTYPE_GRABACION)
+        self._tiempos = self._buffer["t"]
+        self._angulos = self._buffer["angulos"]
+        self._pendientes = 0
+        self._archivo = None
+        self._inicio = None
+
+    # ------------------------------------------------------------------
+
+    @property
+    def activo(self):
+        return self._archivo is not None
+
+    # ------------------------------------------------------------------
+
+    def iniciar(self):
+        """Crea el archivo y escribe el encabezado."""
+        self._archivo = open(self.ruta, "wb")
+        self._archivo.write(ENCABEZADO.pack(MAGICO, VERSION, self.frecuencia))
+        self._inicio = time.monotonic()
+        self.muestras = 0
+        self._pendientes = 0
+
+    # ------------------------------------------------------------------
+
+    def agregar(self, angulos, t=None):
+        """
+        Agrega una muestra.
+
+        Args:
+            angulos (sequence): (base, brazo, codo, pinza) en grados.
+            t (float - None): Segundos desde el inicio; por defecto el reloj.
+        """
+        if self._archivo is None:
+            return
+        i = self._pendientes
+        self._tiempos[i] = time.monotonic() - self._inicio if t is None else t
+        fila = self._angulos[i]
+        for j in range(4):
+            fila[j] = round(angulos[j] * 10)
+        self._pendientes += 1
+        self.muestras += 1
+        if self._pendientes == len(self._buffer):
+            self._volcar()
+
+    # ------------------------------------------------------------------
+
+    def _volcar(self):
+        """Escribe las muestras pendientes en un solo bloque."""
+        self._buffer[: self._pendientes].tofile(self._archivo)
+        self._pendientes = 0
+
+    # ------------------------------------------------------------------
+
+    def detener(self):
+        """Escribe lo pendiente y cierra el archivo."""
+        if self._archivo is None:
+            return
+        self._volcar()
+        self._archivo.close()
+        self._archivo = None
+
+
+class ReproductorSesion:
+    """
+    Lee un archivo .brz mediante memmap.
+
+    Atributos:
+        muestras (np.memmap): Arreglo estructurado DTYPE_GRABACION (N,).
+        frecuencia (float): Frecuencia nominal de la grabación.
+        duracion (float): Segundos desde la primera a la última muestra.
+    """
+
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta (str): Archivo .brz.
+
+        Raises:
+            ValueError: Si el archivo no es una grabación válida.
+        """
+        with open(ruta, "rb") as archivo:
+            encabezado = archivo.read(ENCABEZADO.size)
+            tamano = archivo.seek(0, 2)
+        if len(encabezado) < ENCABEZADO.size:
+            raise ValueError(f"{ruta} no es una grabación válida")
+        magico, version, self.frecuencia = ENCABEZADO.unpack(encabezado)
+        if magico != MAGICO or version != VERSION:
+            raise ValueError(f"{ruta} no es una grabación válida (versión {version})")
+
+        self.ruta = ruta
+        cantidad = (tamano - ENCABEZADO.size) // DTYPE_GRABACION.itemsize
+        if cantidad:
+            # Una grabación interrumpida puede terminar en una muestra parcial
+            self.muestras = np.memmap(
+                ruta,
+                dtype=DTYPE_GRABACION,
+                mode="r",
+                offset=ENCABEZADO.size,
+                shape=(cantidad,),
+            )
+        else:
+            self.muestras = np.zeros(0, dtype=DTYPE_GRABACION)
+        self._tiempos = self.muestras["t"]
+        self._angulos = self.muestras["angulos"]
+        # Salidas reutilizadas: leer una muestra no crea arreglos nuevos
+        self._decimas = np.zeros(4, dtype=np.uint16)
+        self._salida = np.zeros(4, dtype=np.float64)
+
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.muestras)
+
+    @property
+    def duracion(self):
+        return float(self._tiempos[-1] - self._tiempos[0]) if len(self) else 0.0
+
+    # ------------------------------------------------------------------
+
+    def indice_en(self, t):
+        """Índice de la última muestra con tiempo <= t (relativo al inicio)."""
+        if not len(self):
+            return -1
+        indice = int(self._tiempos.searchsorted(self._tiempos[0] + t, side="right")) - 1
+        return max(0, indice)
+
+    # ------------------------------------------------------------------
+
+    def angulos(self, indice):
+        """
+        Ángulos de una muestra, en grados.
+
+        Returns:
+            np.ndarray: Arreglo (4,) reutilizado en cada llamada; copiarlo
+            si se necesita conservar.
+        """
+        np.take(self._angulos, indice, axis=0, out=self._decimas)
+        np.multiply(self._decimas, 0.1, out=self._salida)
+        return self._salida
+
+    # ------------------------------------------------------------------
+
+    def cerrar(self):
+        """Libera el mapeo del archivo."""
+        self.muestras = self._tiempos = self._angulos = None
@@ -0,0 +1,300 @@
+"""
+lector_serial.py
+----------------
+Lectura continua del puerto serie en un hilo dedicado.
+
+El hilo drena el puerto apenas llegan bytes, los acumula en un buffer
+circular de tamaño fijo y separa los mensajes completos (líneas terminadas
+en '\\n'). Los mensajes terminados se entregan a la GUI mediante una cola
+segura entre hilos y, opcionalmente, mediante una función callback.
+
+De esta forma la interfaz nunca lee directamente del puerto: si el ciclo de
+Tk está ocupado (video, redibujo de matplotlib) los bytes siguen siendo
+recibidos por el hilo lector y no se pierden ni se retrasan.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import queue
+import threading
+
+import serial
+
+
+class BufferLineas:
+    """
+    Buffer circular de capacidad fija que separa bytes en líneas de texto.
+
+    Los bytes se escriben en un arreglo preasignado; cuando aparece un
+    salto de línea se extrae el mensaje completo. Si una línea supera la
+    capacidad del buffer (ruido en el puerto, firmware sin '\\n') se descarta
+    para no crecer sin límite.
+
+    Atributos:
+        capacidad (int): Tamaño máximo en bytes del buffer.
+        descartados (int): Cantidad de bytes descartados por desbordamiento.
+    """
+
+    def __init__(self, capacidad=4096):
+        """
+        Args:
+            capacidad (int): Tamaño máximo en bytes de una línea pendiente.
+        """
+        self.capacidad = capacidad
+        self._datos = bytearray(capacidad)
+        self._inicio = 0  # Posición del primer byte pendiente
+        self._largo = 0  # Cantidad de bytes pendientes
+        self.descartados = 0
+
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return self._largo
+
+    # ------------------------------------------------------------------
+
+    def _escribir(self, datos):
+        """Copia bytes al buffer circular (deben caber en el espacio libre)."""
+        fin = (self._inicio + self._largo) % self.capacidad
+        primera_parte = min(len(datos), self.capacidad - fin)
+        self._datos[fin : fin + primera_parte] = datos[:primera_parte]
+        resto = len(datos) - primera_parte
+        if resto:
+            self._datos[0:resto] = datos[primera_parte:]
+        self._largo += len(datos)
+
+    # ------------------------------------------------------------------
+
+    def _extraer(self, cantidad):
+        """Retira `cantidad` bytes desde el inicio del buffer circular."""
+        fin = self._inicio + cantidad
+        if fin <= self.capacidad:
+            datos = bytes(self._datos[self._inicio : fin])
+        else:
+            datos = bytes(self._datos[self._inicio :]) + bytes(
+                self._datos[: fin - self.capacidad]
+            )
+        self._inicio = fin % self.capacidad
+        self._largo -= cantidad
+        return datos
+
+    # ------------------------------------------------------------------
+
+    def _buscar_salto(self):
+        """Devuelve la cantidad de bytes hasta el '\\n' (incluido) o -1."""
+        fin = self._inicio + self._largo
+        if fin <= self.capacidad:
+            pos = self._datos.find(b"\n", self._inicio, fin)
+            return -1 if pos < 0 else pos - self._inicio + 1
+
+        pos = self._datos.find(b"\n", self._inicio, self.capacidad)
+        if pos >= 0:
+            return pos - self._inicio + 1
+        pos = self._datos.find(b"\n", 0, fin - self.capacidad)
+        return -1 if pos < 0 else self.capacidad - self._inicio + pos + 1
+
+    # ------------------------------------------------------------------
+
+    def alimentar(self, datos):
+        """
+        Agrega bytes recibidos y devuelve las líneas que quedaron completas.
+
+        Args:
+            datos (bytes): Bytes leídos del puerto.
+
+        Returns:
+            list[str]: Líneas decodificadas sin saltos de línea ni espacios.
+        """
+        lineas = []
+        datos = memoryview(datos)
+        while datos:
+            libre = self.capacidad - self._largo
+            if not libre:
+                # Línea más larga que el buffer: se descarta lo acumulado
+                self.descartados += self._largo
+                self.limpiar()
+                libre = self.capacidad
+
+            self._escribir(datos[:libre])
+            datos = datos[libre:]
+
+            while self._largo:
+                cantidad = self._buscar_salto()
+                if cantidad < 0:
+                    break
+                linea = (
+                    self._extraer(cantidad).decode("utf-8", errors="ignore").strip()
+                )
+                if linea:
+                    lineas.append(linea)
+        return lineas
+
+    # ------------------------------------------------------------------
+
+    def limpiar(self):
+        """Descarta cualquier línea incompleta pendiente."""
+        self._inicio = 0
+        self._largo = 0
+
+
+class DecodificadorLineas(BufferLineas):
+    """
+    Decodificador del protocolo de texto usado por el hilo lector.
+
+    Igual que BufferLineas, pero las líneas cuyo prefijo (texto antes de la
+    primera coma) tiene una función registrada en `manejadores` se entregan
+    a esa función y no llegan a la cola de mensajes. Se usa para respuestas
+    frecuentes, como las confirmaciones de setpoints ("SP,seq"), que no deben
+    mezclarse con los mensajes que espera la GUI.
+    """
+
+    def __init__(self, manejadores=None, capacidad=4096):
+        """
+        Args:
+            manejadores (dict - None): {prefijo: función(linea)}.
+            capacidad (int): Tamaño máximo en bytes de una línea pendiente.
+        """
+        super().__init__(capacidad)
+        self.manejadores = manejadores if manejadores is not None else {}
+
+    # ------------------------------------------------------------------
+
+    def alimentar(self, datos):
+        mensajes = []
+        for linea in super().alimentar(datos):
+            manejador = self.manejadores.get(linea.split(",", 1)[0])
+            if manejador is None:
+                mensajes.append(linea)
+                continue
+            try:
+                manejador(linea)
+            except Exception as e:
+                print(f"Error al procesar la línea {linea!r}: {e}")
+        return mensajes
+
+
+class LectorSerial(threading.Thread):
+    """
+    Hilo que drena continuamente una conexión serial abierta.
+
+    Cada mensaje completo se coloca en `self.mensajes` (queue.Queue) y, si se
+    indicó, se pasa a `callback`. El callback se ejecuta en el hilo lector,
+    por lo que NO debe tocar widgets de Tk directamente.
+
+    Atributos:
+        mensajes (queue.Queue): Mensajes completos pendientes de consumir.
+        error (Exception - None): Error que detuvo al hilo, si lo hubo.
+    """
+
+    def __init__(self, conexion, decodificador=None, callback=None, max_mensajes=1024):
+        """
+        Args:
+            conexion (serial.Serial): Puerto ya abierto.
+            decodificador: Objeto con método `alimentar(bytes) -> list`.
+                Por defecto un BufferLineas (protocolo de texto).
+            callback (callable - None): Función llamada con cada mensaje.
+            max_mensajes (int): Capacidad de la cola; si se llena se descarta
+                el mensaje más antiguo.
+        """
+        super().__init__(name="LectorSerial", daemon=True)
+        self.conexion = conexion
+        self.decodificador = (
+            decodificador if decodificador is not None else BufferLineas()
+        )
+        self.callback = callback
+        self.mensajes = queue.Queue(maxsize=max_mensajes)
+        self.error = None
+        self._detener = threading.Event()
+
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """Ciclo principal: lee todo lo disponible y separa los mensajes."""
+        while not self._detener.is_set():
+            try:
+                # read() bloquea hasta recibir al menos un byte o hasta el
+                # timeout del puerto, sin ocupar CPU mientras espera.
+                datos = self.conexion.read(self.conexion.in_waiting or 1)
+            except (serial.SerialException, OSError, TypeError, AttributeError) as e:
+                # TypeError/AttributeError: el puerto se cerró desde otro hilo
+                if not self._detener.is_set():
+                    self.error = e
+                break
+
+            if datos:
+                for mensaje in self.decodificador.alimentar(datos):
+                    self._entregar(mensaje)
+
+    # ------------------------------------------------------------------
+
+    def _entregar(self, mensaje):
+        """Encola un mensaje (descartando el más viejo si no hay espacio)."""
+        try:
+            self.mensajes.put_nowait(mensaje)
+        except queue.Full:
+            try:
+                self.mensajes.get_nowait()
+            except queue.Empty:
+                pass
+            self.mensajes.put_nowait(mensaje)
+
+        if self.callback:
+            try:
+                self.callback(mensaje)
+            except Exception as e:
+                print(f"Error en callback del lector serial: {e}")
+
+    # ------------------------------------------------------------------
+
+    def siguiente(self, timeout=None):
+        """
+        Obtiene el siguiente mensaje recibido.
+
+        Args:
+            timeout (float - None): None para no esperar, o segundos máximos
+                de espera.
+
+        Returns:
+            str | None: Mensaje recibido o None si no hay ninguno.
+        """
+        try:
+            if timeout is None:
+                return self.mensajes.get_nowait()
+            return self.mensajes.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    # ------------------------------------------------------------------
+
+    def vaciar(self):
+        """Descarta todos los mensajes completos pendientes en la cola."""
+        while self.siguiente() is not None:
+            pass
+
+    # ------------------------------------------------------------------
+
+    def detener(self, esperar=1.0):
+        """
+        Solicita la detención del hilo y espera a que termine.
+
+        Args:
+            esperar (float): Segundos máximos de espera.
+        """
+        self._detener.set()
+        try:
+            # Despierta al read() bloqueado (solo disponible en POSIX)
+            self.conexion.cancel_read()
+        except Exception:
+            pass
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(esperar)
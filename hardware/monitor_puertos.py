@@ -0,0 +1,250 @@
+"""
+monitor_puertos.py
+------------------
+Monitor de conexión/desconexión (hotplug) de puertos serie.
+
+En Linux observa `/dev` y `/sys/class/tty` mediante inotify (a través de
+ctypes, sin dependencias externas) en un hilo en segundo plano. Solo cuando
+el kernel informa que apareció o desapareció un dispositivo `tty*` se vuelve
+a enumerar con `serial.tools.list_ports.comports()`; el resultado se guarda
+en una tabla en caché que el resto del programa consulta sin costo.
+
+En otros sistemas operativos (o si inotify no está disponible) se usa un
+sondeo periódico, también fuera del hilo de la interfaz.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+import serial.tools.list_ports
+
+# Constantes de <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+MASCARA_EVENTOS = IN_CREATE | IN_DELETE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+DIRECTORIOS_OBSERVADOS = ("/dev", "/sys/class/tty")
+ENCABEZADO_EVENTO = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _abrir_inotify():
+    """
+    Crea un descriptor inotify que observa los directorios de dispositivos.
+
+    Returns:
+        int | None: Descriptor de archivo, o None si inotify no está disponible.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+
+    observados = 0
+    for directorio in DIRECTORIOS_OBSERVADOS:
+        if os.path.isdir(directorio):
+            wd = libc.inotify_add_watch(fd, directorio.encode(), MASCARA_EVENTOS)
+            if wd >= 0:
+                observados += 1
+
+    if not observados:
+        os.close(fd)
+        return None
+    return fd
+
+
+def enumerar_puertos():
+    """
+    Enumera los puertos serie presentes en el sistema.
+
+    Returns:
+        dict: {dispositivo: descripción}
+    """
+    return {p.device: p.description for p in serial.tools.list_ports.comports()}
+
+
+class MonitorPuertos(threading.Thread):
+    """
+    Hilo que mantiene una tabla en caché de los puertos serie disponibles.
+
+    Cada vez que un puerto aparece o desaparece se llama a
+    `callback(evento, dispositivo, descripcion)` con evento 'conectado' o
+    'desconectado'. El callback se ejecuta en el hilo del monitor.
+
+    Atributos:
+        usa_inotify (bool): True si se observan eventos del kernel, False si
+            se recurre al sondeo periódico.
+    """
+
+    def __init__(self, callback=None, intervalo_sondeo=2.0, retardo=0.05):
+        """
+        Args:
+            callback (callable - None): Función notificada en cada cambio.
+            intervalo_sondeo (float): Segundos entre enumeraciones cuando no
+                hay inotify.
+            retardo (float): Espera tras un evento antes de enumerar, para
+                agrupar ráfagas (udev crea varios nodos y enlaces seguidos).
+        """
+        super().__init__(name="MonitorPuertos", daemon=True)
+        self.callback = callback
+        self.intervalo_sondeo = intervalo_sondeo
+        self.retardo = retardo
+        self.usa_inotify = False
+
+        self._dispositivos = {}
+        self._bloqueo = threading.Lock()
+        self._listo = threading.Event()
+        self._detener = threading.Event()
+        self._fd = None
+
+    # ------------------------------------------------------------------
+
+    def obtener_dispositivos(self):
+        """
+        Devuelve una copia de la tabla de puertos en caché.
+
+        La primera llamada espera (brevemente) a que termine la enumeración
+        inicial para no reportar una tabla vacía por error.
+
+        Returns:
+            dict: {dispositivo: descripción}
+        """
+        self._listo.wait(2.0)
+        with self._bloqueo:
+            return dict(self._dispositivos)
+
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """Enumeración inicial y luego espera de eventos (o sondeo)."""
+        # Se observa antes de enumerar para no perder cambios intermedios
+        self._fd = _abrir_inotify()
+        self.usa_inotify = self._fd is not None
+
+        self._actualizar()
+        self._listo.set()
+
+        try:
+            if self.usa_inotify:
+                self._ciclo_inotify()
+            else:
+                while not self._detener.wait(self.intervalo_sondeo):
+                    self._actualizar()
+        finally:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    # ------------------------------------------------------------------
+
+    def _ciclo_inotify(self):
+        """Espera eventos del kernel y reenumera solo cuando afectan a tty*."""
+        while not self._detener.is_set():
+            # Timeout para poder revisar la bandera de detención
+            listos, _, _ = select.select([self._fd], [], [], 0.5)
+            if not listos:
+                continue
+
+            if not self._leer_eventos():
+                continue
+
+            # Agrupa la ráfaga de eventos de udev antes de enumerar
+            self._detener.wait(self.retardo)
+            while select.select([self._fd], [], [], 0)[0]:
+                self._leer_eventos()
+            self._actualizar()
+
+    # ------------------------------------------------------------------
+
+    def _leer_eventos(self):
+        """
+        Lee los eventos inotify pendientes.
+
+        Returns:
+            bool: True si alguno corresponde a un dispositivo tty.
+        """
+        try:
+            datos = os.read(self._fd, 4096)
+        except BlockingIOError:
+            return False
+
+        relevante = False
+        pos = 0
+        while pos + ENCABEZADO_EVENTO.size <= len(datos):
+            _, _, _, largo = ENCABEZADO_EVENTO.unpack_from(datos, pos)
+            pos += ENCABEZADO_EVENTO.size
+            nombre = datos[pos : pos + largo].rstrip(b"\0")
+            pos += largo
+            if nombre.startswith(b"tty"):
+                relevante = True
+        return relevante
+
+    # ------------------------------------------------------------------
+
+    def _actualizar(self):
+        """Reenumera los puertos y notifica las diferencias con la caché."""
+        try:
+            nuevos = enumerar_puertos()
+        except Exception as e:
+            print(f"Error al enumerar puertos serie: {e}")
+            return
+
+        with self._bloqueo:
+            anteriores = self._dispositivos
+            self._dispositivos = nuevos
+
+        if not self.callback:
+            return
+
+        for dispositivo in anteriores.keys() - nuevos.keys():
+            self._notificar("desconectado", dispositivo, anteriores[dispositivo])
+        for dispositivo in nuevos.keys() - anteriores.keys():
+            self._notificar("conectado", dispositivo, nuevos[dispositivo])
+
+    # ------------------------------------------------------------------
+
+    def _notificar(self, evento, dispositivo, descripcion):
+        try:
+            self.callback(evento, dispositivo, descripcion)
+        except Exception as e:
+            print(f"Error en callback del monitor de puertos: {e}")
+
+    # ------------------------------------------------------------------
+
+    def detener(self, esperar=1.0):
+        """
+        Detiene el monitor y espera a que el hilo termine.
+
+        Args:
+            esperar (float): Segundos máximos de espera.
+        """
+        self._detener.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(esperar)
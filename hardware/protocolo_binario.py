@@ -0,0 +1,261 @@
+"""
+protocolo_binario.py
+--------------------
+Protocolo binario compacto, opcional, para la comunicación con el Arduino.
+
+Formato de cada trama:
+
+    +------+-----+------+-----+-----------------+-----------+
+    | 0xA5 | LEN | TIPO | SEQ | PAYLOAD (LEN B) | CRC16 (2) |
+    +------+-----+------+-----+-----------------+-----------+
+
+- 0xA5: byte de sincronía.
+- LEN: largo del payload (0-255).
+- TIPO: tipo de mensaje (ver constantes TIPO_*).
+- SEQ: número de secuencia (0-255, cíclico) para asociar respuestas.
+- CRC16: CRC-16/CCITT-FALSE (big-endian) calculado sobre LEN, TIPO, SEQ y
+  el payload.
+
+El decodificador trabaja por flujo: acepta bytes en cualquier fragmentación
+y, si una trama llega corrupta, descarta el byte de sincronía y vuelve a
+buscar el siguiente, de modo que se resincroniza sin perder las tramas
+válidas posteriores.
+
+El protocolo de texto ("rutina,repeticiones\\n") sigue siendo el modo por
+defecto de ArduinoDetector; este módulo solo se usa con protocolo="binario".
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+from collections import namedtuple
+
+SINCRONIA = 0xA5
+LARGO_ENCABEZADO = 4  # SYNC + LEN + TIPO + SEQ
+LARGO_CRC = 2
+MAX_PAYLOAD = 255
+
+# Host -> Arduino
+TIPO_RUTINA = 0x01  # payload: rutina (u8), repeticiones (u8). 0,0 = detener
+TIPO_PING = 0x02  # sin payload; el Arduino responde TIPO_LISTO
+TIPO_SETPOINT = 0x03  # payload: base, brazo, codo, pinza (u16 LE, décimas de grado)
+
+# Arduino -> host
+TIPO_ACK = 0x80  # payload: SEQ (u8) de la trama confirmada
+TIPO_COMPLETADA = 0x81
+TIPO_DETENIDA = 0x82
+TIPO_LISTO = 0x83  # payload opcional: capacidades (u8, CAPACIDAD_*)
+TIPO_TELEMETRIA = 0x84
+TIPO_TEXTO = 0x85  # payload: texto UTF-8 (depuración)
+
+# Equivalencia con los mensajes del protocolo de texto, para que la GUI
+# funcione igual con ambos protocolos.
+MENSAJES_TEXTO = {
+    TIPO_COMPLETADA: "Rutina completada",
+    TIPO_DETENIDA: "Rutina detenida",
+    TIPO_LISTO: "Listo",
+}
+
+# Capacidades que el firmware anuncia en el saludo: byte de TIPO_LISTO, o
+# "Listo,SP" en el protocolo de texto. Un sketch que solo responde "Listo"
+# no anuncia ninguna y únicamente entiende comandos de rutina.
+CAPACIDAD_SETPOINTS = 0x01  # Acepta TIPO_SETPOINT / "S,seq,..."
+CAPACIDADES_TEXTO = {"SP": CAPACIDAD_SETPOINTS}
+
+Trama = namedtuple("Trama", ["tipo", "secuencia", "payload"])
+
+
+def _crear_tabla_crc():
+    """Precalcula la tabla de 256 entradas del CRC-16/CCITT (polinomio 0x1021)."""
+    tabla = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        tabla.append(crc & 0xFFFF)
+    return tuple(tabla)
+
+
+_TABLA_CRC = _crear_tabla_crc()
+
+
+def crc16(datos, crc=0xFFFF):
+    """
+    Calcula el CRC-16/CCITT-FALSE de una secuencia de bytes.
+
+    Args:
+        datos (bytes | bytearray | memoryview): Datos a verificar.
+        crc (int): Valor inicial.
+
+    Returns:
+        int: CRC de 16 bits.
+    """
+    tabla = _TABLA_CRC
+    for byte in datos:
+        crc = ((crc << 8) & 0xFFFF) ^ tabla[(crc >> 8) ^ byte]
+    return crc
+
+
+def codificar_trama(tipo, secuencia, payload=b""):
+    """
+    Construye una trama binaria lista para enviar.
+
+    Args:
+        tipo (int): Tipo de mensaje (TIPO_*).
+        secuencia (int): Número de secuencia (se usa módulo 256).
+        payload (bytes): Datos del mensaje (máx. 255 bytes).
+
+    Returns:
+        bytes: Trama completa con sincronía y CRC.
+    """
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload demasiado largo: {len(payload)} bytes")
+
+    cuerpo = bytes((len(payload), tipo, secuencia & 0xFF)) + bytes(payload)
+    crc = crc16(cuerpo)
+    return bytes((SINCRONIA,)) + cuerpo + bytes((crc >> 8, crc & 0xFF))
+
+
+class DecodificadorTramas:
+    """
+    Decodificador por flujo de tramas binarias con resincronización.
+
+    Atributos:
+        tramas_validas (int): Tramas decodificadas correctamente.
+        errores_crc (int): Tramas descartadas por CRC inválido.
+        bytes_descartados (int): Bytes ignorados mientras se buscaba sincronía.
+    """
+
+    def __init__(self, capacidad=4096):
+        """
+        Args:
+            capacidad (int): Máximo de bytes pendientes antes de descartar.
+        """
+        self.capacidad = capacidad
+        self._buffer = bytearray()
+        self.tramas_validas = 0
+        self.errores_crc = 0
+        self.bytes_descartados = 0
+
+    # ------------------------------------------------------------------
+
+    def alimentar(self, datos):
+        """
+        Agrega bytes recibidos y devuelve las tramas completas y válidas.
+
+        Args:
+            datos (bytes): Bytes leídos del puerto.
+
+        Returns:
+            list[Trama]: Tramas decodificadas, en orden de llegada.
+        """
+        buffer = self._buffer
+        buffer += datos
+
+        tramas = []
+        inicio = 0
+        largo_total = len(buffer)
+
+        while True:
+            # Buscar el siguiente byte de sincronía
+            pos = buffer.find(SINCRONIA, inicio)
+            if pos < 0:
+                self.bytes_descartados += largo_total - inicio
+                inicio = largo_total
+                break
+            self.bytes_descartados += pos - inicio
+            inicio = pos
+
+            if largo_total - inicio < LARGO_ENCABEZADO:
+                break  # Encabezado incompleto
+
+            largo_payload = buffer[inicio + 1]
+            fin = inicio + LARGO_ENCABEZADO + largo_payload + LARGO_CRC
+            if fin > largo_total:
+                break  # Trama incompleta
+
+            cuerpo = memoryview(buffer)[inicio + 1 : fin - LARGO_CRC]
+            crc_recibido = (buffer[fin - 2] << 8) | buffer[fin - 1]
+            if crc16(cuerpo) != crc_recibido:
+                # Sincronía falsa o trama corrupta: saltar este byte y reintentar
+                cuerpo.release()
+                self.errores_crc += 1
+                self.bytes_descartados += 1
+                inicio += 1
+                continue
+
+            tramas.append(
+                Trama(
+                    buffer[inicio + 2],
+                    buffer[inicio + 3],
+                    bytes(cuerpo[LARGO_ENCABEZADO - 1 :]),
+                )
+            )
+            cuerpo.release()
+            self.tramas_validas += 1
+            inicio = fin
+
+        del buffer[:inicio]
+
+        # Evitar crecimiento sin límite si nunca llega una trama válida
+        if len(buffer) > self.capacidad:
+            exceso = len(buffer) - self.capacidad
+            self.bytes_descartados += exceso
+            del buffer[:exceso]
+
+        return tramas
+
+    # ------------------------------------------------------------------
+
+    def limpiar(self):
+        """Descarta los bytes pendientes."""
+        self._buffer.clear()
+
+
+class DecodificadorMensajes(DecodificadorTramas):
+    """
+    Decodificador usado por el hilo lector en modo binario.
+
+    Traduce las tramas de estado a los mismos textos del protocolo de texto
+    ("Rutina completada", "Rutina detenida", ...) para que la GUI no
+    distinga entre ambos protocolos. Las tramas con una función registrada
+    para su tipo en `manejadores` (telemetría, ACK, el saludo TIPO_LISTO) se
+    entregan a esa función y no llegan a la cola de mensajes.
+    """
+
+    def __init__(self, manejadores=None, capacidad=4096):
+        """
+        Args:
+            manejadores (dict - None): {tipo: función(trama)}.
+            capacidad (int): Máximo de bytes pendientes antes de descartar.
+        """
+        super().__init__(capacidad)
+        self.manejadores = manejadores if manejadores is not None else {}
+
+    # ------------------------------------------------------------------
+
+    def alimentar(self, datos):
+        mensajes = []
+        for trama in super().alimentar(datos):
+            manejador = self.manejadores.get(trama.tipo)
+            if manejador is not None:
+                try:
+                    manejador(trama)
+                except Exception as e:
+                    print(f"Error al procesar trama 0x{trama.tipo:02X}: {e}")
+                continue
+
+            if trama.tipo in MENSAJES_TEXTO:
+                mensajes.append(MENSAJES_TEXTO[trama.tipo])
+            elif trama.tipo == TIPO_TEXTO:
+                mensajes.append(trama.payload.decode("utf-8", errors="ignore").strip())
+        return mensajes
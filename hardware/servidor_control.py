@@ -0,0 +1,468 @@
+"""
+servidor_control.py
+-------------------
+Servidor local de control del brazo robótico (IPC por socket Unix).
+
+El puerto serie solo puede abrirlo un proceso, y cada apertura reinicia el
+Arduino. Este servidor es el único dueño del puerto y atiende a varios
+clientes locales (la GUI, el puente con el MES, scripts de prueba) a través
+de un socket Unix, sin reabrir el puerto.
+
+Protocolo: una línea JSON por mensaje, en ambos sentidos. Cada pedido puede
+llevar un "id" que se repite en su respuesta.
+
+    {"id": 1, "op": "rutina", "rutina": 2, "repeticiones": 3, "timeout": 80}
+        -> {"id": 1, "ok": true, "resultado": "completada", "segundos": 4.1}
+           resultado: "completada" | "detenida" | "timeout" | "sin_conexion"
+    {"id": 2, "op": "detener"}
+        -> {"id": 2, "ok": true}
+    {"id": 3, "op": "estado"}
+        -> {"id": 3, "ok": true, "conectado": true, "puerto": "...",
+            "en_ejecucion": {...} | null, "en_cola": 2, "clientes": 3}
+    {"id": 4, "op": "suscribir_telemetria"}
+        -> {"id": 4, "ok": true}, y luego periódicamente
+           {"evento": "telemetria", "t": [...], "q": [[b, br, c, p], ...]}
+    {"id": 5, "op": "setpoint", "angulos": [b, br, c, p]}
+        -> {"id": 5, "ok": true, "secuencia": 17}, y cuando el Arduino lo
+           confirma {"evento": "setpoint_confirmado", "secuencia": 17}
+           (ok false si no hay conexión, el firmware no acepta setpoints
+           o hay una rutina en ejecución)
+
+Las rutinas se ejecutan de a una (el brazo no puede hacer dos a la vez).
+Cada cliente tiene su propia cola y el planificador las atiende por turno
+rotativo (round-robin), de modo que un cliente que encola muchas rutinas no
+bloquea a los demás. "detener" se envía de inmediato, sin pasar por la cola.
+Los setpoints del Modo Manual tampoco se encolan: se envían al momento y la
+confirmación del Arduino se reenvía a los clientes que enviaron setpoints.
+"estado" informa con "acepta_setpoints" si el firmware los admite.
+
+Uso:
+
+    python -m hardware.servidor_control --socket /tmp/brazo_robotico.sock
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+
+from hardware import protocolo_binario as pb
+from hardware.arduino_detector import ArduinoDetector
+from hardware.emisor_setpoints import PREFIJO_CONFIRMACION
+
+RUTA_SOCKET_DEFECTO = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "brazo_robotico.sock"
+)
+INTERVALO_TELEMETRIA = 0.05  # Segundos entre envíos de telemetría
+INTERVALO_SUPERVISION = 1.0  # Segundos entre revisiones de la conexión
+
+
+class ClienteConectado:
+    """Estado de un cliente conectado al servidor."""
+
+    def __init__(self, conexion, numero):
+        self.conexion = conexion
+        self.numero = numero
+        self.cola = deque()  # Rutinas pendientes de este cliente
+        self.suscrito_telemetria = False
+        self.envia_setpoints = False  # Recibe las confirmaciones de setpoints
+        self.activo = True
+        self._bloqueo = threading.Lock()
+
+    # ------------------------------------------------------------------
+
+    def enviar(self, mensaje):
+        """Envía un mensaje JSON; marca al cliente inactivo si falla."""
+        datos = (json.dumps(mensaje) + "\n").encode("utf-8")
+        with self._bloqueo:
+            if not self.activo:
+                return
+            try:
+                self.conexion.sendall(datos)
+            except OSError:
+                self.activo = False
+
+
+class ServidorControl:
+    """
+    Dueño único del puerto serie que multiplexa clientes locales.
+
+    Atributos:
+        ruta_socket (str): Ruta del socket Unix.
+        detector (ArduinoDetector): Detector usado para hablar con el Arduino.
+    """
+
+    def __init__(self, ruta_socket=RUTA_SOCKET_DEFECTO, detector=None):
+        """
+        Args:
+            ruta_socket (str): Ruta del socket Unix a crear.
+            detector (ArduinoDetector - None): Detector a usar; por defecto
+                uno nuevo con autodetección y monitor de hotplug.
+        """
+        self.ruta_socket = ruta_socket
+        self.detector = detector or ArduinoDetector()
+        self.telemetria = None
+
+        self._clientes = []
+        self._turno = 0
+        self._en_ejecucion = None  # (cliente, pedido) en curso
+        self._condicion = threading.Condition()
+        self._detener = threading.Event()
+        self._socket = None
+        self._contador_clientes = 0
+
+    # ------------------------------------------------------------------
+
+    def iniciar(self):
+        """Abre el socket y arranca los hilos de aceptación y planificación."""
+        if os.path.exists(self.ruta_socket):
+            os.unlink(self.ruta_socket)  # Socket huérfano de una ejecución previa
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(self.ruta_socket)
+        os.chmod(self.ruta_socket, 0o660)
+        self._socket.listen()
+
+        if self.detector.monitor is None and not self.detector.puerto_fijo:
+            self.detector.iniciar_monitor()
+        if self.detector.protocolo == "binario":
+            self._preparar_telemetria()
+        for clave in (pb.TIPO_ACK, PREFIJO_CONFIRMACION):
+            self.detector.registrar_manejador(clave, self._reenviar_confirmacion)
+
+        for objetivo, nombre in (
+            (self._aceptar, "ServidorAceptar"),
+            (self._planificar, "ServidorPlanificador"),
+        ):
+            threading.Thread(target=objetivo, name=nombre, daemon=True).start()
+
+        print(f"Servidor de control escuchando en {self.ruta_socket}")
+
+    # ------------------------------------------------------------------
+
+    def _preparar_telemetria(self):
+        """Registra el receptor de telemetría (importa NumPy solo aquí)."""
+        from hardware.telemetria import BufferTelemetria, ReceptorTelemetria
+
+        self.telemetria = BufferTelemetria()
+        ReceptorTelemetria(self.telemetria).registrar(self.detector)
+        threading.Thread(
+            target=self._publicar_telemetria, name="ServidorTelemetria", daemon=True
+        ).start()
+
+    # ------------------------------------------------------------------
+
+    def detener(self):
+        """Cierra el socket, desconecta a los clientes y libera el puerto."""
+        self._detener.set()
+        with self._condicion:
+            self._condicion.notify_all()
+        if self._socket is not None:
+            self._socket.close()
+        for cliente in list(self._clientes):
+            self._desconectar(cliente)
+        if os.path.exists(self.ruta_socket):
+            os.unlink(self.ruta_socket)
+        self.detector.cerrar()
+
+    # ------------------------------------------------------------------
+    # Clientes
+    # ------------------------------------------------------------------
+
+    def _aceptar(self):
+        while not self._detener.is_set():
+            try:
+                conexion, _ = self._socket.accept()
+            except OSError:
+                break
+            self._contador_clientes += 1
+            cliente = ClienteConectado(conexion, self._contador_clientes)
+            with self._condicion:
+                self._clientes.append(cliente)
+            threading.Thread(
+                target=self._atender,
+                args=(cliente,),
+                name=f"ServidorCliente{cliente.numero}",
+                daemon=True,
+            ).start()
+
+    # ------------------------------------------------------------------
+
+    def _atender(self, cliente):
+        """Lee los pedidos de un cliente hasta que se desconecte."""
+        try:
+            with cliente.conexion.makefile("rb") as lectura:
+                for linea in lectura:
+                    try:
+                        pedido = json.loads(linea)
+                    except ValueError:
+                        cliente.enviar({"ok": False, "error": "JSON inválido"})
+                        continue
+                    self._procesar(cliente, pedido)
+        except OSError:
+            pass
+        finally:
+            self._desconectar(cliente)
+
+    # ------------------------------------------------------------------
+
+    def _desconectar(self, cliente):
+        with self._condicion:
+            cliente.activo = False
+            cliente.cola.clear()
+            if cliente in self._clientes:
+                self._clientes.remove(cliente)
+        try:
+            cliente.conexion.close()
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+
+    def _procesar(self, cliente, pedido):
+        """Atiende un pedido; las rutinas se encolan, el resto es inmediato."""
+        operacion = pedido.get("op")
+        respuesta = {"id": pedido.get("id")}
+
+        if operacion == "rutina":
+            try:
+                int(pedido["rutina"]), int(pedido.get("repeticiones", 1))
+            except (KeyError, TypeError, ValueError):
+                cliente.enviar({**respuesta, "ok": False, "error": "Rutina inválida"})
+                return
+            with self._condicion:
+                cliente.cola.append(pedido)
+                self._condicion.notify()
+            return  # La respuesta se envía al terminar la rutina
+
+        if operacion == "detener":
+            exito = self.detector.enviar_rutina(0, 0)  # rutina 0 = detener
+            if pedido.get("vaciar_cola"):
+                with self._condicion:
+                    cliente.cola.clear()
+            cliente.enviar({**respuesta, "ok": bool(exito)})
+
+        elif operacion == "estado":
+            cliente.enviar({**respuesta, "ok": True, **self.estado()})
+
+        elif operacion == "setpoint":
+            try:
+                angulos = [float(v) for v in pedido["angulos"]]
+            except (KeyError, TypeError, ValueError):
+                angulos = None
+            if angulos is None or len(angulos) != 4:
+                cliente.enviar({**respuesta, "ok": False, "error": "Setpoint inválido"})
+                return
+            with self._condicion:
+                en_ejecucion = self._en_ejecucion is not None
+            if en_ejecucion:
+                cliente.enviar({**respuesta, "ok": False, "error": "Rutina en ejecución"})
+                return
+            cliente.envia_setpoints = True
+            secuencia = self.detector.enviar_setpoint(angulos)
+            cliente.enviar({**respuesta, "ok": secuencia is not None, "secuencia": secuencia})
+
+        elif operacion == "suscribir_telemetria":
+            if self.telemetria is None:
+                cliente.enviar(
+                    {**respuesta, "ok": False, "error": "Requiere protocolo binario"}
+                )
+            else:
+                cliente.suscrito_telemetria = True
+                cliente.enviar({**respuesta, "ok": True})
+
+        else:
+            cliente.enviar(
+                {**respuesta, "ok": False, "error": f"Operación desconocida: {operacion}"}
+            )
+
+    # ------------------------------------------------------------------
+
+    def estado(self):
+        """
+        Returns:
+            dict: Conexión, rutina en curso y tamaño de las colas.
+        """
+        with self._condicion:
+            en_ejecucion = self._en_ejecucion[1] if self._en_ejecucion else None
+            en_cola = sum(len(c.cola) for c in self._clientes)
+            clientes = len(self._clientes)
+        return {
+            "conectado": self.detector.esta_conectado(),
+            "puerto": self.detector.obtener_puerto(),
+            "en_ejecucion": en_ejecucion,
+            "en_cola": en_cola,
+            "clientes": clientes,
+            "acepta_setpoints": self.detector.acepta_setpoints,
+        }
+
+    # ------------------------------------------------------------------
+
+    def _reenviar_confirmacion(self, mensaje):
+        """
+        Reenvía la confirmación de un setpoint (TIPO_ACK o "SP,seq", hilo
+        lector) a los clientes que enviaron setpoints.
+        """
+        try:
+            if isinstance(mensaje, str):
+                secuencia = int(mensaje.split(",")[1])
+            else:
+                secuencia = mensaje.payload[0]
+        except (IndexError, ValueError):
+            return
+        with self._condicion:
+            destinatarios = [c for c in self._clientes if c.envia_setpoints]
+        for cliente in destinatarios:
+            cliente.enviar({"evento": "setpoint_confirmado", "secuencia": secuencia})
+
+    # ------------------------------------------------------------------
+    # Planificación y ejecución
+    # ------------------------------------------------------------------
+
+    def _siguiente_trabajo(self):
+        """
+        Toma la próxima rutina por turno rotativo entre clientes.
+
+        Debe llamarse con `self._condicion` adquirida.
+        """
+        cantidad = len(self._clientes)
+        for desplazamiento in range(cantidad):
+            indice = (self._turno + desplazamiento) % cantidad
+            cliente = self._clientes[indice]
+            if cliente.cola:
+                self._turno = indice + 1
+                return cliente, cliente.cola.popleft()
+        return None
+
+    # ------------------------------------------------------------------
+
+    def _planificar(self):
+        ultima_supervision = 0.0
+        while not self._detener.is_set():
+            with self._condicion:
+                trabajo = self._siguiente_trabajo()
+                if trabajo is None:
+                    self._condicion.wait(INTERVALO_SUPERVISION)
+                    trabajo = self._siguiente_trabajo()
+                self._en_ejecucion = trabajo
+
+            # La reconexión la maneja este mismo hilo, entre rutinas, para
+            # no cerrar el puerto mientras se espera una respuesta.
+            if time.monotonic() - ultima_supervision >= INTERVALO_SUPERVISION:
+                self.detector.actualizar_estado()
+                ultima_supervision = time.monotonic()
+
+            if trabajo is not None:
+                cliente, pedido = trabajo
+                resultado = self._ejecutar(pedido)
+                with self._condicion:
+                    self._en_ejecucion = None
+                cliente.enviar({"id": pedido.get("id"), **resultado})
+
+    # ------------------------------------------------------------------
+
+    def _ejecutar(self, pedido):
+        """
+        Envía una rutina y espera la respuesta del Arduino.
+
+        Returns:
+            dict: Respuesta para el cliente.
+        """
+        if not self.detector.esta_conectado():
+            return {"ok": False, "resultado": "sin_conexion"}
+
+        rutina = int(pedido["rutina"])
+        repeticiones = int(pedido.get("repeticiones", 1))
+        timeout = float(pedido.get("timeout", 80))
+
+        inicio = time.monotonic()
+        self.detector.limpiar_buffer()
+        if not self.detector.enviar_rutina(rutina, repeticiones):
+            return {"ok": False, "resultado": "error_envio"}
+
+        resultado = "timeout"
+        while time.monotonic() - inicio < timeout and not self._detener.is_set():
+            respuesta = self.detector.leer_respuesta(timeout=0.5)
+            if respuesta == "Rutina completada":
+                resultado = "completada"
+                break
+            if respuesta == "Rutina detenida":
+                resultado = "detenida"
+                break
+            if respuesta is None and not self.detector.esta_conectado():
+                resultado = "sin_conexion"
+                break
+
+        return {
+            "ok": resultado == "completada",
+            "resultado": resultado,
+            "segundos": round(time.monotonic() - inicio, 3),
+        }
+
+    # ------------------------------------------------------------------
+
+    def _publicar_telemetria(self):
+        """Envía a los suscriptores las muestras nuevas de telemetría."""
+        ultimo_total = self.telemetria.total
+        while not self._detener.wait(INTERVALO_TELEMETRIA):
+            nuevas = self.telemetria.total - ultimo_total
+            ultimo_total = self.telemetria.total
+            with self._condicion:
+                suscriptores = [c for c in self._clientes if c.suscrito_telemetria]
+            if not nuevas or not suscriptores:
+                continue
+
+            tiempos, angulos = self.telemetria.ultimas(nuevas)
+            mensaje = {
+                "evento": "telemetria",
+                "t": tiempos.tolist(),
+                "q": angulos.tolist(),
+            }
+            for cliente in suscriptores:
+                cliente.enviar(mensaje)
+
+
+# --------------------------------------------------------------------------------
+# Ejecución desde consola
+# --------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de control del brazo")
+    parser.add_argument("--socket", default=RUTA_SOCKET_DEFECTO)
+    parser.add_argument(
+        "--puerto",
+        default=os.environ.get("BRAZO_PUERTO") or None,
+        help="Puerto serie (por defecto se autodetecta o se usa BRAZO_PUERTO)",
+    )
+    parser.add_argument("--protocolo", choices=("texto", "binario"), default="texto")
+    args = parser.parse_args()
+
+    servidor = ServidorControl(
+        args.socket, ArduinoDetector(protocolo=args.protocolo, puerto=args.puerto)
+    )
+    servidor.iniciar()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.detener()
+
+
+if __name__ == "__main__":
+    main()
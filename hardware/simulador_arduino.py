@@ -0,0 +1,459 @@
+"""
+simulador_arduino.py
+--------------------
+Simulador del firmware del brazo robótico sobre un pseudo-terminal (pty).
+
+Abre un par maestro/esclavo de Linux: el simulador atiende el lado maestro
+y el lado esclavo (p. ej. /dev/pts/3) se comporta como el puerto serie del
+Arduino. Habla el mismo protocolo que el sketch real:
+
+    host -> "rutina,repeticiones\\n"
+    Arduino -> "Rutina completada" al terminar, o "Rutina detenida" si
+               recibe "0,0" durante la ejecución.
+    host -> "ping\\n"
+    Arduino -> "Listo,SP"   (SP: acepta setpoints; el sketch de rutinas
+               responde solo "Listo")
+    host -> "S,seq,base,brazo,codo,pinza\\n"   (décimas de grado)
+    Arduino -> "SP,seq"
+
+En modo binario puede además transmitir telemetría (posiciones de los
+servos) a una frecuencia fija, agrupando varias muestras por trama.
+
+Permite configurar la duración de cada rutina, variación aleatoria (jitter)
+e inyección de fallos (respuestas perdidas, bytes corruptos, retardos), para
+probar y medir la ruta completa de ModoAutomatico sin hardware.
+
+Uso desde consola:
+
+    python -m hardware.simulador_arduino --duracion 1=2.5 --duracion 2=4 \\
+        --jitter 0.1 --perdida 0.05
+
+y luego, en otra terminal:
+
+    BRAZO_PUERTO=/dev/pts/3 python main.py
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import argparse
+import math
+import os
+import random
+import select
+import struct
+import threading
+import time
+import tty
+
+from hardware.lector_serial import BufferLineas
+from hardware import protocolo_binario as pb
+from hardware.telemetria import MUESTRAS_POR_TRAMA, codificar_telemetria
+
+INTERVALO_TRAMA_TELEMETRIA = 0.02  # Segundos entre tramas de telemetría
+
+
+class SimuladorArduino:
+    """
+    Firmware simulado que atiende un pseudo-terminal en un hilo propio.
+
+    Atributos:
+        puerto (str - None): Ruta del lado esclavo del pty (disponible
+            después de `iniciar`).
+        comandos_recibidos (int): Comandos de rutina recibidos.
+        setpoints_recibidos (int): Setpoints del Modo Manual recibidos.
+        setpoint (tuple): Última posición ordenada (base, brazo, codo, pinza).
+        respuestas_enviadas (int): Respuestas escritas (incluye corruptas).
+        respuestas_perdidas (int): Respuestas descartadas por inyección de fallos.
+    """
+
+    def __init__(
+        self,
+        duraciones=None,
+        duracion_defecto=1.0,
+        jitter=0.0,
+        prob_perdida=0.0,
+        prob_corrupcion=0.0,
+        retardo_respuesta=0.0,
+        protocolo="texto",
+        semilla=None,
+        frecuencia_telemetria=0.0,
+        acepta_setpoints=True,
+    ):
+        """
+        Args:
+            duraciones (dict - None): {rutina: segundos por repetición}.
+            duracion_defecto (float): Duración de rutinas no listadas.
+            jitter (float): Variación relativa de la duración (0.1 = ±10 %).
+            prob_perdida (float): Probabilidad de no enviar una respuesta.
+            prob_corrupcion (float): Probabilidad de alterar un byte de la respuesta.
+            retardo_respuesta (float): Segundos extra antes de cada respuesta.
+            protocolo (str): 'texto' o 'binario'.
+            semilla (int - None): Semilla del generador aleatorio.
+            frecuencia_telemetria (float): Muestras por segundo de telemetría
+                (solo protocolo binario); 0 la desactiva.
+            acepta_setpoints (bool): Anunciar CAPACIDAD_SETPOINTS en el
+                saludo y atender setpoints; False imita el sketch que solo
+                entiende rutinas.
+        """
+        if frecuencia_telemetria and protocolo != "binario":
+            raise ValueError("La telemetría requiere el protocolo binario")
+        self.duraciones = dict(duraciones or {})
+        self.duracion_defecto = duracion_defecto
+        self.jitter = jitter
+        self.prob_perdida = prob_perdida
+        self.prob_corrupcion = prob_corrupcion
+        self.retardo_respuesta = retardo_respuesta
+        self.protocolo = protocolo
+        self.aleatorio = random.Random(semilla)
+        self.frecuencia_telemetria = frecuencia_telemetria
+        self.acepta_setpoints = acepta_setpoints
+
+        self.puerto = None
+        self.comandos_recibidos = 0
+        self.setpoints_recibidos = 0
+        self.setpoint = (90.0, 120.0, 90.0, 60.0)
+        self.respuestas_enviadas = 0
+        self.respuestas_perdidas = 0
+
+        self._maestro = None
+        self._esclavo = None
+        self._hilo = None
+        self._detener = threading.Event()
+        self._fin_rutina = None  # Instante en que termina la rutina en curso
+        self._secuencia = 0
+        self._inicio = time.monotonic()
+        self._ultima_muestra = None  # Instante de la última muestra emitida
+        self._proxima_trama = None  # Instante de la próxima trama de telemetría
+
+    # ------------------------------------------------------------------
+
+    def iniciar(self):
+        """
+        Crea el pseudo-terminal y arranca el hilo del firmware simulado.
+
+        Returns:
+            str: Ruta del puerto que debe abrir el host.
+        """
+        self._maestro, self._esclavo = os.openpty()
+        # Modo crudo: sin eco ni procesamiento de líneas del kernel
+        tty.setraw(self._esclavo)
+        self.puerto = os.ttyname(self._esclavo)
+
+        self._detener.clear()
+        self._inicio = time.monotonic()
+        if self.frecuencia_telemetria:
+            self._ultima_muestra = self._inicio
+            self._proxima_trama = self._inicio + INTERVALO_TRAMA_TELEMETRIA
+        self._hilo = threading.Thread(
+            target=self._ciclo, name="SimuladorArduino", daemon=True
+        )
+        self._hilo.start()
+        return self.puerto
+
+    # ------------------------------------------------------------------
+
+    def detener(self):
+        """Detiene el hilo y cierra el pseudo-terminal."""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(1.0)
+            self._hilo = None
+        for fd in (self._maestro, self._esclavo):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._maestro = self._esclavo = None
+
+    # ------------------------------------------------------------------
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *args):
+        self.detener()
+
+    # ------------------------------------------------------------------
+
+    def _ciclo(self):
+        """Atiende comandos y emite las respuestas en el momento simulado."""
+        if self.protocolo == "binario":
+            decodificador = pb.DecodificadorTramas()
+        else:
+            decodificador = BufferLineas()
+
+        while not self._detener.is_set():
+            espera = 0.1
+            for instante in (self._fin_rutina, self._proxima_trama):
+                if instante is not None:
+                    espera = max(0.0, min(espera, instante - time.monotonic()))
+
+            listos, _, _ = select.select([self._maestro], [], [], espera)
+            if listos:
+                try:
+                    datos = os.read(self._maestro, 4096)
+                except OSError:
+                    break
+                for mensaje in decodificador.alimentar(datos):
+                    self._procesar(mensaje)
+
+            if self._fin_rutina is not None and time.monotonic() >= self._fin_rutina:
+                self._fin_rutina = None
+                self._responder(pb.TIPO_COMPLETADA)
+
+            if self._proxima_trama is not None and time.monotonic() >= self._proxima_trama:
+                self._proxima_trama += INTERVALO_TRAMA_TELEMETRIA
+                self._enviar_telemetria()
+
+    # ------------------------------------------------------------------
+
+    def _enviar_telemetria(self):
+        """Emite las muestras acumuladas desde la última trama de telemetría."""
+        periodo = 1.0 / self.frecuencia_telemetria
+        ahora = time.monotonic()
+        cantidad = min(int((ahora - self._ultima_muestra) / periodo), MUESTRAS_POR_TRAMA)
+        if cantidad <= 0:
+            return
+
+        tiempos, angulos = [], []
+        for _ in range(cantidad):
+            self._ultima_muestra += periodo
+            t = self._ultima_muestra - self._inicio
+            tiempos.append(int(t * 1000))
+            angulos.append(self.posicion_simulada(t))
+        self._ultima_muestra = max(self._ultima_muestra, ahora - periodo)
+
+        payload = codificar_telemetria(tiempos, angulos)
+        try:
+            os.write(
+                self._maestro,
+                pb.codificar_trama(pb.TIPO_TELEMETRIA, self._secuencia, payload),
+            )
+            self._secuencia = (self._secuencia + 1) & 0xFF
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+
+    def posicion_simulada(self, t):
+        """
+        Posición de los servos en el instante `t`: oscila durante una rutina
+        y permanece en reposo el resto del tiempo.
+
+        Returns:
+            tuple: (base, brazo, codo, pinza) en grados.
+        """
+        if self._fin_rutina is None:
+            return self.setpoint
+        fase = 2 * math.pi * 0.5 * t
+        return (
+            125.0 + 55.0 * math.sin(fase),
+            145.0 + 35.0 * math.sin(fase * 0.5),
+            112.5 + 22.5 * math.cos(fase),
+            90.0 + 90.0 * math.sin(fase * 2),
+        )
+
+    # ------------------------------------------------------------------
+
+    def _procesar(self, mensaje):
+        """Interpreta un comando (línea de texto o trama binaria)."""
+        if self.protocolo == "binario":
+            if mensaje.tipo == pb.TIPO_PING:
+                self._responder_listo()
+                return
+            if (
+                self.acepta_setpoints
+                and mensaje.tipo == pb.TIPO_SETPOINT
+                and len(mensaje.payload) == 8
+            ):
+                decimas = struct.unpack("<4H", mensaje.payload)
+                self._aplicar_setpoint(mensaje.secuencia, decimas)
+                return
+            if mensaje.tipo != pb.TIPO_RUTINA or len(mensaje.payload) < 2:
+                return
+            rutina, repeticiones = mensaje.payload[0], mensaje.payload[1]
+        else:
+            if mensaje == "ping":
+                self._responder_listo()
+                return
+            if self.acepta_setpoints and mensaje.startswith("S,"):
+                try:
+                    secuencia, *decimas = (int(v) for v in mensaje[2:].split(","))
+                except ValueError:
+                    return
+                if len(decimas) == 4:
+                    self._aplicar_setpoint(secuencia, decimas)
+                return
+            try:
+                rutina, repeticiones = (int(v) for v in mensaje.split(","))
+            except ValueError:
+                return  # Comando desconocido: el sketch real lo ignora
+
+        self.comandos_recibidos += 1
+
+        if rutina == 0:
+            if self._fin_rutina is not None:
+                self._fin_rutina = None
+                self._responder(pb.TIPO_DETENIDA)
+            return
+
+        self._fin_rutina = time.monotonic() + self.duracion_rutina(rutina, repeticiones)
+
+    # ------------------------------------------------------------------
+
+    def _responder_listo(self):
+        """Saludo, con las capacidades del firmware simulado."""
+        if not self.acepta_setpoints:
+            self._responder(pb.TIPO_LISTO)
+        elif self.protocolo == "binario":
+            self._responder(pb.TIPO_LISTO, bytes((pb.CAPACIDAD_SETPOINTS,)))
+        else:
+            self._responder(pb.TIPO_TEXTO, f"{pb.MENSAJES_TEXTO[pb.TIPO_LISTO]},SP")
+
+    # ------------------------------------------------------------------
+
+    def _aplicar_setpoint(self, secuencia, decimas):
+        """Adopta una posición del Modo Manual y la confirma."""
+        self.setpoints_recibidos += 1
+        self.setpoint = tuple(d / 10 for d in decimas)
+        if self.protocolo == "binario":
+            self._responder(pb.TIPO_ACK, bytes((secuencia,)))
+        else:
+            self._responder(pb.TIPO_ACK, f"SP,{secuencia}")
+
+    # ------------------------------------------------------------------
+
+    def duracion_rutina(self, rutina, repeticiones):
+        """
+        Calcula la duración simulada de una rutina, con jitter.
+
+        Args:
+            rutina (int): Número de rutina.
+            repeticiones (int): Repeticiones solicitadas.
+
+        Returns:
+            float: Segundos.
+        """
+        base = self.duraciones.get(rutina, self.duracion_defecto) * repeticiones
+        if self.jitter:
+            base *= 1.0 + self.aleatorio.uniform(-self.jitter, self.jitter)
+        return max(0.0, base)
+
+    # ------------------------------------------------------------------
+
+    def _responder(self, tipo, contenido=b""):
+        """
+        Escribe una respuesta aplicando la inyección de fallos configurada.
+
+        Args:
+            tipo (int): Tipo de respuesta (protocolo_binario.TIPO_*).
+            contenido (bytes | str): Payload binario, o la línea de texto si
+                el tipo no tiene un mensaje equivalente en MENSAJES_TEXTO.
+        """
+        if self.prob_perdida and self.aleatorio.random() < self.prob_perdida:
+            self.respuestas_perdidas += 1
+            return
+
+        if self.protocolo == "binario":
+            datos = bytearray(pb.codificar_trama(tipo, self._secuencia, contenido))
+            self._secuencia = (self._secuencia + 1) & 0xFF
+        else:
+            texto = pb.MENSAJES_TEXTO.get(tipo, contenido)
+            datos = bytearray(f"{texto}\n".encode("utf-8"))
+
+        if self.prob_corrupcion and self.aleatorio.random() < self.prob_corrupcion:
+            posicion = self.aleatorio.randrange(len(datos))
+            datos[posicion] ^= 1 << self.aleatorio.randrange(8)
+
+        if self.retardo_respuesta:
+            time.sleep(self.retardo_respuesta)
+
+        try:
+            os.write(self._maestro, datos)
+            self.respuestas_enviadas += 1
+        except OSError:
+            pass
+
+
+# --------------------------------------------------------------------------------
+# Ejecución desde consola
+# --------------------------------------------------------------------------------
+def _leer_duracion(texto):
+    """Convierte 'rutina=segundos' en una tupla (int, float)."""
+    rutina, segundos = texto.split("=")
+    return int(rutina), float(segundos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de Arduino sobre pty")
+    parser.add_argument(
+        "--duracion",
+        type=_leer_duracion,
+        action="append",
+        default=[],
+        help="Duración por repetición de una rutina, p. ej. 1=2.5",
+    )
+    parser.add_argument("--duracion-defecto", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--perdida", type=float, default=0.0)
+    parser.add_argument("--corrupcion", type=float, default=0.0)
+    parser.add_argument("--retardo", type=float, default=0.0)
+    parser.add_argument("--protocolo", choices=("texto", "binario"), default="texto")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument(
+        "--sin-setpoints",
+        action="store_true",
+        help="Imitar el sketch que solo entiende rutinas (no anuncia setpoints)",
+    )
+    parser.add_argument(
+        "--telemetria",
+        type=float,
+        default=0.0,
+        help="Frecuencia de telemetría en Hz (requiere --protocolo binario)",
+    )
+    args = parser.parse_args()
+
+    simulador = SimuladorArduino(
+        duraciones=dict(args.duracion),
+        duracion_defecto=args.duracion_defecto,
+        jitter=args.jitter,
+        prob_perdida=args.perdida,
+        prob_corrupcion=args.corrupcion,
+        retardo_respuesta=args.retardo,
+        protocolo=args.protocolo,
+        semilla=args.semilla,
+        frecuencia_telemetria=args.telemetria,
+        acepta_setpoints=not args.sin_setpoints,
+    )
+    puerto = simulador.iniciar()
+    print(f"Arduino simulado escuchando en {puerto}")
+    print(f"Ejecutar la GUI con: BRAZO_PUERTO={puerto} python main.py")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulador.detener()
+        print(
+            f"Comandos: {simulador.comandos_recibidos}, "
+            f"respuestas: {simulador.respuestas_enviadas}, "
+            f"perdidas: {simulador.respuestas_perdidas}"
+        )
+
+
+if __name__ == "__main__":
+    main()
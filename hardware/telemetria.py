@@ -0,0 +1,225 @@
+"""
+telemetria.py
+-------------
+Recepción de telemetría de alta frecuencia del brazo robótico.
+
+El firmware transmite, con el protocolo binario, tramas TIPO_TELEMETRIA
+cuyo payload es un bloque de muestras empaquetadas de 12 bytes cada una:
+
+    t_ms (u32 LE) | base | brazo | codo | pinza   (u16 LE, décimas de grado)
+
+A 50-200 Hz conviene agrupar varias muestras por trama (hasta 21).
+
+Las muestras se guardan en un buffer circular de NumPy preasignado. Cada
+trama se convierte con una sola vista `np.frombuffer` y se copia en bloque,
+sin crear objetos de Python por muestra. El buffer se escribe dos veces
+(posición `i` e `i + capacidad`), de modo que las últimas N muestras
+siempre forman un bloque contiguo y se pueden leer como vista, sin copiar,
+para graficar o diagnosticar.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import threading
+
+import numpy as np
+
+from hardware import protocolo_binario as pb
+
+ARTICULACIONES = ("base", "brazo", "codo", "pinza")
+DTYPE_MUESTRA = np.dtype([("t_ms", "<u4"), ("angulos", "<u2", (4,))])
+MUESTRAS_POR_TRAMA = pb.MAX_PAYLOAD // DTYPE_MUESTRA.itemsize
+
+
+def codificar_telemetria(t_ms, angulos):
+    """
+    Empaqueta muestras en el payload de una trama TIPO_TELEMETRIA.
+
+    Usado por el simulador y las pruebas (el firmware hace lo mismo en C).
+
+    Args:
+        t_ms (array-like): Marcas de tiempo en milisegundos, forma (N,).
+        angulos (array-like): Ángulos en grados, forma (N, 4).
+
+    Returns:
+        bytes: Payload con N muestras (N <= MUESTRAS_POR_TRAMA).
+    """
+    t_ms = np.asarray(t_ms)
+    muestras = np.empty(len(t_ms), dtype=DTYPE_MUESTRA)
+    muestras["t_ms"] = t_ms
+    muestras["angulos"] = np.rint(np.asarray(angulos) * 10)
+    return muestras.tobytes()
+
+
+class BufferTelemetria:
+    """
+    Buffer circular de capacidad fija para muestras de telemetría.
+
+    Atributos:
+        capacidad (int): Máximo de muestras retenidas.
+        total (int): Muestras recibidas desde la creación (incluye descartadas).
+    """
+
+    def __init__(self, capacidad=200 * 60):
+        """
+        Args:
+            capacidad (int): Muestras retenidas (por defecto 1 minuto a 200 Hz).
+        """
+        self.capacidad = capacidad
+        # Doble longitud: cada muestra se escribe en i e i + capacidad
+        self._tiempos = np.zeros(2 * capacidad, dtype=np.float64)
+        self._angulos = np.zeros((2 * capacidad, 4), dtype=np.float32)
+        self._pos = 0  # Próxima posición de escritura (0 <= pos < capacidad)
+        self._cantidad = 0  # Muestras válidas (<= capacidad)
+        self.total = 0
+        self._bloqueo = threading.Lock()
+
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return self._cantidad
+
+    # ------------------------------------------------------------------
+
+    def agregar(self, t_ms, angulos_decimas):
+        """
+        Copia un bloque de muestras al buffer.
+
+        Args:
+            t_ms (np.ndarray): Tiempos en milisegundos, forma (N,).
+            angulos_decimas (np.ndarray): Ángulos en décimas de grado, (N, 4).
+        """
+        n = len(t_ms)
+        if n > self.capacidad:
+            t_ms = t_ms[-self.capacidad :]
+            angulos_decimas = angulos_decimas[-self.capacidad :]
+            n = self.capacidad
+
+        with self._bloqueo:
+            inicio = 0
+            while inicio < n:
+                pos = self._pos
+                parte = min(n - inicio, self.capacidad - pos)
+                fuente_t = t_ms[inicio : inicio + parte]
+                fuente_q = angulos_decimas[inicio : inicio + parte]
+                for desplazamiento in (pos, pos + self.capacidad):
+                    np.multiply(
+                        fuente_t,
+                        1e-3,
+                        out=self._tiempos[desplazamiento : desplazamiento + parte],
+                    )
+                    np.multiply(
+                        fuente_q,
+                        0.1,
+                        out=self._angulos[desplazamiento : desplazamiento + parte],
+                        casting="unsafe",
+                    )
+                self._pos = (pos + parte) % self.capacidad
+                inicio += parte
+
+            self._cantidad = min(self.capacidad, self._cantidad + n)
+            self.total += n
+
+    # ------------------------------------------------------------------
+
+    def ultimas(self, n=None):
+        """
+        Devuelve las últimas `n` muestras como vistas contiguas (sin copiar).
+
+        Las vistas pueden ser sobrescritas por muestras nuevas; si se van a
+        conservar, usar `.copy()`.
+
+        Args:
+            n (int - None): Cantidad de muestras; None para todas las retenidas.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (tiempos en s (n,), ángulos en
+            grados (n, 4), columnas en el orden de ARTICULACIONES).
+        """
+        with self._bloqueo:
+            n = self._cantidad if n is None else min(n, self._cantidad)
+            fin = self._pos + self.capacidad
+            return self._tiempos[fin - n : fin], self._angulos[fin - n : fin]
+
+    # ------------------------------------------------------------------
+
+    def ultimos_segundos(self, segundos):
+        """
+        Devuelve las muestras de los últimos `segundos` como vistas contiguas.
+
+        Args:
+            segundos (float): Ventana de tiempo, relativa a la última muestra.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Igual que `ultimas`.
+        """
+        tiempos, angulos = self.ultimas()
+        if not len(tiempos):
+            return tiempos, angulos
+        inicio = np.searchsorted(tiempos, tiempos[-1] - segundos, side="left")
+        return tiempos[inicio:], angulos[inicio:]
+
+    # ------------------------------------------------------------------
+
+    def limpiar(self):
+        """Descarta todas las muestras."""
+        with self._bloqueo:
+            self._pos = 0
+            self._cantidad = 0
+
+
+class ReceptorTelemetria:
+    """
+    Decodifica tramas TIPO_TELEMETRIA y las vuelca en un BufferTelemetria.
+
+    Uso:
+        buffer = BufferTelemetria()
+        ReceptorTelemetria(buffer).registrar(detector)  # protocolo binario
+
+    Atributos:
+        tramas (int): Tramas de telemetría procesadas.
+        tramas_invalidas (int): Tramas con largo que no es múltiplo de 12.
+    """
+
+    def __init__(self, buffer):
+        """
+        Args:
+            buffer (BufferTelemetria): Destino de las muestras.
+        """
+        self.buffer = buffer
+        self.tramas = 0
+        self.tramas_invalidas = 0
+
+    # ------------------------------------------------------------------
+
+    def registrar(self, detector):
+        """
+        Registra este receptor como manejador de telemetría del detector.
+
+        Args:
+            detector (ArduinoDetector): Detector en modo binario.
+        """
+        if detector.protocolo != "binario":
+            raise ValueError("La telemetría requiere el protocolo binario")
+        detector.registrar_manejador(pb.TIPO_TELEMETRIA, self.manejar_trama)
+
+    # ------------------------------------------------------------------
+
+    def manejar_trama(self, trama):
+        """Vuelca las muestras de una trama (se ejecuta en el hilo lector)."""
+        if len(trama.payload) % DTYPE_MUESTRA.itemsize:
+            self.tramas_invalidas += 1
+            return
+        muestras = np.frombuffer(trama.payload, dtype=DTYPE_MUESTRA)
+        self.buffer.agregar(muestras["t_ms"], muestras["angulos"])
+        self.tramas += 1
@@ -0,0 +1,423 @@
+"""
+transporte_async.py
+-------------------
+Transporte serial basado en asyncio para comunicarse con el Arduino.
+
+A diferencia de ArduinoDetector (llamadas bloqueantes de PySerial que la GUI
+consulta con `after()`), aquí el puerto se abre en modo no bloqueante y su
+descriptor de archivo se registra en el ciclo de eventos con
+`loop.add_reader`. Así un único ciclo de asyncio maneja la lectura, los
+timeouts y la reconexión:
+
+    transporte = TransporteAsync("/dev/ttyACM0")
+    await transporte.conectar()
+    await transporte.send_routine(1, 3)
+    await transporte.wait_for("Rutina completada", timeout=80)
+
+    async for linea in transporte:
+        print(linea)
+
+En sistemas sin `add_reader` para puertos serie (Windows) se recurre a un
+sondeo asíncrono de `in_waiting`.
+
+`PuenteAsyncTk` ejecuta el ciclo de asyncio en un hilo propio y entrega los
+resultados en el hilo de Tk, sin bloquear `mainloop()`.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+
+import serial
+
+from hardware.arduino_detector import BAUDIOS_BINARIO, BAUDIOS_TEXTO, ArduinoDetector
+from hardware.lector_serial import BufferLineas
+from hardware import protocolo_binario as pb
+
+INTERVALO_SONDEO = 0.005  # Segundos entre lecturas cuando no hay add_reader
+
+
+class TransporteAsync:
+    """
+    Conexión serial asíncrona con el Arduino.
+
+    Atributos:
+        puerto (str - None): Puerto a usar; si es None se detecta con
+            ArduinoDetector en cada intento de conexión.
+        protocolo (str): 'texto' o 'binario'.
+        conectado (bool): True mientras el puerto está abierto.
+    """
+
+    def __init__(
+        self,
+        puerto=None,
+        baudrate=None,
+        protocolo="texto",
+        reconectar=True,
+        espera_reconexion=1.0,
+        max_mensajes=1024,
+    ):
+        """
+        Args:
+            puerto (str - None): Puerto serie; None para autodetectar.
+            baudrate (int - None): Velocidad; por defecto según el protocolo.
+            protocolo (str): 'texto' o 'binario'.
+            reconectar (bool): Reintentar la conexión si el puerto se pierde.
+            espera_reconexion (float): Segundos entre intentos de reconexión.
+            max_mensajes (int): Capacidad de la cola del iterador.
+        """
+        self.puerto = puerto
+        self.protocolo = protocolo
+        self.baudrate = baudrate or (
+            BAUDIOS_BINARIO if protocolo == "binario" else BAUDIOS_TEXTO
+        )
+        self.reconectar = reconectar
+        self.espera_reconexion = espera_reconexion
+        self.conectado = False
+
+        self._conexion = None
+        self._decodificador = None
+        self._mensajes = asyncio.Queue(maxsize=max_mensajes)
+        self._esperas = []  # [(texto, futuro)]
+        self._tarea_sondeo = None
+        self._tarea_reconexion = None
+        self._usa_add_reader = False
+        self._cerrado = False
+        self._secuencia = 0
+        self._loop = None
+
+    # ------------------------------------------------------------------
+
+    async def conectar(self, intentos=1):
+        """
+        Abre el puerto y lo registra en el ciclo de eventos.
+
+        Args:
+            intentos (int - None): Intentos máximos; None para reintentar
+                indefinidamente cada `espera_reconexion` segundos.
+
+        Returns:
+            bool: True si la conexión quedó abierta.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._cerrado = False
+        intento = 0
+        while not self._cerrado:
+            if self._abrir():
+                return True
+            intento += 1
+            if intentos is not None and intento >= intentos:
+                return False
+            await asyncio.sleep(self.espera_reconexion)
+        return False
+
+    # ------------------------------------------------------------------
+
+    def _abrir(self):
+        """Intenta abrir el puerto en modo no bloqueante (timeout=0)."""
+        puerto = self.puerto
+        if puerto is None:
+            detector = ArduinoDetector()
+            if not detector.detectar():
+                return False
+            puerto = detector.obtener_puerto()
+
+        try:
+            self._conexion = serial.Serial(puerto, self.baudrate, timeout=0)
+        except (serial.SerialException, FileNotFoundError, OSError):
+            return False
+
+        if self.protocolo == "binario":
+            self._decodificador = pb.DecodificadorMensajes()
+        else:
+            self._decodificador = BufferLineas()
+
+        try:
+            self._loop.add_reader(self._conexion.fileno(), self._al_leer)
+            self._usa_add_reader = True
+        except (NotImplementedError, AttributeError, ValueError):
+            self._usa_add_reader = False
+            self._tarea_sondeo = self._loop.create_task(self._sondear())
+
+        self.conectado = True
+        print(f"Transporte asíncrono conectado en {puerto}")
+        return True
+
+    # ------------------------------------------------------------------
+
+    def _al_leer(self):
+        """Callback de add_reader: hay bytes disponibles en el descriptor."""
+        try:
+            datos = self._conexion.read(self._conexion.in_waiting or 1)
+        except (serial.SerialException, OSError, TypeError) as e:
+            self._perder_conexion(e)
+            return
+
+        if datos:
+            for mensaje in self._decodificador.alimentar(datos):
+                self._distribuir(mensaje)
+
+    # ------------------------------------------------------------------
+
+    async def _sondear(self):
+        """Alternativa a add_reader: revisa in_waiting periódicamente."""
+        while self.conectado:
+            try:
+                pendientes = self._conexion.in_waiting
+            except (serial.SerialException, OSError, TypeError) as e:
+                self._perder_conexion(e)
+                return
+            if pendientes:
+                self._al_leer()
+            await asyncio.sleep(INTERVALO_SONDEO)
+
+    # ------------------------------------------------------------------
+
+    def _distribuir(self, mensaje):
+        """Entrega un mensaje a las esperas pendientes y a la cola."""
+        for espera in list(self._esperas):
+            texto, futuro = espera
+            if not futuro.done() and (texto is None or mensaje == texto):
+                futuro.set_result(mensaje)
+                self._esperas.remove(espera)
+
+        if self._mensajes.full():
+            self._mensajes.get_nowait()  # Descarta el más antiguo
+        self._mensajes.put_nowait(mensaje)
+
+    # ------------------------------------------------------------------
+
+    def _liberar_puerto(self):
+        """Quita el puerto del ciclo de eventos y lo cierra."""
+        if self._conexion is not None:
+            if self._usa_add_reader:
+                try:
+                    self._loop.remove_reader(self._conexion.fileno())
+                except (ValueError, OSError):
+                    pass
+            try:
+                self._conexion.close()
+            except Exception:
+                pass
+        if self._tarea_sondeo is not None:
+            self._tarea_sondeo.cancel()
+            self._tarea_sondeo = None
+        self._conexion = None
+        self.conectado = False
+
+    # ------------------------------------------------------------------
+
+    def _perder_conexion(self, error):
+        """Maneja la pérdida del puerto y, si corresponde, agenda reconexión."""
+        print(f"Transporte asíncrono: conexión perdida ({error})")
+        self._liberar_puerto()
+
+        for _, futuro in self._esperas:
+            if not futuro.done():
+                futuro.set_exception(ConnectionError("Conexión con Arduino perdida"))
+        self._esperas.clear()
+
+        if self.reconectar and not self._cerrado and self._tarea_reconexion is None:
+            self._tarea_reconexion = self._loop.create_task(self._reconectar())
+
+    # ------------------------------------------------------------------
+
+    async def _reconectar(self):
+        try:
+            await self.conectar(intentos=None)
+        finally:
+            self._tarea_reconexion = None
+
+    # ------------------------------------------------------------------
+
+    async def escribir(self, datos):
+        """
+        Escribe bytes en el puerto.
+
+        Raises:
+            ConnectionError: Si no hay conexión abierta.
+        """
+        if not self.conectado:
+            raise ConnectionError("No existe conexion activa con un Arduino")
+        try:
+            self._conexion.write(datos)
+        except (serial.SerialException, OSError) as e:
+            self._perder_conexion(e)
+            raise ConnectionError(f"Error al enviar datos: {e}") from e
+
+    # ------------------------------------------------------------------
+
+    async def enviar_rutina(self, rutina, repeticiones):
+        """
+        Envía un comando de rutina al Arduino.
+
+        Args:
+            rutina (int): Número de rutina (0 = detener).
+            repeticiones (int): Cantidad de repeticiones.
+        """
+        if self.protocolo == "binario":
+            datos = pb.codificar_trama(
+                pb.TIPO_RUTINA,
+                self._secuencia,
+                bytes((rutina & 0xFF, repeticiones & 0xFF)),
+            )
+            self._secuencia = (self._secuencia + 1) & 0xFF
+        else:
+            datos = f"{rutina},{repeticiones}\n".encode("utf-8")
+        await self.escribir(datos)
+
+    send_routine = enviar_rutina
+
+    # ------------------------------------------------------------------
+
+    async def esperar(self, texto=None, timeout=None):
+        """
+        Espera hasta recibir un mensaje.
+
+        Args:
+            texto (str - None): Mensaje exacto esperado; None acepta cualquiera.
+            timeout (float - None): Segundos máximos de espera.
+
+        Returns:
+            str: El mensaje recibido.
+
+        Raises:
+            asyncio.TimeoutError: Si vence el timeout.
+            ConnectionError: Si la conexión se pierde mientras se espera.
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        espera = (texto, futuro)
+        self._esperas.append(espera)
+        try:
+            return await asyncio.wait_for(futuro, timeout)
+        finally:
+            if espera in self._esperas:
+                self._esperas.remove(espera)
+
+    wait_for = esperar
+
+    # ------------------------------------------------------------------
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Devuelve la siguiente línea recibida; termina al cerrar."""
+        if self._cerrado and self._mensajes.empty():
+            raise StopAsyncIteration
+        mensaje = await self._mensajes.get()
+        if mensaje is None:
+            raise StopAsyncIteration
+        return mensaje
+
+    # ------------------------------------------------------------------
+
+    async def cerrar(self):
+        """Cierra el puerto, cancela la reconexión y termina el iterador."""
+        self._cerrado = True
+        if self._tarea_reconexion is not None:
+            self._tarea_reconexion.cancel()
+            self._tarea_reconexion = None
+        self._liberar_puerto()
+        for _, futuro in self._esperas:
+            futuro.cancel()
+        self._esperas.clear()
+        if self._mensajes.full():
+            self._mensajes.get_nowait()
+        self._mensajes.put_nowait(None)  # Marca de fin para el iterador
+
+
+class PuenteAsyncTk:
+    """
+    Ejecuta un ciclo de asyncio en un hilo propio, junto al mainloop de Tk.
+
+    Las corrutinas se envían al ciclo con `ejecutar`; cuando terminan, el
+    callback se invoca en el hilo de Tk (vía `after`), por lo que puede
+    modificar widgets con seguridad.
+
+        puente = PuenteAsyncTk(ventana)
+        puente.ejecutar(transporte.wait_for("Rutina completada", 80),
+                        al_terminar=lambda resultado, error: ...)
+    """
+
+    def __init__(self, widget, intervalo_ms=10):
+        """
+        Args:
+            widget: Cualquier widget de Tk (se usa su método `after`).
+            intervalo_ms (int): Frecuencia con que Tk revisa resultados.
+        """
+        self.widget = widget
+        self.intervalo_ms = intervalo_ms
+        self.loop = asyncio.new_event_loop()
+        self._pendientes = []  # [(futuro, callback)]
+        self._after_id = None
+        self._hilo = threading.Thread(
+            target=self.loop.run_forever, name="PuenteAsyncTk", daemon=True
+        )
+        self._hilo.start()
+
+    # ------------------------------------------------------------------
+
+    def ejecutar(self, corrutina, al_terminar=None):
+        """
+        Programa una corrutina en el ciclo de asyncio.
+
+        Args:
+            corrutina: Corrutina a ejecutar.
+            al_terminar (callable - None): Función `(resultado, error)`
+                llamada en el hilo de Tk al finalizar.
+
+        Returns:
+            concurrent.futures.Future: Futuro de la corrutina.
+        """
+        futuro = asyncio.run_coroutine_threadsafe(corrutina, self.loop)
+        if al_terminar is not None:
+            self._pendientes.append((futuro, al_terminar))
+            if self._after_id is None:
+                self._after_id = self.widget.after(self.intervalo_ms, self._revisar)
+        return futuro
+
+    # ------------------------------------------------------------------
+
+    def _revisar(self):
+        """Entrega en el hilo de Tk los resultados de corrutinas terminadas."""
+        self._after_id = None
+        pendientes = []
+        for futuro, callback in self._pendientes:
+            if not futuro.done():
+                pendientes.append((futuro, callback))
+                continue
+            try:
+                resultado, error = futuro.result(), None
+            except (Exception, concurrent.futures.CancelledError) as e:
+                resultado, error = None, e
+            callback(resultado, error)
+
+        self._pendientes = pendientes
+        if pendientes:
+            self._after_id = self.widget.after(self.intervalo_ms, self._revisar)
+
+    # ------------------------------------------------------------------
+
+    def detener(self):
+        """Detiene el ciclo de asyncio y cancela la revisión periódica."""
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._hilo.join(1.0)
@@ -0,0 +1,229 @@
+"""
+headless.py
+-----------
+
+Ejecución de rutinas del brazo robótico desde la línea de comandos, sin GUI.
+
+Pensado para corridas desatendidas de producción y para el controlador de
+celda: reutiliza ArduinoDetector, no importa CustomTkinter, OpenCV ni
+matplotlib, y reporta el resultado mediante el código de salida.
+
+Uso:
+
+    python headless.py 1:3            # Rutina 1, 3 repeticiones
+    python headless.py 1:3 4:1 2:2    # Varias rutinas en secuencia
+    python headless.py --puerto /dev/ttyACM0 --timeout 60 --json 2:1
+
+Códigos de salida:
+    0   Todas las rutinas se completaron.
+    2   Argumentos inválidos.
+    3   No se encontró o no se pudo abrir el Arduino.
+    4   Error al enviar un comando.
+    5   Timeout: el Arduino no respondió a tiempo.
+    6   El Arduino informó que la rutina fue detenida.
+    130 Interrumpido por el usuario (se envía la orden de detención).
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+from hardware.arduino_detector import TIMEOUT_LISTO, ArduinoDetector
+
+SALIDA_OK = 0
+SALIDA_ARGUMENTOS = 2
+SALIDA_SIN_ARDUINO = 3
+SALIDA_ERROR_ENVIO = 4
+SALIDA_TIMEOUT = 5
+SALIDA_DETENIDA = 6
+SALIDA_INTERRUMPIDA = 130
+
+
+def leer_rutina(texto):
+    """
+    Convierte 'rutina:repeticiones' (o 'rutina,repeticiones') en una tupla.
+
+    Si se omiten las repeticiones se usa 1.
+    """
+    partes = texto.replace(",", ":").split(":")
+    try:
+        rutina = int(partes[0])
+        repeticiones = int(partes[1]) if len(partes) > 1 else 1
+    except (ValueError, IndexError):
+        raise argparse.ArgumentTypeError(f"Rutina inválida: {texto!r}")
+    if not 1 <= rutina <= 255 or not 0 <= repeticiones <= 255:
+        raise argparse.ArgumentTypeError(f"Rutina fuera de rango: {texto!r}")
+    return rutina, repeticiones
+
+
+def conectar(args):
+    """
+    Detecta y abre el Arduino, esperando el saludo del firmware.
+
+    Returns:
+        ArduinoDetector | None: Detector conectado, o None si no fue posible.
+    """
+    detector = ArduinoDetector(protocolo=args.protocolo, puerto=args.puerto)
+    limite = time.monotonic() + args.timeout_conexion
+
+    while True:
+        if detector.detectar() and detector.conectar(
+            esperar_listo=True, timeout_listo=args.timeout_listo
+        ):
+            return detector
+        if time.monotonic() >= limite:
+            return None
+        time.sleep(0.5)
+
+
+def ejecutar_rutina(detector, rutina, repeticiones, timeout):
+    """
+    Envía una rutina y espera su finalización.
+
+    Returns:
+        int: Código de salida correspondiente al resultado.
+    """
+    detector.limpiar_buffer()
+    if not detector.enviar_rutina(rutina, repeticiones):
+        return SALIDA_ERROR_ENVIO
+
+    limite = time.monotonic() + timeout
+    while True:
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            return SALIDA_TIMEOUT
+
+        respuesta = detector.leer_respuesta(timeout=min(restante, 0.5))
+        if respuesta == "Rutina completada":
+            return SALIDA_OK
+        if respuesta == "Rutina detenida":
+            return SALIDA_DETENIDA
+        if respuesta is None and not detector.esta_conectado():
+            return SALIDA_ERROR_ENVIO
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ejecuta rutinas del brazo robótico sin interfaz gráfica."
+    )
+    parser.add_argument(
+        "rutinas",
+        nargs="+",
+        type=leer_rutina,
+        metavar="RUTINA[:REPETICIONES]",
+        help="Rutinas a ejecutar en orden, p. ej. 1:3 2:1",
+    )
+    parser.add_argument(
+        "--puerto",
+        default=os.environ.get("BRAZO_PUERTO") or None,
+        help="Puerto serie (por defecto se autodetecta o se usa BRAZO_PUERTO)",
+    )
+    parser.add_argument("--protocolo", choices=("texto", "binario"), default="texto")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=80.0,
+        help="Segundos máximos por rutina (por defecto 80, como en la GUI)",
+    )
+    parser.add_argument(
+        "--timeout-conexion",
+        type=float,
+        default=10.0,
+        help="Segundos máximos para encontrar y abrir el Arduino",
+    )
+    parser.add_argument("--timeout-listo", type=float, default=TIMEOUT_LISTO)
+    parser.add_argument(
+        "--pausa", type=float, default=0.0, help="Segundos de pausa entre rutinas"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Imprime el resultado como JSON"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Muestra mensajes del detector"
+    )
+    args = parser.parse_args(argv)
+
+    # Los mensajes de depuración del detector solo se muestran con --verbose
+    depuracion = sys.stderr if args.verbose else io.StringIO()
+    resultados = []
+    codigo = SALIDA_OK
+    inicio = time.monotonic()
+    detector = None
+
+    try:
+        with contextlib.redirect_stdout(depuracion):
+            detector = conectar(args)
+        if detector is None:
+            codigo = SALIDA_SIN_ARDUINO
+        else:
+            for indice, (rutina, repeticiones) in enumerate(args.rutinas):
+                if indice and args.pausa:
+                    time.sleep(args.pausa)
+                comienzo = time.monotonic()
+                with contextlib.redirect_stdout(depuracion):
+                    codigo = ejecutar_rutina(
+                        detector, rutina, repeticiones, args.timeout
+                    )
+                resultados.append(
+                    {
+                        "rutina": rutina,
+                        "repeticiones": repeticiones,
+                        "codigo": codigo,
+                        "segundos": round(time.monotonic() - comienzo, 3),
+                    }
+                )
+                if not args.json:
+                    print(
+                        f"Rutina {rutina} x{repeticiones}: "
+                        f"{'completada' if codigo == SALIDA_OK else f'error {codigo}'} "
+                        f"({resultados[-1]['segundos']} s)"
+                    )
+                if codigo != SALIDA_OK:
+                    break
+
+    except KeyboardInterrupt:
+        codigo = SALIDA_INTERRUMPIDA
+        if detector is not None:
+            with contextlib.redirect_stdout(depuracion):
+                detector.enviar_rutina(0, 0)  # rutina 0 = detener
+
+    finally:
+        if detector is not None:
+            with contextlib.redirect_stdout(depuracion):
+                detector.cerrar()
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "codigo": codigo,
+                    "puerto": detector.obtener_puerto() if detector else None,
+                    "segundos": round(time.monotonic() - inicio, 3),
+                    "rutinas": resultados,
+                }
+            )
+        )
+    elif codigo == SALIDA_SIN_ARDUINO:
+        print("No se encontró un Arduino conectado.", file=sys.stderr)
+
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,7 +36,12 @@ from PIL import Image, ImageTk
 import cv2
 from hardware.arduino_detector import ArduinoDetector
 import serial
-import time
+
+# Los mensajes del Arduino los recibe el hilo lector del detector. Su
+# callback genera este evento virtual y el hilo de Tk vacía la cola una vez
+# por evento, en lugar de consultarla periódicamente.
+EVENTO_MENSAJE = "<<MensajeArduino>>"
+TIMEOUT_RUTINA_S = 80  # Segundos máximos de espera de "Rutina completada"
 
 
 class ModoAutomatico(ctk.CTkToplevel):
@@ -66,7 +71,14 @@ class ModoAutomatico(ctk.CTkToplevel):
         # Estado interno
         self.revisando_conexion = False  # Control de reconexión automática
         self.rutina_activa = False  # True cuando Arduino ejecuta una rutina
-        self.primera_ejecucion = True  # Delay especial de 4s solo la primera vez
+        self.rutina_str = None  # Nombre de la rutina en ejecución
+        self.deteniendo = False  # Se pidió detener: confirmar con un aviso
+        self.timeout_id = None
+
+        # Aviso de mensajes desde el hilo lector (se restaura en destroy)
+        self.bind(EVENTO_MENSAJE, self.procesar_mensajes)
+        self._callback_anterior = detector.callback_mensajes
+        detector.callback_mensajes = self._avisar_mensaje
 
         # ------------------------------
         # Configuración general de la ventana
@@ -257,72 +269,15 @@ class ModoAutomatico(ctk.CTkToplevel):
                 return
             print("Comando enviado correctamente.")
 
-            # Control de timeout
-            tiempo_inicio = time.time()
-            timeout_segundos = 80
-
-            def revisar_respuesta():
-                """Revisa periódicamente si Arduino ya terminó la rutina."""
-                if not self.rutina_activa:
-                    return
-
-                try:
-                    respuesta = self.detector.leer_respuesta()
-                except Exception as e:
-                    self.rutina_activa = False
-                    print("ERROR: Comunicación con Arduino falló:", e)
-                    mbox.showerror(
-                        "Error de comunicación",
-                        f"No se pudo leer la respuesta de Arduino.\nDetalle: {e}",
-                        parent=self,
-                    )
-                    self.boton_ejecutar.configure(state="normal")
-                    return
-
-                tiempo_transcurrido = time.time() - tiempo_inicio
-
-                # Caso: rutina completada
-                if respuesta == "Rutina completada":
-                    self.rutina_activa = False
-                    print(f"{rutina_str} completada por Arduino.")
-                    mbox.showinfo(
-                        "Rutina completada",
-                        f"Las repeticiones de {rutina_str} han sido completadas.",
-                        parent=self,
-                    )
-                    self.boton_ejecutar.configure(state="normal")
-                    return
-
-                elif respuesta == "Rutina detenida":
-                    self.rutina_activa = False
-                    print("Arduino confirma detención de la rutina.")
-                    self.boton_ejecutar.configure(state="normal")
-                    return
-
-                # Caso: timeout
-                elif tiempo_transcurrido > timeout_segundos:
-                    self.rutina_activa = False
-                    print("ERROR: Timeout. Arduino no respondió a tiempo.")
-                    mbox.showinfo(
-                        "Timeout", "ERROR: Arduino no respondió a tiempo.", parent=self
-                    )
-                    self.boton_ejecutar.configure(state="normal")
-
-                # Continuar revisando si aún no hay respuesta
-                else:
-                    self.after(100, revisar_respuesta)
-
-            # Iniciar monitoreo de respuesta
+            # Iniciar monitoreo de respuesta: llega con EVENTO_MENSAJE
             self.rutina_activa = True
-            self.after(100, revisar_respuesta)
+            self.rutina_str = rutina_str
+            self.deteniendo = False
+            self.timeout_id = self.after(TIMEOUT_RUTINA_S * 1000, self._vencer_rutina)
 
-        # Pequeño delay la primera vez para estabilidad
-        if self.primera_ejecucion:
-            self.primera_ejecucion = False
-            print("Primera ejecución: esperando 4 segundos antes de enviar")
-            self.after(4000, enviar_comando)
-        else:
-            enviar_comando()
+        # Si el Arduino aún no terminó de reiniciarse, el detector encola el
+        # comando y lo envía en cuanto el firmware confirma estar listo.
+        enviar_comando()
 
     def detener_rutina(self):
         """Envía un comando de detención (rutina 0) al Arduino."""
@@ -336,22 +291,84 @@ class ModoAutomatico(ctk.CTkToplevel):
             return
 
         print("Comando de detención enviado correctamente.")
+        # La confirmación "Rutina detenida" llega con EVENTO_MENSAJE
+        self.deteniendo = True
 
-        def revisar_detencion():
-            """Espera confirmación de Arduino de que la rutina se detuvo."""
-            respuesta = self.detector.leer_respuesta()
-            if respuesta == "Rutina detenida":
-                print("Arduino confirma detención de la rutina.")
+    # ------------------------------
+    # Mensajes del Arduino
+    # ------------------------------
+    def _avisar_mensaje(self, mensaje):
+        """Callback del hilo lector: avisa al hilo de Tk (no toca widgets)."""
+        if self._callback_anterior is not None:
+            self._callback_anterior(mensaje)
+        try:
+            self.event_generate(EVENTO_MENSAJE, when="tail")
+        except (RuntimeError, tk.TclError):
+            pass  # Ventana cerrada
+
+    def procesar_mensajes(self, event=None):
+        """
+        Atiende todos los mensajes pendientes del Arduino (hilo de Tk).
+
+        Varios mensajes seguidos pueden generar un solo evento, por eso se
+        vacía la cola completa en cada llamada.
+        """
+        while True:
+            try:
+                respuesta = self.detector.leer_respuesta()
+            except Exception as e:
+                if self.rutina_activa:
+                    self._terminar_rutina()
+                    print("ERROR: Comunicación con Arduino falló:", e)
+                    mbox.showerror(
+                        "Error de comunicación",
+                        f"No se pudo leer la respuesta de Arduino.\nDetalle: {e}",
+                        parent=self,
+                    )
+                return
+
+            if respuesta is None:
+                return
+
+            # Caso: rutina completada
+            if respuesta == "Rutina completada" and self.rutina_activa:
+                rutina_str = self.rutina_str
+                self._terminar_rutina()
+                print(f"{rutina_str} completada por Arduino.")
                 mbox.showinfo(
-                    "Rutina detenida",
-                    "La rutina fue detenida correctamente por el Arduino.",
+                    "Rutina completada",
+                    f"Las repeticiones de {rutina_str} han sido completadas.",
                     parent=self,
                 )
-                self.boton_ejecutar.configure(state="normal")
-            else:
-                self.after(100, revisar_detencion)
 
-        revisar_detencion()
+            elif respuesta == "Rutina detenida":
+                deteniendo = self.deteniendo
+                self._terminar_rutina()
+                print("Arduino confirma detención de la rutina.")
+                if deteniendo:
+                    mbox.showinfo(
+                        "Rutina detenida",
+                        "La rutina fue detenida correctamente por el Arduino.",
+                        parent=self,
+                    )
+
+    def _vencer_rutina(self):
+        """Timeout: el Arduino no informó el fin de la rutina a tiempo."""
+        self.timeout_id = None
+        if not self.rutina_activa:
+            return
+        self._terminar_rutina()
+        print("ERROR: Timeout. Arduino no respondió a tiempo.")
+        mbox.showinfo("Timeout", "ERROR: Arduino no respondió a tiempo.", parent=self)
+
+    def _terminar_rutina(self):
+        """Marca la rutina como terminada y habilita el botón ejecutar."""
+        self.rutina_activa = False
+        self.deteniendo = False
+        if self.timeout_id is not None:
+            self.after_cancel(self.timeout_id)
+            self.timeout_id = None
+        self.boton_ejecutar.configure(state="normal")
 
     # ------------------------------
     # Widgets
@@ -542,6 +559,12 @@ class ModoAutomatico(ctk.CTkToplevel):
 
         self.destroy()
 
+    def destroy(self):
+        """Deja de recibir los mensajes del detector antes de destruir la ventana."""
+        if self.detector.callback_mensajes == self._avisar_mensaje:
+            self.detector.callback_mensajes = self._callback_anterior
+        super().destroy()
+
 
 if __name__ == "__main__":
     root = ctk.CTk()
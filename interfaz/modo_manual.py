@@ -1,33 +1,282 @@
+import time
 import tkinter as tk
+from tkinter import filedialog
 import customtkinter as ctk
 import numpy as np
-import matplotlib
 
-matplotlib.use("TkAgg")
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from mpl_toolkits.mplot3d import Axes3D
-import matplotlib.pyplot as plt
+from cinematica.cadena_dh import cargar_cadena_brazo
+from cinematica.espacio_trabajo import cargar_espacio_trabajo
+from cinematica.inversa import resolver
+from cinematica.trayectorias import PERFILES, generar_trayectoria
+from cinematica.validacion import primera_violacion
+from hardware.emisor_setpoints import FRECUENCIA_DEFECTO, EmisorSetpoints
+from hardware.grabacion import EXTENSION, GrabadorSesion, ReproductorSesion
+
+INTERVALO_LATENCIA_MS = 500  # Refresco de la etiqueta de latencia
+PRESUPUESTO_CUADRO_MS = 16  # ~60 cuadros por segundo como máximo
+ESPERA_CALIDAD_MS = 150  # Inactividad antes del dibujo en calidad completa
+FRECUENCIA_ANIMACION = 50  # Setpoints por segundo de la vista previa
+
+# Texto de cada motivo de cinematica/validacion.py
+MENSAJES_VIOLACION = {
+    "limites": "sale de los límites de los servos",
+    "suelo": "choca con la mesa",
+    "base": "choca con la base",
+}
+
+
+# ------------------------------
+#   Planificador de redibujos
+# ------------------------------
+class PlanificadorRender:
+    """
+    Agrupa las solicitudes de redibujo en, como máximo, un dibujo por cuadro.
+
+    CTkSlider llama a su comando en cada evento de movimiento del mouse. En
+    lugar de dibujar en cada uno, `solicitar()` solo marca la vista como
+    desactualizada. El dibujo se hace con `after_idle` (cuando Tk ya atendió
+    los eventos de entrada pendientes) y nunca antes de que pase el
+    presupuesto de un cuadro desde el dibujo anterior. La función de dibujo
+    lee el estado actual de los sliders, de modo que los estados intermedios
+    se descartan.
+
+    Si un dibujo tarda más que el presupuesto, el siguiente espera al menos
+    ese tiempo, para que la interfaz siga respondiendo aunque el dibujo sea
+    lento.
+
+    Calidad adaptativa (si se indica `fijar_calidad`): el planificador mide
+    el costo de los dibujos en calidad completa (promedio móvil). Si supera
+    el presupuesto, mientras lleguen solicitudes se dibuja en calidad de
+    borrador, y cuando pasan `espera_calidad_ms` sin solicitudes se hace un
+    único dibujo en calidad completa. En un equipo rápido nunca se baja la
+    calidad.
+
+    Atributos:
+        solicitudes (int): Llamadas a `solicitar()`.
+        dibujados (int): Cuadros efectivamente dibujados.
+        omitidos (int): Solicitudes absorbidas por un dibujo posterior.
+        dibujos_borrador (int): Cuadros dibujados en calidad de borrador.
+        costo_completo (float | None): Segundos promedio de un dibujo en
+            calidad completa (None hasta medir el primero).
+    """
+
+    def __init__(
+        self,
+        widget,
+        dibujar,
+        presupuesto_ms=PRESUPUESTO_CUADRO_MS,
+        fijar_calidad=None,
+        espera_calidad_ms=ESPERA_CALIDAD_MS,
+    ):
+        """
+        Args:
+            widget (tk.Misc): Widget cuyo ciclo de eventos se usa.
+            dibujar (callable): Función sin argumentos que dibuja la vista.
+            presupuesto_ms (float): Tiempo mínimo entre dos dibujos.
+            fijar_calidad (callable - None): `fijar_calidad(borrador)` del
+                renderizador; None desactiva la calidad adaptativa.
+            espera_calidad_ms (float): Inactividad tras la cual se vuelve a
+                la calidad completa.
+        """
+        self.widget = widget
+        self.dibujar = dibujar
+        self.presupuesto = presupuesto_ms / 1000
+        self.fijar_calidad = fijar_calidad
+        self.espera_calidad = espera_calidad_ms / 1000
+        self.solicitudes = 0
+        self.dibujados = 0
+        self.omitidos = 0
+        self.dibujos_borrador = 0
+        self.costo_completo = None
+        self.borrador = False
+
+        self._sucio = False
+        self._after_id = None
+        self._ultimo_inicio = float("-inf")
+        self._ultima_duracion = 0.0
+        self._duraciones = []
+        self._ultima_solicitud = float("-inf")
+        self._calidad_id = None
+
+    # ------------------------------------------------------------------
+
+    def solicitar(self):
+        """Marca la vista como desactualizada y programa un dibujo."""
+        self.solicitudes += 1
+        self._ultima_solicitud = time.perf_counter()
+        if self.fijar_calidad is not None:
+            self._ajustar_calidad()
+        if self._sucio:
+            self.omitidos += 1
+            return
+        self._sucio = True
+        if self._after_id is None:
+            self._programar()
+
+    def _ajustar_calidad(self):
+        """Pasa a borrador si el dibujo completo no entra en el presupuesto."""
+        if (
+            not self.borrador
+            and self.costo_completo is not None
+            and self.costo_completo > self.presupuesto
+        ):
+            self.borrador = True
+            self.fijar_calidad(True)
+        if self.borrador and self._calidad_id is None:
+            self._calidad_id = self.widget.after(
+                round(self.espera_calidad * 1000), self._restaurar_calidad
+            )
+
+    def _restaurar_calidad(self):
+        """Tras la espera sin solicitudes, un dibujo en calidad completa."""
+        self._calidad_id = None
+        restante = self._ultima_solicitud + self.espera_calidad - time.perf_counter()
+        if restante > 0:
+            # Siguen llegando solicitudes: un solo temporizador, reprogramado
+            self._calidad_id = self.widget.after(
+                max(1, round(restante * 1000)), self._restaurar_calidad
+            )
+            return
+        self.borrador = False
+        self.fijar_calidad(False)
+        if not self._sucio:
+            self._sucio = True
+            if self._after_id is None:
+                self._programar()
+
+    def _programar(self):
+        espera = max(self.presupuesto, self._ultima_duracion)
+        restante = self._ultimo_inicio + espera - time.perf_counter()
+        if restante > 0:
+            self._after_id = self.widget.after(
+                max(1, round(restante * 1000)), self._esperar_inactividad
+            )
+        else:
+            self._esperar_inactividad()
+
+    def _esperar_inactividad(self):
+        self._after_id = self.widget.after_idle(self._ejecutar)
+
+    def _ejecutar(self):
+        self._after_id = None
+        if not self._sucio:
+            return
+        self._sucio = False
+
+        inicio = time.perf_counter()
+        try:
+            self.dibujar()
+        finally:
+            self._ultimo_inicio = inicio
+            self._ultima_duracion = time.perf_counter() - inicio
+            self._duraciones.append(self._ultima_duracion)
+            del self._duraciones[:-500]
+            self.dibujados += 1
+            if self.borrador:
+                self.dibujos_borrador += 1
+            elif self.costo_completo is None:
+                self.costo_completo = self._ultima_duracion
+            else:
+                self.costo_completo += 0.3 * (self._ultima_duracion - self.costo_completo)
+
+        # Solicitudes que llegaron durante el dibujo
+        if self._sucio:
+            self._programar()
+
+    # ------------------------------------------------------------------
+
+    def cancelar(self):
+        """Cancela el dibujo pendiente (al cerrar la ventana)."""
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._calidad_id is not None:
+            try:
+                self.widget.after_cancel(self._calidad_id)
+            except Exception:
+                pass
+            self._calidad_id = None
+        self._sucio = False
+
+    # ------------------------------------------------------------------
+
+    def estadisticas(self):
+        """
+        Returns:
+            dict: Solicitudes, cuadros dibujados y omitidos, y tiempos de
+            dibujo en ms (p50, p95, máximo) de los últimos 500 cuadros.
+        """
+        duraciones = sorted(self._duraciones)
+
+        def ms(fraccion):
+            if not duraciones:
+                return None
+            indice = min(len(duraciones) - 1, round(fraccion * (len(duraciones) - 1)))
+            return round(duraciones[indice] * 1000, 2)
+
+        return {
+            "solicitudes": self.solicitudes,
+            "dibujados": self.dibujados,
+            "omitidos": self.omitidos,
+            "dibujos_borrador": self.dibujos_borrador,
+            "costo_completo_ms": (
+                None if self.costo_completo is None else round(self.costo_completo * 1000, 2)
+            ),
+            "dibujo_p50_ms": ms(0.50),
+            "dibujo_p95_ms": ms(0.95),
+            "dibujo_max_ms": ms(1.0),
+        }
 
 
 # ------------------------------
 #     Clase modo automatico
 # ------------------------------
 class ModoManual(ctk.CTkToplevel):
-    def __init__(self, parent, volver_callback=None):
+    def __init__(
+        self,
+        parent,
+        detector=None,
+        volver_callback=None,
+        frecuencia_setpoints=FRECUENCIA_DEFECTO,
+        renderizador="matplotlib",
+        cadena=None,
+    ):
         """
+        La geometría se lee de config/brazo.json (cinematica/cadena_dh.py):
         L1: altura base, simbolico por que en realida es la base
         L2: longitud primer segmento
         L3: longitud segundo segmento
         largo_pinza: longitud visual de la pinza
+
+        detector: ArduinoDetector al que se envían las posiciones de los
+            sliders (None solo dibuja el diagrama)
+        frecuencia_setpoints: envíos por segundo como máximo al arrastrar
+        renderizador: 'matplotlib' (ejes 3D completos), 'hilo' (matplotlib
+            en un hilo de trabajo; ver render_hilo.py) o 'canvas' (tk.Canvas
+            nativo, sin cargar matplotlib; ver render_canvas.py)
+        cadena: CadenaDH ya cargada con `cargar_cadena_brazo`, para que quien
+            abre la ventana informe una configuración inválida antes de
+            ocultar la suya (None la carga aquí)
         """
-        self.L1 = 3
-        self.L2 = 5
-        self.L3 = 5
-        self.largo_pinza = 4
+        self.cadena = cadena if cadena is not None else cargar_cadena_brazo(tablas=True)
+        self.L1, self.L2, self.L3 = self.cadena.longitudes_brazo()
+        self.largo_pinza = self.cadena.largo_pinza
 
         super().__init__(parent)
         self.parent = parent
+        self.detector = detector
         self.volver_callback = volver_callback
+        self.frecuencia_setpoints = frecuencia_setpoints
+        self.renderizador = renderizador
+        self.fig = None
+        self.emisor = None
+        self.after_id = None
+        self.animacion_id = None
+        self.grabador = None
+        self.reproductor = None
 
         self.title("Modo Manual")
         self.state("zoomed")
@@ -104,27 +353,45 @@ class ModoManual(ctk.CTkToplevel):
         )
         boton_volver.grid(row=0, column=1, sticky="e")
 
+        # Latencia slider -> servo (solo con Arduino conectado)
+        self.label_latencia = ctk.CTkLabel(
+            self.frame_inferior, text="", font=("Arial", 14)
+        )
+        self.label_latencia.grid(row=0, column=0, sticky="w")
+
         # Crea el grafico y los botones sliders
         self.crear_sliders()
         self.crear_grafico()
+        self.iniciar_emisor()
+        self.liberada = False  # Ver destroy
 
     # ------------------------------
     #   Crea los botones slider
     # ------------------------------
     def crear_sliders(self):
-        self.slider_vals = {
-            "base": ctk.DoubleVar(value=90),
-            "brazo": ctk.DoubleVar(value=120),
-            "codo": ctk.DoubleVar(value=90),
-            "pinza": ctk.DoubleVar(value=60),
-        }
+        # Límites de config/brazo.json; la posición inicial se ajusta a ellos
+        iniciales = {"base": 90, "brazo": 120, "codo": 90, "pinza": 60}
+        colores = {"base": "red", "brazo": "green", "codo": "orange", "pinza": "blue"}
+
+        self.slider_vals = {}
+        controles = []
+        for nombre, (mn, mx) in self.cadena.limites.items():
+            self.slider_vals[nombre] = ctk.DoubleVar(
+                value=min(max(iniciales.get(nombre, mn), mn), mx)
+            )
+            controles.append(
+                (
+                    f"{nombre.capitalize()} ({mn:g}–{mx:g}°)",
+                    nombre,
+                    mn,
+                    mx,
+                    colores.get(nombre, "gray"),
+                )
+            )
 
-        controles = [
-            ("Base (70–180°)", "base", 70, 180, "red"),
-            ("Brazo (110–180°)", "brazo", 110, 180, "green"),
-            ("Codo (90–135°)", "codo", 90, 135, "orange"),
-            ("Pinza (0–180°)", "pinza", 0, 180, "blue"),
-        ]
+        self.limites = {varname: (mn, mx) for _, varname, mn, mx, _ in controles}
+        # Última pose de los sliders que pasó la validación (ver mover_slider)
+        self.pose_valida = {nombre: var.get() for nombre, var in self.slider_vals.items()}
 
         for i, control in enumerate(controles):
             if len(control) == 5:
@@ -145,12 +412,419 @@ class ModoManual(ctk.CTkToplevel):
                 from_=mn,
                 to=mx,
                 variable=self.slider_vals[varname],
-                command=self.actualizar_grafico,
+                command=lambda valor, nombre=varname: self.mover_slider(nombre, valor),
                 progress_color=color,
                 button_color=color,
             )
             slider.grid(row=i * 2 + 1, column=0, padx=10, pady=(0, 10), sticky="ew")
 
+        self.switch_espacio = ctk.CTkSwitch(
+            self.frame_scroll_control,
+            text="Mostrar espacio de trabajo",
+            command=self.alternar_espacio_trabajo,
+        )
+        self.switch_espacio.grid(
+            row=len(controles) * 2, column=0, padx=10, pady=10, sticky="w"
+        )
+
+        self.crear_objetivo(fila=len(controles) * 2 + 1)
+
+    # ------------------------------
+    #   Objetivo cartesiano (cinemática inversa)
+    # ------------------------------
+    def crear_objetivo(self, fila):
+        """
+        Campos X, Y, Z para llevar la pinza a un punto.
+
+        También se puede hacer doble clic en el diagrama: el punto se toma
+        sobre el plano horizontal de la altura Z indicada.
+        """
+        frame_objetivo = ctk.CTkFrame(self.frame_scroll_control, fg_color="transparent")
+        frame_objetivo.grid(row=fila, column=0, padx=10, pady=(10, 0), sticky="ew")
+
+        self.entradas_objetivo = {}
+        for columna, eje in enumerate("XYZ"):
+            ctk.CTkLabel(frame_objetivo, text=eje, font=("Arial", 16)).grid(
+                row=0, column=2 * columna, padx=(0, 4)
+            )
+            entrada = ctk.CTkEntry(frame_objetivo, width=60)
+            entrada.grid(row=0, column=2 * columna + 1, padx=(0, 8))
+            entrada.bind("<Return>", lambda event: self.ir_a_objetivo())
+            self.entradas_objetivo[eje] = entrada
+
+        ctk.CTkButton(
+            frame_objetivo, text="Ir al punto", width=90, command=self.ir_a_objetivo
+        ).grid(row=0, column=6)
+
+        # Perfil del movimiento animado hacia el punto
+        self.perfil_animacion = ctk.StringVar(value="quintico")
+        ctk.CTkOptionMenu(
+            frame_objetivo, values=list(PERFILES), variable=self.perfil_animacion, width=120
+        ).grid(row=1, column=0, columnspan=7, pady=(6, 0), sticky="w")
+
+        self.label_objetivo = ctk.CTkLabel(
+            self.frame_scroll_control,
+            text="Doble clic en el diagrama: punto a la altura Z",
+            font=("Arial", 13),
+        )
+        self.label_objetivo.grid(row=fila + 1, column=0, padx=10, sticky="w")
+
+        self.crear_grabacion(fila=fila + 2)
+
+    # ------------------------------
+    #   Grabación y reproducción de sesiones
+    # ------------------------------
+    def crear_grabacion(self, fila):
+        """Botones para grabar los movimientos de los sliders y reproducirlos."""
+        frame_grabacion = ctk.CTkFrame(self.frame_scroll_control, fg_color="transparent")
+        frame_grabacion.grid(row=fila, column=0, padx=10, pady=10, sticky="w")
+
+        self.boton_grabar = ctk.CTkButton(
+            frame_grabacion, text="⏺ Grabar", width=120, command=self.alternar_grabacion
+        )
+        self.boton_grabar.grid(row=0, column=0, padx=(0, 10))
+
+        ctk.CTkButton(
+            frame_grabacion,
+            text="▶ Reproducir",
+            width=120,
+            command=self.reproducir_sesion,
+        ).grid(row=0, column=1)
+
+    def alternar_grabacion(self):
+        """Inicia o detiene la grabación de la sesión en un archivo .brz."""
+        if self.grabador is not None:
+            self.detener_grabacion()
+            return
+
+        ruta = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=EXTENSION,
+            filetypes=[("Sesiones del brazo", f"*{EXTENSION}")],
+            initialfile=time.strftime(f"sesion_%Y%m%d_%H%M%S{EXTENSION}"),
+        )
+        if not ruta:
+            return
+        self.grabador = GrabadorSesion(ruta, frecuencia=1000 / PRESUPUESTO_CUADRO_MS)
+        self.grabador.iniciar()
+        self.grabar_muestra()  # Posición inicial
+        self.boton_grabar.configure(text="⏹ Detener grabación")
+
+    def grabar_muestra(self):
+        """Agrega la posición actual de los sliders a la grabación."""
+        if self.grabador is not None:
+            self.grabador.agregar([var.get() for var in self.slider_vals.values()])
+
+    def detener_grabacion(self):
+        if self.grabador is None:
+            return
+        self.grabador.detener()
+        print(f"Sesión grabada: {self.grabador.ruta} ({self.grabador.muestras} muestras)")
+        self.grabador = None
+        self.boton_grabar.configure(text="⏺ Grabar")
+
+    def reproducir_sesion(self):
+        """Reproduce una sesión grabada en el diagrama y, si hay conexión, en el brazo."""
+        ruta = filedialog.askopenfilename(
+            parent=self, filetypes=[("Sesiones del brazo", f"*{EXTENSION}")]
+        )
+        if not ruta:
+            return
+        try:
+            reproductor = ReproductorSesion(ruta)
+        except (OSError, ValueError) as e:
+            self.label_objetivo.configure(text=f"No se pudo abrir la sesión: {e}")
+            return
+        if not len(reproductor):
+            self.label_objetivo.configure(text="La sesión está vacía")
+            return
+
+        angulos = reproductor.muestras["angulos"] * 0.1
+        if not self.validar_movimiento(angulos, reproductor.muestras["t"]):
+            reproductor.cerrar()
+            return
+
+        self.detener_animacion()
+        self.detener_grabacion()
+        self.reproductor = reproductor
+        self.label_objetivo.configure(
+            text=f"Reproduciendo {len(reproductor)} muestras ({reproductor.duracion:.1f} s)"
+        )
+        self._paso_reproduccion(time.perf_counter())
+
+    def _paso_reproduccion(self, inicio):
+        """Muestra la muestra correspondiente al tiempo transcurrido."""
+        reproductor = self.reproductor
+        transcurrido = time.perf_counter() - inicio
+        indice = reproductor.indice_en(transcurrido)
+        self.aplicar_pose(reproductor.angulos(indice))
+
+        if transcurrido < reproductor.duracion:
+            self.animacion_id = self.after(
+                PRESUPUESTO_CUADRO_MS, lambda: self._paso_reproduccion(inicio)
+            )
+        else:
+            self.animacion_id = None
+            self.cerrar_reproductor()
+            self.label_objetivo.configure(text="Reproducción terminada")
+
+    def cerrar_reproductor(self):
+        """Libera el archivo (memmap) de la sesión en reproducción, si hay una."""
+        if self.reproductor is not None:
+            self.reproductor.cerrar()
+            self.reproductor = None
+
+    def mostrar_objetivo(self, x, y, z):
+        """Escribe un punto en los campos X, Y, Z."""
+        for eje, valor in zip("XYZ", (x, y, z)):
+            entrada = self.entradas_objetivo[eje]
+            entrada.delete(0, "end")
+            entrada.insert(0, f"{valor:.2f}")
+
+    def ir_a_objetivo(self):
+        """Resuelve la cinemática inversa del punto indicado y mueve los sliders."""
+        try:
+            x, y, z = (float(self.entradas_objetivo[eje].get()) for eje in "XYZ")
+        except ValueError:
+            self.label_objetivo.configure(text="Coordenadas inválidas")
+            return
+
+        actual = [self.slider_vals[nombre].get() for nombre in ("base", "brazo", "codo")]
+        solucion = resolver(
+            x,
+            y,
+            z,
+            (self.L1, self.L2, self.L3),
+            limites=tuple(self.limites[nombre] for nombre in ("base", "brazo", "codo")),
+            referencia=actual,
+        )
+        if solucion is None:
+            self.label_objetivo.configure(text="Punto fuera del alcance del brazo")
+            return
+
+        self.label_objetivo.configure(
+            text="Base {:.0f}°, brazo {:.0f}°, codo {:.0f}°".format(*solucion)
+        )
+        self.animar_hacia(solucion + (self.slider_vals["pinza"].get(),))
+
+    # ------------------------------
+    #   Animación de vista previa
+    # ------------------------------
+    def animar_hacia(self, destino):
+        """
+        Mueve los sliders hacia `destino` siguiendo una trayectoria.
+
+        La trayectoria (cinematica/trayectorias.py) se genera completa de
+        una vez; cada cuadro toma el setpoint correspondiente al tiempo
+        transcurrido, de modo que un redibujo lento salta muestras en lugar
+        de atrasar el movimiento. Los mismos setpoints se envían al Arduino.
+
+        Args:
+            destino (tuple): (base, brazo, codo, pinza) en grados.
+        """
+        self.detener_animacion()
+        actual = [self.slider_vals[nombre].get() for nombre in self.slider_vals]
+        trayectoria = generar_trayectoria(
+            [actual, destino],
+            frecuencia=FRECUENCIA_ANIMACION,
+            perfil=self.perfil_animacion.get(),
+        )
+        # La pose de partida es donde ya está el brazo: se valida el resto
+        if not self.validar_movimiento(trayectoria.angulos[1:], trayectoria.tiempos[1:]):
+            return
+        self._paso_animacion(trayectoria, time.perf_counter())
+
+    def _paso_animacion(self, trayectoria, inicio):
+        transcurrido = time.perf_counter() - inicio
+        indice = min(
+            int(trayectoria.tiempos.searchsorted(transcurrido)),
+            len(trayectoria.tiempos) - 1,
+        )
+        self.aplicar_pose(trayectoria.angulos[indice])
+
+        if indice < len(trayectoria.tiempos) - 1:
+            self.animacion_id = self.after(
+                round(1000 / FRECUENCIA_ANIMACION),
+                lambda: self._paso_animacion(trayectoria, inicio),
+            )
+        else:
+            self.animacion_id = None
+
+    def validar_movimiento(self, angulos, tiempos):
+        """
+        Revisa límites, suelo y columna de la base antes de mover el brazo
+        (cinematica/validacion.py).
+
+        Args:
+            angulos (np.ndarray): Poses (N, 4) en grados.
+            tiempos (np.ndarray): Segundos de cada pose desde el inicio del
+                movimiento, para el mensaje.
+
+        Returns:
+            bool: True si todas las poses son válidas; si no, se informa
+            la primera en `label_objetivo`.
+        """
+        violacion = self._primera_violacion(angulos)
+        if violacion is None:
+            return True
+        segundo = float(tiempos[violacion.indice])
+        self.label_objetivo.configure(
+            text=(
+                f"Movimiento cancelado: {MENSAJES_VIOLACION[violacion.motivo]} "
+                f"(t = {segundo:.2f} s)"
+            )
+        )
+        return False
+
+    def _primera_violacion(self, angulos):
+        """primera_violacion con la geometría y los límites de esta ventana."""
+        return primera_violacion(
+            angulos,
+            longitudes=(self.L1, self.L2, self.L3),
+            limites=tuple(self.limites[nombre] for nombre in self.slider_vals),
+        )
+
+    def aplicar_pose(self, angulos):
+        """Lleva los sliders a una pose, la envía al Arduino y pide redibujo."""
+        for (nombre, variable), valor in zip(self.slider_vals.items(), angulos):
+            valor = float(valor)
+            variable.set(valor)
+            self.pose_valida[nombre] = valor  # Trayectoria ya validada
+            if self.emisor is not None:
+                self.emisor.actualizar(nombre, valor)
+        self.planificador.solicitar()
+
+    def detener_animacion(self):
+        """
+        Cancela la animación o reproducción en curso (p. ej. si el operador
+        toma un slider).
+        """
+        if self.animacion_id is not None:
+            try:
+                self.after_cancel(self.animacion_id)
+            except Exception:
+                pass
+            self.animacion_id = None
+        self.cerrar_reproductor()
+
+    def al_hacer_clic(self, x_pantalla, y_pantalla):
+        """Doble clic en el diagrama: objetivo sobre el plano de altura Z."""
+        try:
+            z = float(self.entradas_objetivo["Z"].get())
+        except ValueError:
+            # Sin Z indicada: la altura actual de la pinza
+            z = self.cinematicas_3d(
+                *(self.slider_vals[n].get() for n in ("base", "brazo", "codo"))
+            )[2][-1]
+        punto = self.render.punto_en_plano_z(x_pantalla, y_pantalla, z)
+        if punto is None:
+            return
+        self.mostrar_objetivo(*punto)
+        self.ir_a_objetivo()
+
+    # ------------------------------
+    #   Espacio de trabajo
+    # ------------------------------
+    def alternar_espacio_trabajo(self):
+        """
+        Muestra u oculta la envolvente de los puntos alcanzables por la pinza.
+
+        El mapa se calcula con los límites de los sliders y la geometría
+        actual, y queda en caché en disco (cinematica/espacio_trabajo.py).
+        """
+        if not self.switch_espacio.get():
+            self.render.ocultar_nube()
+            return
+        espacio = cargar_espacio_trabajo(
+            (self.L1, self.L2, self.L3),
+            tuple(self.limites[nombre] for nombre in ("base", "brazo", "codo")),
+        )
+        self.render.mostrar_nube(espacio.centros_frontera())
+
+    # ------------------------------
+    #   Envío de posiciones al Arduino
+    # ------------------------------
+    def iniciar_emisor(self):
+        """
+        Arranca el envío de setpoints si hay un Arduino que los acepte.
+
+        El emisor conserva solo el último valor de cada slider y lo envía a
+        frecuencia fija, por lo que arrastrar no satura el puerto serie.
+
+        Solo se arranca si el firmware anunció en el saludo que acepta
+        setpoints (`acepta_setpoints`); el sketch de rutinas no los entiende.
+        Mientras no sea así se informa en la etiqueta inferior y se vuelve a
+        revisar, por si el saludo todavía no terminó.
+        """
+        self.after_id = None
+        if self.detector is None:
+            return
+        if not getattr(self.detector, "acepta_setpoints", False):
+            listo = getattr(self.detector, "listo", None)
+            if not self.detector.esta_conectado() or (listo is not None and not listo.is_set()):
+                texto = "Envío al brazo: esperando al Arduino…"
+            else:
+                texto = "Envío en tiempo real no disponible: el firmware no acepta setpoints"
+            self.label_latencia.configure(text=texto)
+            self.after_id = self.after(INTERVALO_LATENCIA_MS, self.iniciar_emisor)
+            return
+        self.label_latencia.configure(text="")
+        valores = {nombre: var.get() for nombre, var in self.slider_vals.items()}
+        self.emisor = EmisorSetpoints(
+            self.detector, frecuencia=self.frecuencia_setpoints, valores=valores
+        )
+        self.emisor.iniciar()
+        self.actualizar_latencia()
+
+    def mover_slider(self, nombre, valor):
+        """
+        Callback de los sliders: valida la pose, la encola y pide un redibujo.
+
+        Los límites de los sliders no bastan (p. ej. brazo 180° con codo
+        135° lleva la pinza bajo la mesa): si la pose nueva no pasa la
+        validación, el slider vuelve al último valor válido y no se envía
+        nada, de modo que al arrastrar se detiene en el borde permitido.
+        """
+        self.detener_animacion()
+        pose = dict(self.pose_valida, **{nombre: float(valor)})
+        violacion = self._primera_violacion([pose[n] for n in self.slider_vals])
+        if violacion is not None:
+            self.slider_vals[nombre].set(self.pose_valida[nombre])
+            self.label_objetivo.configure(
+                text=f"Posición rechazada: {MENSAJES_VIOLACION[violacion.motivo]}"
+            )
+            return
+        self.pose_valida[nombre] = float(valor)
+        if self.emisor is not None:
+            self.emisor.actualizar(nombre, valor)
+        self.planificador.solicitar()
+
+    def actualizar_latencia(self):
+        """Muestra periódicamente la latencia slider -> servo medida."""
+        estadisticas = self.emisor.estadisticas()
+        if estadisticas["latencia_p50_ms"] is not None:
+            self.label_latencia.configure(
+                text=(
+                    f"Latencia slider → servo: "
+                    f"p50 {estadisticas['latencia_p50_ms']:.1f} ms · "
+                    f"p95 {estadisticas['latencia_p95_ms']:.1f} ms"
+                )
+            )
+        self.after_id = self.after(INTERVALO_LATENCIA_MS, self.actualizar_latencia)
+
+    def detener_emisor(self):
+        """Detiene el envío de setpoints e informa la latencia medida."""
+        if self.after_id:
+            try:
+                self.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+        if self.emisor is not None:
+            self.emisor.detener()
+            print(f"Setpoints del modo manual: {self.emisor.estadisticas()}")
+            self.emisor = None
+
     # ------------------------------
     def cinematicas_3d(self, angulo_base, angulo_brazo, angulo_codo):
         """
@@ -158,40 +832,49 @@ class ModoManual(ctk.CTkToplevel):
         angulo_base: rotación horizontal (°)
         angulo_brazo: elevación primer segmento (°)
         angulo_codo: ángulo del segundo segmento (°)
+
+        Usa la cadena DH de la configuración con tablas de sin/cos
+        (cinematica/cadena_dh.py); para lotes de poses usar
+        `self.cadena.posiciones`.
         """
-        angulo_base_radianes = np.radians(angulo_base)
-        angulo_brazo_radianes = np.radians(angulo_brazo)
-        angulo_codo_radianes = np.radians(angulo_codo)
-
-        # Base vertical
-        x0, y0, z0 = 0, 0, 0
-        x1, y1, z1 = 0, 0, self.L1
-
-        # Primer segmento brazo
-        x2 = x1 + self.L2 * np.cos(angulo_brazo_radianes) * np.cos(angulo_base_radianes)
-        y2 = y1 + self.L2 * np.cos(angulo_brazo_radianes) * np.sin(angulo_base_radianes)
-        z2 = z1 + self.L2 * np.sin(angulo_brazo_radianes)
-
-        # Segundo segmento codo
-        x3 = x2 + self.L3 * np.cos(
-            angulo_brazo_radianes + angulo_codo_radianes
-        ) * np.cos(angulo_base_radianes)
-        y3 = y2 + self.L3 * np.cos(
-            angulo_brazo_radianes + angulo_codo_radianes
-        ) * np.sin(angulo_base_radianes)
-        z3 = z2 + self.L3 * np.sin(angulo_brazo_radianes + angulo_codo_radianes)
-
-        return (x0, x1, x2, x3), (y0, y1, y2, y3), (z0, z1, z2, z3)
+        return self.cadena.esqueleto(angulo_base, angulo_brazo, angulo_codo)
 
     # ------------------------------
     #   Crea el grafico
     # ------------------------------
     def crear_grafico(self):
-        self.fig = plt.Figure(figsize=(6, 6))
-        self.ax = self.fig.add_subplot(111, projection="3d")
-
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame_diagrama)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Los renderizadores se importan aquí: con 'canvas' no se carga
+        # matplotlib, que es la mayor parte del tiempo de apertura
+        if self.renderizador == "canvas":
+            from interfaz.render_canvas import RenderCanvas
+
+            self.render = RenderCanvas(self.frame_diagrama)
+        elif self.renderizador == "hilo":
+            # Matplotlib dibuja en un hilo aparte; Tk solo muestra los cuadros
+            from interfaz.render_hilo import RenderBrazoHilo
+
+            self.render = RenderBrazoHilo(self.frame_diagrama)
+        else:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from matplotlib.figure import Figure
+
+            from interfaz.render_matplotlib import RenderBrazo
+
+            self.fig = Figure(figsize=(6, 6))
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame_diagrama)
+            self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+            # Ejes y líneas se crean una sola vez; cada actualización solo
+            # mueve las líneas y redibuja el área de los ejes
+            # (ver render_matplotlib.py)
+            self.render = RenderBrazo(self.fig, self.canvas)
+            self.ax = self.render.ax
+        # Con dibujos lentos, borrador mientras se arrastra y calidad
+        # completa al soltar (ver PlanificadorRender)
+        self.planificador = PlanificadorRender(
+            self, self.actualizar_grafico, fijar_calidad=self.render.fijar_calidad
+        )
+        self.render.conectar_doble_clic(self.al_hacer_clic)
 
         self.actualizar_grafico()
 
@@ -206,34 +889,16 @@ class ModoManual(ctk.CTkToplevel):
         ang_pinza = self.slider_vals["pinza"].get()
 
         xs, ys, zs = self.cinematicas_3d(ang_base, ang_brazo, ang_codo)
+        self.render.actualizar(xs, ys, zs, ang_pinza)
 
-        self.ax.clear()
-        self.ax.set_xlim(-10, 10)
-        self.ax.set_ylim(-10, 10)
-        self.ax.set_zlim(0, 15)
-        self.ax.set_title("Brazo Robótico 3D")
-
-        # Segmentos
-        self.ax.plot(xs[0:2], ys[0:2], zs[0:2], color="red", linewidth=3)
-        self.ax.plot(xs[1:3], ys[1:3], zs[1:3], color="green", linewidth=3)
-        self.ax.plot(xs[2:4], ys[2:4], zs[2:4], color="orange", lw=3, marker="o")
-
-        # PINZA
-        x_end, y_end, z_end = xs[-1], ys[-1], zs[-1]
-        l_pinza = 1.0
-        thp = np.radians(ang_pinza)
+        # Se graba lo que se dibuja: como mucho una muestra por cuadro
+        if self.grabador is not None:
+            self.grabador.agregar((ang_base, ang_brazo, ang_codo, ang_pinza))
 
-        x_p1 = x_end + l_pinza * np.sin(thp / 2)
-        x_p2 = x_end - l_pinza * np.sin(thp / 2)
-
-        self.ax.plot(
-            [x_end, x_p1], [y_end, y_end], [z_end, z_end], color="blue", linewidth=2
-        )
-        self.ax.plot(
-            [x_end, x_p2], [y_end, y_end], [z_end, z_end], color="blue", linewidth=2
-        )
-
-        self.canvas.draw()
+    def detener_planificador(self):
+        """Cancela el redibujo pendiente e informa sus estadísticas."""
+        self.planificador.cancelar()
+        print(f"Redibujos del modo manual: {self.planificador.estadisticas()}")
 
     # ------------------------------
     def volver_al_menu(self):
@@ -242,22 +907,33 @@ class ModoManual(ctk.CTkToplevel):
         self.destroy()
 
     def cerrar_completamente(self):
-        if hasattr(self, "after_id") and self.after_id:
-            try:
-                self.after_cancel(self.after_id)
-            except Exception:
-                pass
-
-        try:
-            plt.close(self.fig)
-        except Exception:
-            pass
-
         if self.volver_callback:
             self.volver_callback()
 
         self.destroy()
 
+    def destroy(self):
+        """
+        Libera los recursos de la ventana por cualquier salida (botón
+        volver, cierre de la ventana o destrucción de la ventana padre):
+        animación o reproducción en curso (y su archivo), grabación (se
+        escribe lo pendiente y se cierra el archivo), emisor, redibujos
+        pendientes y el renderizador (con 'hilo', su hilo de trabajo y su
+        figura).
+        """
+        # Si __init__ no llegó a crear el estado, no hay nada que liberar
+        if not getattr(self, "liberada", True):
+            self.liberada = True
+            self.detener_animacion()
+            self.detener_grabacion()
+            self.detener_emisor()
+            self.detener_planificador()
+            try:
+                self.render.desconectar()
+            except Exception:
+                pass
+        super().destroy()
+
 
 # ------------------------------
 # Para prueba local
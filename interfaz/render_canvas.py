@@ -0,0 +1,345 @@
+"""
+render_canvas.py
+----------------
+Renderizador liviano del esqueleto 3D sobre un `tk.Canvas` nativo.
+
+Alternativa a render_matplotlib.py para equipos de pocos recursos: no crea
+Figure, FigureCanvasTkAgg ni ejes mplot3d (la ventana abre casi al
+instante) y cada actualización solo mueve las líneas existentes con
+`coords()`; Tk redibuja únicamente esos ítems.
+
+La proyección (ortográfica o en perspectiva) se expresa como una matriz
+homogénea P de 3x4: un punto p = (x, y, z, 1) aparece en la pantalla en
+(u, v) = (P0·p / P2·p, P1·p / P2·p). La misma matriz permite invertir un
+clic sobre un plano horizontal.
+
+En calidad de borrador (`fijar_calidad(True)`, ver PlanificadorRender) se
+oculta la nube del espacio de trabajo: con miles de ítems, Tk la recorre
+en cada redibujo de la zona que cambió.
+
+Controles: arrastrar con el botón izquierdo orbita la cámara y la rueda del
+mouse acerca o aleja.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import math
+import tkinter as tk
+
+import numpy as np
+
+from interfaz.render_matplotlib import (
+    COLOR_PINZA,
+    ESTILO_SEGMENTOS,
+    LIMITES,
+    puntos_pinza,
+)
+
+AZIMUT_INICIAL = -60.0  # Grados; mismos valores iniciales que mplot3d
+ELEVACION_INICIAL = 30.0
+DISTANCIA_CAMARA = 40.0  # Unidades del brazo; solo en perspectiva
+GRADOS_POR_PIXEL = 0.4  # Sensibilidad de la órbita
+FACTOR_ZOOM = 1.1  # Por paso de la rueda
+DIVISIONES_GRILLA = 4
+MAX_PUNTOS_NUBE = 4000  # Cada punto es un ítem del canvas
+
+
+class RenderCanvas:
+    """
+    Esqueleto 3D dibujado con ítems de un tk.Canvas.
+
+    Ofrece la misma interfaz que RenderBrazo (actualizar, fijar_calidad,
+    mostrar_nube, ocultar_nube, punto_en_plano_z, conectar_doble_clic,
+    desconectar).
+
+    Atributos:
+        widget (tk.Canvas): Canvas donde se dibuja.
+        perspectiva (bool): True para proyección en perspectiva.
+        azimut, elevacion (float): Orientación de la cámara en grados.
+        zoom (float): Factor de acercamiento.
+    """
+
+    def __init__(self, master, limites=LIMITES, perspectiva=True, fondo="white"):
+        """
+        Args:
+            master (tk.Misc): Contenedor del canvas.
+            limites (tuple): ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+            perspectiva (bool): Proyección en perspectiva u ortográfica.
+            fondo (str): Color de fondo del canvas.
+        """
+        self.widget = tk.Canvas(master, background=fondo, highlightthickness=0)
+        self.widget.pack(fill="both", expand=True)
+        self.limites = limites
+        self.perspectiva = perspectiva
+        self.azimut = AZIMUT_INICIAL
+        self.elevacion = ELEVACION_INICIAL
+        self.zoom = 1.0
+        self.centro = np.array([sum(par) / 2 for par in limites], dtype=np.float64)
+        self.extension = max(hi - lo for lo, hi in limites)
+
+        self._matriz = None
+        self._ultimo_esqueleto = None  # Para reproyectar al orbitar
+        self._nube = None
+        self._items_nube = []
+        self.borrador = False
+        self._arrastre = None
+
+        self._crear_escena()
+        self.widget.bind("<Configure>", lambda event: self._reproyectar())
+        self.widget.bind("<ButtonPress-1>", self._al_presionar)
+        self.widget.bind("<B1-Motion>", self._al_arrastrar)
+        self.widget.bind("<MouseWheel>", self._al_rodar)  # Windows / macOS
+        self.widget.bind("<Button-4>", lambda event: self._acercar(FACTOR_ZOOM))
+        self.widget.bind("<Button-5>", lambda event: self._acercar(1 / FACTOR_ZOOM))
+
+    # ------------------------------------------------------------------
+
+    def _crear_escena(self):
+        """Crea una sola vez todos los ítems; luego solo cambian sus coordenadas."""
+        (x0, x1), (y0, y1), (z0, _) = self.limites
+        segmentos = []
+        for i in range(DIVISIONES_GRILLA + 1):
+            x = x0 + (x1 - x0) * i / DIVISIONES_GRILLA
+            y = y0 + (y1 - y0) * i / DIVISIONES_GRILLA
+            segmentos.append(((x, y0, z0), (x, y1, z0)))
+            segmentos.append(((x0, y, z0), (x1, y, z0)))
+        self._grilla = np.array(segmentos, dtype=np.float64)  # (G, 2, 3)
+        self._items_grilla = [
+            self.widget.create_line(0, 0, 0, 0, fill="#d0d0d0") for _ in segmentos
+        ]
+
+        # Ejes desde el origen: x rojo, y verde, z azul (tenues)
+        self._ejes = np.array(
+            [((0, 0, 0), (3, 0, 0)), ((0, 0, 0), (0, 3, 0)), ((0, 0, 0), (0, 0, 3))],
+            dtype=np.float64,
+        )
+        self._items_ejes = [
+            self.widget.create_line(0, 0, 0, 0, fill=color, dash=(2, 2))
+            for color in ("#e08080", "#80c080", "#8080e0")
+        ]
+
+        self._items_segmentos = [
+            self.widget.create_line(0, 0, 0, 0, fill=color, width=ancho, capstyle="round")
+            for color, ancho, _ in ESTILO_SEGMENTOS
+        ]
+        self._item_codo = self.widget.create_oval(0, 0, 0, 0, fill="orange", outline="")
+        self._items_pinza = [
+            self.widget.create_line(0, 0, 0, 0, fill=COLOR_PINZA, width=2)
+            for _ in range(2)
+        ]
+
+    # ------------------------------------------------------------------
+    #   Proyección
+    # ------------------------------------------------------------------
+
+    def _calcular_matriz(self):
+        """Arma la matriz de proyección 3x4 según la cámara y el tamaño actual."""
+        ancho = max(self.widget.winfo_width(), 2)
+        alto = max(self.widget.winfo_height(), 2)
+        cx, cy = ancho / 2, alto / 2
+        escala = self.zoom * min(ancho, alto) / (1.3 * self.extension)
+
+        az, el = math.radians(self.azimut), math.radians(self.elevacion)
+        derecha = np.array([-math.sin(az), math.cos(az), 0.0])
+        arriba = np.array(
+            [-math.sin(el) * math.cos(az), -math.sin(el) * math.sin(az), math.cos(el)]
+        )
+        hacia_camara = np.array(
+            [math.cos(el) * math.cos(az), math.cos(el) * math.sin(az), math.sin(el)]
+        )
+
+        def fila(vector):
+            # Coordenada de cámara relativa al centro de la escena
+            return np.append(vector, -vector @ self.centro)
+
+        unidad = np.array([0.0, 0.0, 0.0, 1.0])
+        if self.perspectiva:
+            d = DISTANCIA_CAMARA
+            homogenea = d * unidad - fila(hacia_camara)
+            self._matriz = np.array(
+                [
+                    cx * homogenea + escala * d * fila(derecha),
+                    cy * homogenea - escala * d * fila(arriba),
+                    homogenea,
+                ]
+            )
+        else:
+            self._matriz = np.array(
+                [
+                    cx * unidad + escala * fila(derecha),
+                    cy * unidad - escala * fila(arriba),
+                    unidad,
+                ]
+            )
+
+    def proyectar(self, puntos):
+        """
+        Proyecta puntos 3D a píxeles del canvas.
+
+        Args:
+            puntos (np.ndarray): Forma (..., 3).
+
+        Returns:
+            np.ndarray: Forma (..., 2).
+        """
+        puntos = np.asarray(puntos, dtype=np.float64)
+        h = puntos @ self._matriz[:, :3].T + self._matriz[:, 3]
+        return h[..., :2] / h[..., 2:3]
+
+    def _proyectar_escalar(self, x, y, z):
+        """Proyección de un punto sin crear arreglos (ruta de cada cuadro)."""
+        m = self._matriz
+        w = m[2, 0] * x + m[2, 1] * y + m[2, 2] * z + m[2, 3]
+        return (
+            (m[0, 0] * x + m[0, 1] * y + m[0, 2] * z + m[0, 3]) / w,
+            (m[1, 0] * x + m[1, 1] * y + m[1, 2] * z + m[1, 3]) / w,
+        )
+
+    # ------------------------------------------------------------------
+
+    def punto_en_plano_z(self, x_pantalla, y_pantalla, z):
+        """
+        Proyección inversa de un clic sobre el plano horizontal de altura z.
+
+        Args:
+            x_pantalla, y_pantalla (float): Píxeles del canvas.
+            z (float): Altura del plano.
+
+        Returns:
+            tuple | None: (x, y, z), o None si el plano se ve de canto.
+        """
+        if self._matriz is None:
+            return None
+        m = self._matriz
+        filas = np.array([x_pantalla * m[2] - m[0], y_pantalla * m[2] - m[1]])
+        coeficientes = filas[:, :2]
+        if abs(np.linalg.det(coeficientes)) < 1e-12:
+            return None
+        x, y = np.linalg.solve(coeficientes, -(filas[:, 2] * z + filas[:, 3]))
+        return float(x), float(y), float(z)
+
+    # ------------------------------------------------------------------
+    #   Dibujo
+    # ------------------------------------------------------------------
+
+    def actualizar(self, xs, ys, zs, angulo_pinza):
+        """
+        Mueve el brazo a una nueva posición (misma firma que RenderBrazo).
+
+        Args:
+            xs, ys, zs (sequence): Los 4 puntos del esqueleto.
+            angulo_pinza (float): Apertura de la pinza en grados.
+        """
+        self._ultimo_esqueleto = (xs, ys, zs, angulo_pinza)
+        if self._matriz is None:
+            self._calcular_matriz()
+
+        pantalla = [self._proyectar_escalar(*p) for p in zip(xs, ys, zs)]
+        for i, item in enumerate(self._items_segmentos):
+            self.widget.coords(item, *pantalla[i], *pantalla[i + 1])
+
+        u, v = pantalla[2]
+        self.widget.coords(self._item_codo, u - 4, v - 4, u + 4, v + 4)
+
+        extremo = (xs[-1], ys[-1], zs[-1])
+        for item, punta in zip(self._items_pinza, puntos_pinza(*extremo, angulo_pinza)):
+            self.widget.coords(item, *pantalla[3], *self._proyectar_escalar(*punta))
+
+    def _reproyectar(self):
+        """Recalcula todo tras un cambio de cámara o de tamaño."""
+        self._calcular_matriz()
+        for coleccion, items in ((self._grilla, self._items_grilla), (self._ejes, self._items_ejes)):
+            for item, (a, b) in zip(items, self.proyectar(coleccion)):
+                self.widget.coords(item, *a, *b)
+        if self._nube is not None and not self.borrador:
+            for item, (u, v) in zip(self._items_nube, self.proyectar(self._nube)):
+                self.widget.coords(item, u, v, u + 1, v + 1)
+        if self._ultimo_esqueleto is not None:
+            self.actualizar(*self._ultimo_esqueleto)
+
+    # ------------------------------------------------------------------
+
+    def fijar_calidad(self, borrador):
+        """
+        Cambia entre calidad completa y de borrador (sin nube).
+
+        Args:
+            borrador (bool): True para la versión simplificada.
+        """
+        if borrador == self.borrador:
+            return
+        self.borrador = borrador
+        if not borrador and self._nube is not None:
+            # La nube no se reproyectó mientras estuvo oculta
+            self._reproyectar()
+        self.widget.itemconfigure("nube", state="hidden" if borrador else "normal")
+
+    # ------------------------------------------------------------------
+
+    def mostrar_nube(self, puntos, color="#b0b0b0"):
+        """Dibuja una nube de puntos estática (debajo del brazo)."""
+        self.ocultar_nube()
+        puntos = np.asarray(puntos, dtype=np.float64)
+        paso = -(-len(puntos) // MAX_PUNTOS_NUBE)  # División hacia arriba
+        self._nube = puntos[:: max(paso, 1)]
+        if self._matriz is None:
+            self._calcular_matriz()
+        self._items_nube = [
+            self.widget.create_rectangle(
+                u, v, u + 1, v + 1, outline=color, tags="nube",
+                state="hidden" if self.borrador else "normal",
+            )
+            for u, v in self.proyectar(self._nube)
+        ]
+        primer_item = self._items_segmentos[0]
+        for item in self._items_nube:
+            self.widget.tag_lower(item, primer_item)
+
+    def ocultar_nube(self):
+        """Quita la nube de puntos, si hay una."""
+        if self._items_nube:
+            self.widget.delete(*self._items_nube)
+        self._items_nube = []
+        self._nube = None
+
+    # ------------------------------------------------------------------
+    #   Interacción
+    # ------------------------------------------------------------------
+
+    def conectar_doble_clic(self, callback):
+        """Llama a `callback(x, y)` (píxeles del canvas) en cada doble clic."""
+        self.widget.bind("<Double-Button-1>", lambda event: callback(event.x, event.y))
+
+    def _al_presionar(self, event):
+        self._arrastre = (event.x, event.y)
+
+    def _al_arrastrar(self, event):
+        if self._arrastre is None:
+            return
+        dx, dy = event.x - self._arrastre[0], event.y - self._arrastre[1]
+        self._arrastre = (event.x, event.y)
+        self.azimut -= dx * GRADOS_POR_PIXEL
+        self.elevacion = max(-89.0, min(89.0, self.elevacion + dy * GRADOS_POR_PIXEL))
+        self._reproyectar()
+
+    def _al_rodar(self, event):
+        self._acercar(FACTOR_ZOOM if event.delta > 0 else 1 / FACTOR_ZOOM)
+
+    def _acercar(self, factor):
+        self.zoom = max(0.2, min(10.0, self.zoom * factor))
+        self._reproyectar()
+
+    # ------------------------------------------------------------------
+
+    def desconectar(self):
+        """Sin recursos externos que liberar (igual interfaz que RenderBrazo)."""
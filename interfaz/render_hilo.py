@@ -0,0 +1,365 @@
+"""
+render_hilo.py
+--------------
+Dibujo del esqueleto 3D en un hilo de trabajo, fuera del hilo de Tk.
+
+Aun con blitting (render_matplotlib.py), cada dibujo completo de matplotlib
+(primer cuadro, cambio de tamaño, rotación de la cámara) rasteriza en el
+hilo de Tk y congela los sliders mientras dura. Aquí:
+
+- `TrabajadorRender` es un hilo dueño de su propia figura Agg (sin Tk) con
+  un RenderBrazo. Solo guarda la última pose solicitada: si llegan varias
+  mientras dibuja, las intermedias se descartan sin dibujarse.
+- Cada cuadro terminado (RGBA) se entrega con un número de generación. Si
+  el hilo de Tk todavía no mostró el anterior, ese queda obsoleto y se
+  descarta.
+- `RenderBrazoHilo` es la parte de Tk: pide los cuadros, y al recibir el evento
+  <<CuadroListo>> copia el último a una PhotoImage reutilizada (Pillow).
+  `actualizar()` solo guarda la pose y avisa al hilo: su costo no depende
+  del costo del dibujo.
+
+La figura nunca se toca desde el hilo de Tk sin tomar el lock de la figura
+(solo `punto_en_plano_z`, en un doble clic).
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import threading
+import time
+import tkinter as tk
+from collections import deque
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from interfaz.render_matplotlib import LIMITES, RenderBrazo
+
+DPI = 100
+TAMANO_INICIAL = (600, 600)  # Píxeles, hasta el primer <Configure>
+GRADOS_POR_PIXEL = 0.4  # Sensibilidad de la órbita
+EVENTO_CUADRO = "<<CuadroListo>>"
+
+
+class TrabajadorRender(threading.Thread):
+    """
+    Hilo que dibuja el brazo en una figura Agg y entrega cuadros RGBA.
+
+    Las solicitudes no se encolan: el hilo siempre dibuja el estado más
+    reciente (pose, tamaño, vista y nube).
+
+    Atributos:
+        solicitudes (int): Poses recibidas.
+        dibujados (int): Cuadros dibujados y entregados.
+        omitidos (int): Poses reemplazadas antes de dibujarse.
+    """
+
+    def __init__(self, al_terminar, tamano=TAMANO_INICIAL, dpi=DPI, limites=LIMITES):
+        """
+        Args:
+            al_terminar (callable): `al_terminar(generacion, rgba, ancho, alto)`,
+                llamado desde este hilo con cada cuadro (`rgba` en bytes).
+            tamano (tuple): (ancho, alto) inicial en píxeles.
+            dpi (int): Resolución de la figura.
+            limites (tuple): Límites de los ejes (ver RenderBrazo).
+        """
+        super().__init__(name="RenderBrazo", daemon=True)
+        self.al_terminar = al_terminar
+        self.dpi = dpi
+        self.limites = limites
+        self.render = None
+        self.lock_figura = threading.Lock()
+
+        self._condicion = threading.Condition()
+        self._activo = True
+        self._pendiente = False
+        self._generacion = 0
+        self._pose = None
+        self._pose_nueva = False
+        self._tamano = tamano
+        self._orbita = [0.0, 0.0]  # Δazimut, Δelevación acumulados
+        self._nube = None  # None: sin cambios; False: ocultar; arreglo: mostrar
+        self._borrador = None  # None: sin cambios
+
+        self.solicitudes = 0
+        self.dibujados = 0
+        self.omitidos = 0
+        self._tiempos = deque(maxlen=500)
+
+    # ------------------------------------------------------------------
+    #   Solicitudes (desde cualquier hilo)
+    # ------------------------------------------------------------------
+
+    def solicitar(self, xs, ys, zs, angulo_pinza):
+        """
+        Pide dibujar una pose; reemplaza a la anterior si aún no se dibujó.
+
+        Returns:
+            int: Generación asignada a la pose.
+        """
+        with self._condicion:
+            if self._pose_nueva:
+                self.omitidos += 1
+            self._generacion += 1
+            self._pose = (xs, ys, zs, angulo_pinza)
+            self._pose_nueva = True
+            self.solicitudes += 1
+            self._avisar()
+            return self._generacion
+
+    def redimensionar(self, ancho, alto):
+        with self._condicion:
+            self._tamano = (max(ancho, 1), max(alto, 1))
+            self._avisar()
+
+    def orbitar(self, d_azimut, d_elevacion):
+        with self._condicion:
+            self._orbita[0] += d_azimut
+            self._orbita[1] += d_elevacion
+            self._avisar()
+
+    def fijar_calidad(self, borrador):
+        with self._condicion:
+            self._borrador = borrador
+            self._avisar()
+
+    def mostrar_nube(self, puntos):
+        with self._condicion:
+            self._nube = puntos
+            self._avisar()
+
+    def ocultar_nube(self):
+        with self._condicion:
+            self._nube = False
+            self._avisar()
+
+    def _avisar(self):
+        self._pendiente = True
+        self._condicion.notify()
+
+    # ------------------------------------------------------------------
+
+    def punto_en_plano_z(self, x, y, z):
+        """Como RenderBrazo.punto_en_plano_z (píxeles con origen abajo)."""
+        with self.lock_figura:
+            if self.render is None:
+                return None
+            return self.render.punto_en_plano_z(x, y, z)
+
+    # ------------------------------------------------------------------
+
+    def detener(self, espera=1.0):
+        """Termina el hilo después del cuadro en curso."""
+        with self._condicion:
+            self._activo = False
+            self._condicion.notify()
+        if self.is_alive():
+            self.join(espera)
+
+    # ------------------------------------------------------------------
+
+    def estadisticas(self):
+        """Resumen de solicitudes y tiempos de dibujo en este hilo."""
+        tiempos = sorted(self._tiempos)
+
+        def ms(fraccion):
+            if not tiempos:
+                return None
+            return round(tiempos[min(len(tiempos) - 1, int(fraccion * len(tiempos)))] * 1000, 2)
+
+        return {
+            "solicitudes": self.solicitudes,
+            "dibujados": self.dibujados,
+            "omitidos": self.omitidos,
+            "dibujo_p50_ms": ms(0.5),
+            "dibujo_p95_ms": ms(0.95),
+            "dibujo_max_ms": ms(1.0),
+        }
+
+    # ------------------------------------------------------------------
+    #   Hilo de trabajo
+    # ------------------------------------------------------------------
+
+    def run(self):
+        ancho, alto = self._tamano
+        fig = Figure(figsize=(ancho / self.dpi, alto / self.dpi), dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        with self.lock_figura:
+            self.render = RenderBrazo(fig, canvas, limites=self.limites)
+        tamano_actual = self._tamano
+
+        while True:
+            with self._condicion:
+                while self._activo and not self._pendiente:
+                    self._condicion.wait()
+                if not self._activo:
+                    break
+                generacion, pose = self._generacion, self._pose
+                tamano, orbita, nube = self._tamano, self._orbita, self._nube
+                borrador = self._borrador
+                self._orbita, self._nube, self._borrador = [0.0, 0.0], None, None
+                self._pendiente = self._pose_nueva = False
+
+            inicio = time.perf_counter()
+            with self.lock_figura:
+                if tamano != tamano_actual:
+                    fig.set_size_inches(tamano[0] / self.dpi, tamano[1] / self.dpi)
+                    tamano_actual = tamano
+                    self.render.invalidar()
+                if orbita[0] or orbita[1]:
+                    ax = self.render.ax
+                    elevacion = max(-90.0, min(90.0, ax.elev + orbita[1]))
+                    ax.view_init(elev=elevacion, azim=ax.azim + orbita[0])
+                    self.render.invalidar()
+                if borrador is not None:
+                    self.render.fijar_calidad(borrador)
+                if nube is False:
+                    self.render.ocultar_nube(redibujar=False)
+                    self.render.invalidar()
+                elif nube is not None:
+                    self.render.ocultar_nube(redibujar=False)
+                    self.render.mostrar_nube(nube)
+
+                if pose is not None:
+                    self.render.actualizar(*pose)
+                else:
+                    canvas.draw()
+                rgba = bytes(canvas.buffer_rgba())
+                ancho, alto = canvas.get_width_height()
+            self._tiempos.append(time.perf_counter() - inicio)
+            self.dibujados += 1
+            self.al_terminar(generacion, rgba, ancho, alto)
+
+
+class RenderBrazoHilo:
+    """
+    Parte de Tk del dibujo en segundo plano: muestra los cuadros del
+    TrabajadorRender en una PhotoImage reutilizada.
+
+    Ofrece la misma interfaz que RenderBrazo y RenderCanvas (actualizar,
+    fijar_calidad, mostrar_nube, ocultar_nube, punto_en_plano_z, conectar_doble_clic,
+    desconectar). Arrastrar con el botón izquierdo orbita la cámara.
+
+    Atributos:
+        widget (tk.Canvas): Donde se muestra la imagen.
+        trabajador (TrabajadorRender): Hilo que dibuja.
+        mostrados (int): Cuadros copiados a la imagen.
+        descartados (int): Cuadros reemplazados antes de mostrarse.
+    """
+
+    def __init__(self, master, limites=LIMITES, fondo="white"):
+        # Pillow solo se necesita para este renderizador
+        from PIL import Image, ImageTk
+
+        self._image, self._image_tk = Image, ImageTk
+        self.widget = tk.Canvas(master, background=fondo, highlightthickness=0)
+        self.widget.pack(fill="both", expand=True)
+        self._item_imagen = self.widget.create_image(0, 0, anchor="nw")
+        self._foto = None
+        self._alto = TAMANO_INICIAL[1]
+
+        self._lock_cuadro = threading.Lock()
+        self._cuadro = None
+        self._ultima_mostrada = 0
+        self.mostrados = 0
+        self.descartados = 0
+        self._arrastre = None
+
+        self.trabajador = TrabajadorRender(self._al_terminar, limites=limites)
+        self.widget.bind(EVENTO_CUADRO, self._mostrar_cuadro)
+        self.widget.bind(
+            "<Configure>",
+            lambda event: self.trabajador.redimensionar(event.width, event.height),
+        )
+        self.widget.bind("<ButtonPress-1>", self._al_presionar)
+        self.widget.bind("<B1-Motion>", self._al_arrastrar)
+        self.trabajador.start()
+
+    # ------------------------------------------------------------------
+
+    def actualizar(self, xs, ys, zs, angulo_pinza):
+        """Pide la pose al hilo de trabajo; no espera a que se dibuje."""
+        self.trabajador.solicitar(xs, ys, zs, angulo_pinza)
+
+    def fijar_calidad(self, borrador):
+        self.trabajador.fijar_calidad(borrador)
+
+    def mostrar_nube(self, puntos, color="gray"):
+        self.trabajador.mostrar_nube(puntos)
+
+    def ocultar_nube(self):
+        self.trabajador.ocultar_nube()
+
+    def punto_en_plano_z(self, x_pantalla, y_pantalla, z):
+        """Como RenderBrazo.punto_en_plano_z, con píxeles del tk.Canvas."""
+        return self.trabajador.punto_en_plano_z(x_pantalla, self._alto - y_pantalla, z)
+
+    def conectar_doble_clic(self, callback):
+        """Llama a `callback(x, y)` (píxeles del canvas) en cada doble clic."""
+        self.widget.bind("<Double-Button-1>", lambda event: callback(event.x, event.y))
+
+    # ------------------------------------------------------------------
+
+    def _al_terminar(self, generacion, rgba, ancho, alto):
+        """Hilo de trabajo: deja el cuadro y avisa al hilo de Tk."""
+        with self._lock_cuadro:
+            if self._cuadro is not None:
+                self.descartados += 1
+            self._cuadro = (generacion, rgba, ancho, alto)
+        try:
+            self.widget.event_generate(EVENTO_CUADRO, when="tail")
+        except (tk.TclError, RuntimeError):
+            pass  # Ventana cerrada
+
+    def _mostrar_cuadro(self, event=None):
+        """Hilo de Tk: copia el último cuadro a la imagen."""
+        with self._lock_cuadro:
+            cuadro, self._cuadro = self._cuadro, None
+        if cuadro is None:
+            return
+        generacion, rgba, ancho, alto = cuadro
+        if generacion < self._ultima_mostrada:
+            self.descartados += 1
+            return
+        self._ultima_mostrada = generacion
+
+        imagen = self._image.frombuffer("RGBA", (ancho, alto), rgba, "raw", "RGBA", 0, 1)
+        if self._foto is None or (self._foto.width(), self._foto.height()) != (ancho, alto):
+            self._foto = self._image_tk.PhotoImage(imagen)
+            self.widget.itemconfigure(self._item_imagen, image=self._foto)
+        else:
+            self._foto.paste(imagen)
+        self._alto = alto
+        self.mostrados += 1
+
+    # ------------------------------------------------------------------
+
+    def _al_presionar(self, event):
+        self._arrastre = (event.x, event.y)
+
+    def _al_arrastrar(self, event):
+        if self._arrastre is None:
+            return
+        dx, dy = event.x - self._arrastre[0], event.y - self._arrastre[1]
+        self._arrastre = (event.x, event.y)
+        self.trabajador.orbitar(-dx * GRADOS_POR_PIXEL, dy * GRADOS_POR_PIXEL)
+
+    # ------------------------------------------------------------------
+
+    def estadisticas(self):
+        datos = self.trabajador.estadisticas()
+        datos.update(mostrados=self.mostrados, descartados=self.descartados)
+        return datos
+
+    def desconectar(self):
+        """Detiene el hilo de trabajo."""
+        self.trabajador.detener()
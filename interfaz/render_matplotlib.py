@@ -0,0 +1,268 @@
+"""
+render_matplotlib.py
+--------------------
+Dibujo incremental del esqueleto 3D del brazo para el Modo Manual.
+
+El dibujo anterior borraba los ejes (`ax.clear()`), volvía a fijar límites y
+título, creaba cinco líneas nuevas y redibujaba la figura completa en cada
+movimiento de un slider. Casi todo ese tiempo se gastaba en los ejes, la
+grilla y las etiquetas, que no cambian.
+
+Este renderizador:
+
+- Crea una sola vez los artistas Line3D de los segmentos y la pinza
+  (`animated=True`, para que el dibujo completo no los incluya) y luego
+  solo actualiza sus datos con `set_data_3d`.
+- Guarda el fondo estático (ejes, grilla, etiquetas) después de cada
+  dibujo completo (evento 'draw_event': primer dibujo, cambio de tamaño,
+  rotación con el mouse).
+- En cada actualización restaura ese fondo, dibuja solo los artistas del
+  brazo y copia a pantalla únicamente el área de los ejes (blitting).
+
+Calidad de borrador (`fijar_calidad(True)`, la activa PlanificadorRender
+cuando el dibujo es lento): el brazo se dibuja sin marcadores, con líneas
+más finas y sin antialiasing, y el fondo se dibuja sin grilla ni números
+en los ejes (lo que más cuesta de un dibujo completo). El fondo no se
+redibuja solo por cambiar de calidad; al volver a la calidad completa se
+redibuja si había sido capturado en borrador.
+
+Funciona con cualquier canvas de matplotlib; con Agg (sin ventana) se usa en
+benchmarks/bench_render.py.
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import numpy as np
+
+LIMITES = ((-10, 10), (-10, 10), (0, 15))  # x, y, z
+LARGO_PINZA = 1.0
+
+# (color, ancho, marcador) de cada segmento: base, brazo, codo
+ESTILO_SEGMENTOS = (("red", 3, None), ("green", 3, None), ("orange", 3, "o"))
+COLOR_PINZA = "blue"
+
+
+def puntos_pinza(x_end, y_end, z_end, angulo_pinza, largo=LARGO_PINZA):
+    """
+    Calcula los extremos de las dos mandíbulas de la pinza.
+
+    Args:
+        x_end, y_end, z_end (float): Extremo del brazo.
+        angulo_pinza (float): Apertura en grados.
+        largo (float): Largo visual de cada mandíbula.
+
+    Returns:
+        tuple: ((x1, y1, z1), (x2, y2, z2)).
+    """
+    apertura = largo * np.sin(np.radians(angulo_pinza) / 2)
+    return (x_end + apertura, y_end, z_end), (x_end - apertura, y_end, z_end)
+
+
+class RenderBrazo:
+    """
+    Renderizador con artistas persistentes y blitting del esqueleto 3D.
+
+    Atributos:
+        ax (Axes3D): Ejes 3D donde se dibuja el brazo.
+        dibujos_completos (int): Redibujos completos de la figura.
+        dibujos_parciales (int): Actualizaciones por blitting.
+    """
+
+    def __init__(self, fig, canvas, titulo="Brazo Robótico 3D", limites=LIMITES):
+        """
+        Args:
+            fig (matplotlib.figure.Figure): Figura ya asociada a `canvas`.
+            canvas (FigureCanvasBase): Canvas de la figura (TkAgg, Agg, ...).
+            titulo (str): Título de los ejes.
+            limites (tuple): Límites ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+        """
+        self.fig = fig
+        self.canvas = canvas
+        self.ax = fig.add_subplot(111, projection="3d")
+        self.ax.set_xlim(*limites[0])
+        self.ax.set_ylim(*limites[1])
+        self.ax.set_zlim(*limites[2])
+        self.ax.set_title(titulo)
+
+        self.segmentos = [
+            self.ax.plot(
+                [], [], [], color=color, linewidth=ancho, marker=marcador, animated=True
+            )[0]
+            for color, ancho, marcador in ESTILO_SEGMENTOS
+        ]
+        self.mandibulas = [
+            self.ax.plot([], [], [], color=COLOR_PINZA, linewidth=2, animated=True)[0]
+            for _ in range(2)
+        ]
+        self.artistas = self.segmentos + self.mandibulas
+
+        self.nube = None  # Envolvente del espacio de trabajo (estática)
+        self.borrador = False
+        self._fondo_borrador = False
+
+        self.dibujos_completos = 0
+        self.dibujos_parciales = 0
+        self._fondo = None
+        self._conexion = canvas.mpl_connect("draw_event", self._al_dibujar)
+
+    # ------------------------------------------------------------------
+
+    def actualizar(self, xs, ys, zs, angulo_pinza):
+        """
+        Mueve el brazo a una nueva posición y la muestra.
+
+        Args:
+            xs, ys, zs (sequence): Coordenadas de los 4 puntos del esqueleto
+                (base, hombro, codo, extremo).
+            angulo_pinza (float): Apertura de la pinza en grados.
+        """
+        for i, linea in enumerate(self.segmentos):
+            linea.set_data_3d(xs[i : i + 2], ys[i : i + 2], zs[i : i + 2])
+
+        extremo = (xs[-1], ys[-1], zs[-1])
+        for linea, punta in zip(self.mandibulas, puntos_pinza(*extremo, angulo_pinza)):
+            linea.set_data_3d(*([e, p] for e, p in zip(extremo, punta)))
+
+        if self._fondo is None:
+            # Sin fondo guardado: el dibujo completo lo captura (_al_dibujar)
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self._fondo)
+        self._dibujar_artistas()
+        self.canvas.blit(self.ax.bbox)
+        self.dibujos_parciales += 1
+
+    # ------------------------------------------------------------------
+
+    def mostrar_nube(self, puntos, color="gray"):
+        """
+        Dibuja una nube de puntos estática (p. ej. el espacio de trabajo).
+
+        Forma parte del fondo guardado: se dibuja una vez por redibujo
+        completo y no encarece las actualizaciones del brazo.
+
+        Args:
+            puntos (np.ndarray): Forma (K, 3).
+            color (str): Color de los puntos.
+        """
+        self.ocultar_nube(redibujar=False)
+        self.nube = self.ax.scatter(
+            puntos[:, 0], puntos[:, 1], puntos[:, 2],
+            s=1, c=color, alpha=0.15, depthshade=False,
+        )
+        self.canvas.draw_idle()
+
+    def ocultar_nube(self, redibujar=True):
+        """Quita la nube de puntos, si hay una."""
+        if self.nube is None:
+            return
+        self.nube.remove()
+        self.nube = None
+        if redibujar:
+            self.canvas.draw_idle()
+
+    # ------------------------------------------------------------------
+
+    def punto_en_plano_z(self, x_pantalla, y_pantalla, z):
+        """
+        Proyección inversa de un clic sobre el plano horizontal de altura z.
+
+        La proyección 3D de los ejes es una matriz 4x4 M: un punto (x, y, z)
+        aparece en (u, v) = (M0·p / M3·p, M1·p / M3·p), con p = (x, y, z, 1).
+        Con z fija, esas dos ecuaciones son lineales en x e y.
+
+        Args:
+            x_pantalla, y_pantalla (float): Posición del clic en píxeles del
+                canvas (event.x, event.y de matplotlib).
+            z (float): Altura del plano.
+
+        Returns:
+            tuple | None: (x, y, z) en coordenadas de datos, o None si el
+            plano se ve de canto desde la cámara.
+        """
+        u, v = self.ax.transData.inverted().transform((x_pantalla, y_pantalla))
+        m = self.ax.get_proj()
+        filas = np.array([u * m[3] - m[0], v * m[3] - m[1]])
+        coeficientes = filas[:, :2]
+        if abs(np.linalg.det(coeficientes)) < 1e-12:
+            return None
+        x, y = np.linalg.solve(coeficientes, -(filas[:, 2] * z + filas[:, 3]))
+        return float(x), float(y), float(z)
+
+    # ------------------------------------------------------------------
+
+    def fijar_calidad(self, borrador):
+        """
+        Cambia entre calidad completa y de borrador.
+
+        Args:
+            borrador (bool): True para la versión simplificada.
+        """
+        if borrador == self.borrador:
+            return
+        self.borrador = borrador
+        for linea, (_, ancho, marcador) in zip(self.segmentos, ESTILO_SEGMENTOS):
+            linea.set_marker("" if borrador or marcador is None else marcador)
+            linea.set_linewidth(ancho / 2 if borrador else ancho)
+        for linea in self.mandibulas:
+            linea.set_linewidth(1 if borrador else 2)
+        for artista in self.artistas:
+            artista.set_antialiased(not borrador)
+
+        self.ax.grid(not borrador)
+        etiquetas = not borrador
+        self.ax.tick_params(labelbottom=etiquetas, labelleft=etiquetas)
+        if not borrador and self._fondo_borrador:
+            self.invalidar()
+
+    # ------------------------------------------------------------------
+
+    def conectar_doble_clic(self, callback):
+        """
+        Llama a `callback(x, y)` en cada doble clic sobre los ejes, con la
+        posición en píxeles que espera `punto_en_plano_z`.
+        """
+
+        def al_presionar(event):
+            if event.dblclick and event.inaxes is self.ax:
+                callback(event.x, event.y)
+
+        return self.canvas.mpl_connect("button_press_event", al_presionar)
+
+    # ------------------------------------------------------------------
+
+    def invalidar(self):
+        """Descarta el fondo guardado (p. ej. al cambiar el tema de colores)."""
+        self._fondo = None
+
+    # ------------------------------------------------------------------
+
+    def desconectar(self):
+        """Deja de escuchar los dibujos completos del canvas."""
+        self.canvas.mpl_disconnect(self._conexion)
+
+    # ------------------------------------------------------------------
+
+    def _al_dibujar(self, event):
+        """Guarda el fondo recién dibujado y agrega encima el brazo."""
+        self._fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._fondo_borrador = self.borrador
+        self._dibujar_artistas()
+        self.dibujos_completos += 1
+
+    # ------------------------------------------------------------------
+
+    def _dibujar_artistas(self):
+        for artista in self.artistas:
+            self.ax.draw_artist(artista)
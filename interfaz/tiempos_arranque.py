@@ -0,0 +1,101 @@
+"""
+tiempos_arranque.py
+-------------------
+
+Registro de tiempos del arranque de la aplicación.
+
+Permite desglosar el tiempo hasta que aparece la ventana principal por
+etapa (importaciones e inicialización). Se activa ejecutando:
+
+    python main.py --tiempos
+
+El reporte se imprime en consola cuando la ventana principal termina de
+dibujarse por primera vez, y se completa con la precarga en segundo plano
+de los modos (ModoAutomatico / ModoManual).
+
+Autores:
+    Hermes Rojas Sancho
+    Donifer Campos Parra
+    Jose Ignacio Goldoni
+
+Curso:
+    Lenguaje Ensamblador (CI-0118)
+    Proyecto Integrador de Lenguaje Ensamblador y Fundamentos de Arquitectura
+
+Año:
+    2025
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class RegistroTiempos:
+    """
+    Acumula la duración de cada etapa del arranque.
+
+    Atributos:
+        inicio (float): Instante de referencia (perf_counter).
+        etapas (list[tuple[str, float, float]]): (nombre, inicio relativo,
+            duración) en segundos, en orden de finalización.
+        activo (bool): Si es False, `reporte` no se imprime automáticamente.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.etapas = []
+        self.activo = False
+        self._bloqueo = threading.Lock()
+
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def medir(self, nombre):
+        """Mide la duración del bloque `with` como una etapa."""
+        comienzo = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.agregar(nombre, comienzo, time.perf_counter())
+
+    # ------------------------------------------------------------------
+
+    def agregar(self, nombre, comienzo, fin):
+        """Registra una etapa con instantes absolutos de perf_counter."""
+        with self._bloqueo:
+            self.etapas.append((nombre, comienzo - self.inicio, fin - comienzo))
+
+    # ------------------------------------------------------------------
+
+    def marcar(self, nombre):
+        """Registra un hito (etapa de duración cero) en el instante actual."""
+        ahora = time.perf_counter()
+        self.agregar(nombre, ahora, ahora)
+
+    # ------------------------------------------------------------------
+
+    def reporte(self):
+        """
+        Devuelve el desglose en texto, en milisegundos.
+
+        Returns:
+            str: Tabla con inicio relativo y duración de cada etapa.
+        """
+        with self._bloqueo:
+            etapas = list(self.etapas)
+        lineas = ["Tiempos de arranque (ms)", f"{'inicio':>9} {'duración':>9}  etapa"]
+        for nombre, comienzo, duracion in etapas:
+            lineas.append(f"{comienzo * 1000:9.1f} {duracion * 1000:9.1f}  {nombre}")
+        return "\n".join(lineas)
+
+    # ------------------------------------------------------------------
+
+    def imprimir(self):
+        """Imprime el reporte si el registro está activo."""
+        if self.activo:
+            print(self.reporte())
+
+
+# Instancia única compartida por main.py y la interfaz
+registro = RegistroTiempos()
@@ -10,6 +10,10 @@ Funciones principales:
 - Administrar ventana principal y sus ventanas hijas (ModoManual / ModoAutomatico).
 - Verificar continuamente el estado de conexión con el Arduino mediante un LED indicador.
 
+Los módulos de los modos (que cargan OpenCV, Pillow y matplotlib) no se
+importan al inicio: se precargan en un hilo en segundo plano después de que
+la ventana principal se dibuja, o al abrir el modo si aún no terminó.
+
 Autores:
     Hermes Rojas Sancho
     Donifer Campos Parra
@@ -23,26 +27,72 @@ Año:
     2025
 """
 
+import importlib
+import os
+import threading
+import time
 import tkinter as tk
-import customtkinter as ctk
 from tkinter import messagebox
 
-from hardware.arduino_detector import ArduinoDetector
-
-from interfaz.modo_automatico import ModoAutomatico
-
-# from interfaz.modo_auto import ModoAutomatico
-from interfaz.modo_manual import ModoManual
+from interfaz.tiempos_arranque import registro
+
+with registro.medir("import customtkinter"):
+    import customtkinter as ctk
+
+with registro.medir("import hardware.arduino_detector"):
+    from hardware.arduino_detector import ArduinoDetector
+
+# Módulos pesados que se importan de forma diferida (ver precargar_modos)
+MODULOS_MODOS = ("interfaz.modo_automatico", "interfaz.modo_manual")
+
+# Módulos de cada renderizador del Modo Manual; solo se precarga el elegido
+MODULOS_RENDER = {
+    "matplotlib": (
+        "matplotlib.backends.backend_tkagg",
+        "mpl_toolkits.mplot3d",
+        "interfaz.render_matplotlib",
+    ),
+    "hilo": (
+        "matplotlib.backends.backend_agg",
+        "mpl_toolkits.mplot3d",
+        "PIL.ImageTk",
+        "interfaz.render_hilo",
+    ),
+    "canvas": ("interfaz.render_canvas",),
+}
 
 # ------------------------------
 # Variables de estado
 # ------------------------------
 modo_actual = None  # "MANUAL" o "RUTINA"a
+renderizador_manual = "matplotlib"  # Ver pestaña Configuración
 
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("dark-blue")
 
 
+# --------------------------------------------------------------------------------
+# Importación diferida de los modos
+# --------------------------------------------------------------------------------
+def precargar_modos():
+    """
+    Importa los módulos de los modos en un hilo en segundo plano.
+
+    Se llama después del primer dibujado de la ventana principal, de modo
+    que la ventana aparece sin esperar a OpenCV/matplotlib y, cuando el
+    usuario elige un modo, normalmente ya está importado.
+    """
+
+    def importar():
+        for nombre in MODULOS_MODOS + MODULOS_RENDER[renderizador_manual]:
+            comienzo = time.perf_counter()
+            importlib.import_module(nombre)
+            registro.agregar(f"precarga {nombre} (hilo)", comienzo, time.perf_counter())
+        registro.imprimir()
+
+    threading.Thread(target=importar, name="PrecargaModos", daemon=True).start()
+
+
 # --------------------------------------------------------------------------------
 # Funciones auxiliares
 # --------------------------------------------------------------------------------
@@ -58,6 +108,18 @@ def abrir_modo_manual(ventana, frame_inferior):
     global modo_actual
     respuesta = messagebox.askyesno("Confirmación", "¿Activar modo manual?")
     if respuesta:
+        # La geometría se valida antes de ocultar la ventana principal: con
+        # una configuración inválida el modo no se abre
+        from cinematica.cadena_dh import cargar_cadena_brazo
+
+        try:
+            cadena = cargar_cadena_brazo(tablas=True)
+        except (OSError, ValueError) as e:
+            messagebox.showerror(
+                "Modo Manual", f"No se pudo cargar la geometría del brazo:\n{e}"
+            )
+            return
+
         modo_actual = "MANUAL"
         ventana.withdraw()  # Ocultar ventana principal
 
@@ -67,8 +129,16 @@ def abrir_modo_manual(ventana, frame_inferior):
             ventana.update_idletasks()  # Forzar redibujo
             ventana.deiconify()  # Muestra de nuevo
 
-        # Abrir ventana de modo manual
-        ModoManual(parent=ventana, volver_callback=volver_al_principal)
+        # Abrir ventana de modo manual (importación diferida)
+        from interfaz.modo_manual import ModoManual
+
+        ModoManual(
+            parent=ventana,
+            detector=detector,
+            volver_callback=volver_al_principal,
+            renderizador=renderizador_manual,
+            cadena=cadena,
+        )
     else:
         print("Modo Manual cancelado")
 
@@ -94,7 +164,9 @@ def abrir_modo_rutina(ventana, frame_inferior):
             ventana.update_idletasks()  # Forzar redibujo
             ventana.deiconify()  # Muestra de nuevo
 
-        # Abrir ventana modo automático
+        # Abrir ventana modo automático (importación diferida)
+        from interfaz.modo_automatico import ModoAutomatico
+
         ModoAutomatico(
             parent=ventana, detector=detector, volver_callback=volver_al_principal
         )
@@ -126,16 +198,27 @@ def ejecutar_app():
     crea los tabs, botones de navegación, detector de Arduino y ciclo de actualización
     del estado de conexión.
     """
+    comienzo = time.perf_counter()
     ventana = ctk.CTk()
+    registro.agregar("crear ventana CTk", comienzo, time.perf_counter())
+    comienzo = time.perf_counter()
     ventana.title("Brazo Robótico")
     ventana.after(0, lambda: ventana.state("zoomed"))
     ventana.minsize(800, 600)
 
-    # Inicializar detector de Arduino
+    # Inicializar detector de Arduino. BRAZO_PUERTO permite fijar el puerto
+    # (p. ej. el pty de hardware/simulador_arduino.py) sin autodetección.
+    # Con BRAZO_SOCKET la GUI no abre el puerto: usa el servidor de control
+    # (hardware/servidor_control.py), que lo comparte con otros procesos.
     global detector
-    detector = ArduinoDetector()
-    estado_arduino_anterior = detector.estado_arduino
-    ventana.after(2000, lambda: intentar_conexion_inicial(detector))
+    if os.environ.get("BRAZO_SOCKET"):
+        from hardware.cliente_control import DetectorRemoto
+
+        detector = DetectorRemoto(os.environ["BRAZO_SOCKET"])
+    else:
+        detector = ArduinoDetector(puerto=os.environ.get("BRAZO_PUERTO") or None)
+    detector.iniciar_monitor()  # Tabla de puertos en caché (hotplug)
+    estado_arduino_anterior = None
 
     # --------------------------------------------------
     # LED / texto para mostrar estado de conexión
@@ -161,6 +244,16 @@ def ejecutar_app():
             ctk.set_appearance_mode("light")
         canvas_led_conexion.config(bg=ventana.cget("bg"))
 
+    def cambiar_renderizador(opcion):
+        """
+        Elige cómo se dibuja el diagrama del Modo Manual: 'matplotlib'
+        (ejes 3D completos), 'hilo' (matplotlib fuera del hilo de la
+        interfaz) o 'canvas' (tk.Canvas nativo, más liviano).
+        Aplica a la próxima apertura del modo.
+        """
+        global renderizador_manual
+        renderizador_manual = opcion
+
     # --------------------------------------------------
     # Layout principal con tabs (pestañas)
     # --------------------------------------------------
@@ -263,6 +356,18 @@ def ejecutar_app():
     )
     switch_apariencia.grid(row=0, column=0, pady=20, padx=20)
 
+    label_renderizador = ctk.CTkLabel(
+        frame_config, text="Renderizador del modo manual"
+    )
+    label_renderizador.grid(row=1, column=0, pady=(10, 0), padx=20, sticky="w")
+    menu_renderizador = ctk.CTkOptionMenu(
+        frame_config,
+        values=list(MODULOS_RENDER),
+        command=cambiar_renderizador,
+    )
+    menu_renderizador.set(renderizador_manual)
+    menu_renderizador.grid(row=2, column=0, pady=(5, 20), padx=20, sticky="w")
+
     # -------------------------------------------------------------------
     # Rutinas de actualización
     # -------------------------------------------------------------------
@@ -271,23 +376,64 @@ def ejecutar_app():
         if detector.detectar():
             detector.conectar()
 
-    def actualizar_led_gui():
-        """
-        Refresca continuamente el indicador visual del estado del Arduino
-        (LED y texto).
-        """
-        estado = detector.actualizar_estado()  # devuelve "conectado" o "desconectado"
-
-        if estado == "conectado":
+    def mostrar_estado(estado):
+        """Actualiza el LED y el texto según el estado de la conexión."""
+        nonlocal estado_arduino_anterior
+        if estado == estado_arduino_anterior:
+            return
+        estado_arduino_anterior = estado
+        if estado in ("conectado", "listo"):
             canvas_led_conexion.itemconfig(led_conexion, fill="green")
             label_led.configure(text=f"Conectado en {detector.obtener_puerto()}")
+        elif estado == "degradado":
+            canvas_led_conexion.itemconfig(led_conexion, fill="orange")
+            label_led.configure(text=f"Sin respuesta en {detector.obtener_puerto()}")
+        elif estado in ("abriendo", "negociando"):
+            canvas_led_conexion.itemconfig(led_conexion, fill="yellow")
+            label_led.configure(text="Conectando...")
         else:
             canvas_led_conexion.itemconfig(led_conexion, fill="red")
             label_led.configure(text="Desconectado")
 
-        ventana.after(1000, actualizar_led_gui)
+    def actualizar_led_gui():
+        """
+        Refresca continuamente el indicador visual del estado del Arduino
+        (LED y texto).
 
-    actualizar_led_gui()
+        Solo se usa cuando el detector no tiene máquina de estados propia
+        (DetectorRemoto): la revisión es barata y los widgets solo se
+        modifican cuando el estado cambia.
+        """
+        mostrar_estado(detector.actualizar_estado())  # "conectado" o "desconectado"
+        ventana.after(100, actualizar_led_gui)
+
+    if hasattr(detector, "iniciar_supervision"):
+        # La máquina de conexión avisa cada cambio desde su hilo; el evento
+        # virtual lo entrega al hilo de Tk sin consultas periódicas.
+        ventana.bind(
+            "<<EstadoArduino>>", lambda event: mostrar_estado(detector.maquina.estado)
+        )
+
+        def avisar_estado(anterior, nuevo):
+            try:
+                ventana.event_generate("<<EstadoArduino>>", when="tail")
+            except (RuntimeError, tk.TclError):
+                pass  # Ventana cerrada
+
+        detector.iniciar_supervision(avisar_estado)
+    else:
+        ventana.after(2000, lambda: intentar_conexion_inicial(detector))
+        actualizar_led_gui()
+    registro.agregar("crear widgets y detector", comienzo, time.perf_counter())
+
+    def primer_dibujado():
+        """Marca la primera ventana visible y lanza la precarga de los modos."""
+        registro.marcar("primera ventana dibujada")
+        registro.imprimir()
+        precargar_modos()
+
+    # after_idle corre cuando Tk terminó de procesar los eventos de dibujado
+    ventana.after(0, lambda: ventana.after_idle(primer_dibujado))
 
     ventana.mainloop()
 
@@ -1,4 +1,10 @@
-from interfaz.ventana_principal import ejecutar_app
+import sys
+
+from interfaz.tiempos_arranque import registro
+
+with registro.medir("import interfaz.ventana_principal"):
+    from interfaz.ventana_principal import ejecutar_app
 
 if __name__ == "__main__":
+    registro.activo = "--tiempos" in sys.argv  # Reporte de tiempos de arranque
     ejecutar_app()